@@ -1,6 +1,10 @@
-import json
 import random
-from datetime import datetime
+
+from pager import Pager
+from persistence import WriteBehind
+from task_store import Task, TaskStore
+
+DATA_FILE = "routine_tasks.jsonl"
 
 # Data for tips & quotes
 
@@ -26,27 +30,23 @@ MOTIVATIONAL_QUOTES = [
 class TaskManager:
     def __init__(self):
         self.tasks = self.load_tasks()
+        # Saves happen on a background thread so the menu never waits on disk.
+        self.writer = WriteBehind(self.tasks.flush, name=DATA_FILE)
 
     def load_tasks(self):
-        try:
-            with open("tasks.json", "r") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return []
+        # An old tasks.json is converted the first time.
+        return TaskStore.open(DATA_FILE, legacy=["tasks.json"])
 
     def save_tasks(self):
-        with open("tasks.json", "w") as f:
-            json.dump(self.tasks, f, indent=4)
+        self.writer.mark_dirty()
+
+    def close(self):
+        self.writer.close()
 
     def add_task(self, task_name):
-        task = {
-            "task": task_name,
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "done": False
-        }
-        self.tasks.append(task)
+        task_id = self.tasks.add(Task(title=task_name))
         self.save_tasks()
-        print(f"\n Task added: {task_name}")
+        print(f"\n Task added: {task_name} (#{task_id})")
 
     def view_tasks(self):
         if not self.tasks:
@@ -54,24 +54,31 @@ class TaskManager:
             return
 
         print("\n Your Tasks:")
-        for i, t in enumerate(self.tasks, 1):
-            status = "✓ Done" if t["done"] else " Pending"
-            print(f"{i}. {t['task']} | {status} | Added: {t['created_at']}")
-
-    def mark_done(self, index):
-        try:
-            self.tasks[index]["done"] = True
+        pager = Pager(
+            self.tasks,
+            lambda i, t: f"{t.id}. {t.title} | {'✓ Done' if t.done else ' Pending'} | Added: {t.created_at}",
+            match=lambda t, text: text.lower() in t.title.lower(),
+        )
+        pager.browse()
+
+    def mark_done(self, task_id):
+        task = self.tasks.update(task_id, done=True)
+        if task:
             self.save_tasks()
-            print(f"\n Task marked as done: {self.tasks[index]['task']}")
-        except IndexError:
+            print(f"\n Task marked as done: {task.title}")
+        elif self.tasks.was_removed(task_id):
+            print("\n That task was already removed.")
+        else:
             print("\n Invalid task number.")
 
-    def remove_task(self, index):
-        try:
-            removed = self.tasks.pop(index)
+    def remove_task(self, task_id):
+        removed = self.tasks.remove(task_id)
+        if removed:
             self.save_tasks()
-            print(f"\n Removed: {removed['task']}")
-        except IndexError:
+            print(f"\n Removed: {removed.title}")
+        elif self.tasks.was_removed(task_id):
+            print("\n That task was already removed.")
+        else:
             print("\n Invalid task number.")
 
 
@@ -122,11 +129,11 @@ def main():
             manager.view_tasks()
 
         elif choice == "3":
-            num = int(input("Task number to mark as done: ")) - 1
+            num = int(input("Task number to mark as done: "))
             manager.mark_done(num)
 
         elif choice == "4":
-            num = int(input("Task number to remove: ")) - 1
+            num = int(input("Task number to remove: "))
             manager.remove_task(num)
 
         elif choice == "5":
@@ -136,6 +143,7 @@ def main():
             random_quote()
 
         elif choice == "7":
+            manager.close()
             print("\n Goodbye! Stay productive.")
             break
 
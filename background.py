@@ -0,0 +1,102 @@
+"""
+Run slow work for a Tk window in a background process.
+
+BackgroundWorker keeps one long-lived worker process, so caches built up
+by a job (the prime sieve, memoized factorizations, ...) are still there
+for the next one. A job is a generator function: everything it yields is
+passed back to the window as a message, and a final "done" message is sent
+when it returns.
+
+The window never blocks on the worker. It calls poll() from root.after()
+and gets whatever messages have arrived so far. Messages from a job that
+has been replaced or cancelled are dropped. cancel() on a running job
+kills the worker process (the only way to stop a long computation) and
+starts a fresh one.
+
+    worker = BackgroundWorker()
+    worker.submit(slow_job, 42)
+    ...
+    for kind, payload in worker.poll():     # every ~16 ms
+        ...
+"""
+
+import multiprocessing as mp
+import queue
+from typing import Callable, List, Tuple
+
+# Messages handled per poll(), so a chatty job can't stall the event loop.
+MAX_MESSAGES = 200
+
+
+def _worker_main(jobs, results) -> None:
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        job_id, func, args = job
+        try:
+            for kind, payload in func(*args):
+                results.put((job_id, kind, payload))
+        except Exception as e:
+            results.put((job_id, "error", f"{type(e).__name__}: {e}"))
+        results.put((job_id, "done", None))
+
+
+class BackgroundWorker:
+    """One worker process running one job at a time."""
+
+    def __init__(self) -> None:
+        self._next_id = 0
+        self._job_id = None     # the job whose messages we still want
+        self._running = False   # it hasn't sent "done" yet
+        self._start()
+
+    def _start(self) -> None:
+        self._jobs = mp.Queue()
+        self._results = mp.Queue()
+        self._process = mp.Process(target=_worker_main, args=(self._jobs, self._results), daemon=True)
+        self._process.start()
+
+    @property
+    def busy(self) -> bool:
+        return self._running
+
+    def submit(self, func: Callable, *args) -> int:
+        """Start a job (cancelling the current one). Returns its id."""
+        self.cancel()
+        self._next_id += 1
+        self._job_id = self._next_id
+        self._running = True
+        self._jobs.put((self._job_id, func, args))
+        return self._job_id
+
+    def cancel(self) -> None:
+        """Forget the current job; if it's still running, kill the worker."""
+        if self._running:
+            # Killing a process mid-write can break its queues, so both are
+            # replaced along with the process.
+            self._process.kill()
+            self._process.join()
+            self._start()
+        self._job_id = None
+        self._running = False
+
+    def poll(self) -> List[Tuple[str, object]]:
+        """(kind, payload) messages from the current job that have arrived."""
+        messages = []
+        for _ in range(MAX_MESSAGES):
+            try:
+                job_id, kind, payload = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if job_id != self._job_id:
+                continue
+            if kind == "done":
+                self._running = False
+            messages.append((kind, payload))
+        return messages
+
+    def close(self) -> None:
+        self.cancel()
+        self._jobs.put(None)
+        self._process.join(timeout=1)
@@ -0,0 +1,189 @@
+"""
+Ranked-choice, approval and Borda counts for vote_tally.py.
+
+A ranked ballot lists candidate numbers in order of preference, e.g.
+"V000123,34,2 1 4": first choice 2, then 1, then 4. A plain "2" is a
+ranking with one choice, so old ballots still count. vote_tally.py
+collects the valid rankings of a whole election as {ranking: ballots},
+where a ranking is a bytes string of candidate numbers (b"\\x02\\x01\\x04").
+Identical ballots are only stored once, with their count, so millions of
+ballots over a handful of candidates come down to a few hundred entries.
+
+Methods, all taking that {ranking: ballots} dict:
+
+    instant_runoff  Count first choices; while nobody has a majority of
+                    the ballots still in play, eliminate the last-placed
+                    candidate and move each of their ballots to its next
+                    choice still running (or set it aside as exhausted).
+    approval        The same field read as "candidates I approve of";
+                    every candidate listed gets one point.
+    borda           With n candidates, a ballot's first choice gets n-1
+                    points, the next n-2, and so on; unranked candidates
+                    get nothing.
+
+Runoff rounds are incremental: each candidate keeps a pile of the
+rankings currently counting for them, and eliminating a candidate only
+walks that pile. reference_instant_runoff() recounts everything every
+round, to check against.
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+METHODS = ("plurality", "irv", "approval", "borda")
+
+
+class Round:
+    """One runoff round: votes per continuing candidate and who went out."""
+
+    __slots__ = ("counts", "exhausted", "eliminated")
+
+    def __init__(self, counts: Dict[int, int], exhausted: int) -> None:
+        self.counts = counts
+        self.exhausted = exhausted   # ballots with no continuing choice left
+        self.eliminated: Optional[int] = None
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Round) and self.counts == other.counts
+                and self.exhausted == other.exhausted and self.eliminated == other.eliminated)
+
+    @property
+    def active(self) -> int:
+        return sum(self.counts.values())
+
+    def leader(self) -> Optional[int]:
+        return max(self.counts, key=self.counts.get) if self.counts else None
+
+
+def winner(rounds: List[Round]) -> Optional[int]:
+    """The runoff winner, or None if there were no ballots."""
+    last = rounds[-1]
+    return last.leader() if last.active else None
+
+
+def _last_place(counts: Dict[int, int], rounds: List[Round]) -> int:
+    # Ties go to whoever had fewer votes in the latest round where they
+    # differed, then to the higher candidate number.
+    def key(c):
+        return (counts[c],) + tuple(r.counts.get(c, 0) for r in reversed(rounds)) + (-c,)
+    return min(counts, key=key)
+
+
+def _pack(rankings: Dict[bytes, int]) -> Tuple[array, array, array]:
+    """Rankings as one flat byte array plus start offsets and ballot counts."""
+    flat = array("B")
+    starts = array("I")
+    weights = array("Q")
+    for ranking, n in rankings.items():
+        starts.append(len(flat))
+        flat.frombytes(ranking)
+        weights.append(n)
+    starts.append(len(flat))
+    return flat, starts, weights
+
+
+def instant_runoff(rankings: Dict[bytes, int], candidates: Iterable[int]) -> List[Round]:
+    """Instant-runoff rounds, ending with the one where somebody has a majority."""
+    flat, starts, weights = _pack(rankings)
+    counts = dict.fromkeys(candidates, 0)
+    piles = {c: array("I") for c in counts}
+    position = array("I", starts[:-1])   # where each ranking's current choice is
+
+    for i, start in enumerate(position):
+        choice = flat[start]
+        piles[choice].append(i)
+        counts[choice] += weights[i]
+
+    rounds: List[Round] = []
+    exhausted = 0
+    while True:
+        current = Round(dict(counts), exhausted)
+        leader = current.leader()
+        if leader is None or counts[leader] * 2 > current.active or len(counts) == 1 or not current.active:
+            rounds.append(current)
+            return rounds
+        out = _last_place(counts, rounds)
+        current.eliminated = out
+        rounds.append(current)
+
+        del counts[out]
+        for i in piles.pop(out):
+            p = position[i] + 1
+            end = starts[i + 1]
+            while p < end and flat[p] not in counts:
+                p += 1
+            if p == end:
+                exhausted += weights[i]
+            else:
+                position[i] = p
+                piles[flat[p]].append(i)
+                counts[flat[p]] += weights[i]
+
+
+def reference_instant_runoff(rankings: Dict[bytes, int], candidates: Iterable[int]) -> List[Round]:
+    """instant_runoff() done by recounting every ballot every round."""
+    continuing = set(candidates)
+    rounds: List[Round] = []
+    while True:
+        counts = dict.fromkeys(continuing, 0)
+        exhausted = 0
+        for ranking, n in rankings.items():
+            for choice in ranking:
+                if choice in continuing:
+                    counts[choice] += n
+                    break
+            else:
+                exhausted += n
+        current = Round(counts, exhausted)
+        leader = current.leader()
+        if leader is None or counts[leader] * 2 > current.active or len(counts) == 1 or not current.active:
+            rounds.append(current)
+            return rounds
+        current.eliminated = _last_place(counts, rounds)
+        rounds.append(current)
+        continuing.remove(current.eliminated)
+
+
+def approval(rankings: Dict[bytes, int], candidates: Iterable[int]) -> Dict[int, int]:
+    """Approvals per candidate."""
+    points = dict.fromkeys(candidates, 0)
+    for ranking, n in rankings.items():
+        for choice in ranking:
+            points[choice] += n
+    return points
+
+
+def borda(rankings: Dict[bytes, int], candidates: Iterable[int]) -> Dict[int, int]:
+    """Borda points per candidate."""
+    points = dict.fromkeys(candidates, 0)
+    top = len(points) - 1
+    for ranking, n in rankings.items():
+        for place, choice in enumerate(ranking):
+            points[choice] += n * (top - place)
+    return points
+
+
+# ------------------ REPORTS ------------------
+
+def format_rounds(rounds: List[Round], names: Dict[int, str]) -> str:
+    lines = []
+    for number, r in enumerate(rounds, 1):
+        lines.append(f"  Round {number}:")
+        active = r.active
+        for c, n in sorted(r.counts.items(), key=lambda item: -item[1]):
+            share = n / active if active else 0.0
+            lines.append(f"    {c}: {names[c]:<28} {n:>12,}  {share:6.2%}")
+        if r.exhausted:
+            lines.append(f"    exhausted ballots {r.exhausted:,}")
+        if r.eliminated is not None:
+            lines.append(f"    eliminated: {names[r.eliminated]}")
+    won = winner(rounds)
+    lines.append(f"  Winner: {names[won]}" if won is not None else "  No winner: no valid ballots")
+    return "\n".join(lines)
+
+
+def format_points(points: Dict[int, int], names: Dict[int, str], unit: str) -> str:
+    lines = []
+    for c, n in sorted(points.items(), key=lambda item: -item[1]):
+        lines.append(f"  {c}: {names[c]:<28} {n:>12,} {unit}")
+    return "\n".join(lines)
@@ -1,4 +1,6 @@
 # A scores prediction program 
+from match_simulator import FIXTURES, exact, sample_score
+
 print('Welcome to the prediction game.')
 name = input('Enter your name: ')
 print(f"Hello {name}, let's get started. Pick a game number from the list below....")
@@ -13,34 +15,45 @@ Here are the available games:
       """)
 
 # a dictionary containing the available games 
-games: dict = {
-    1 : 'Chelsea VS Man U',
-    2 : "Atalanta VS Napoli",
-    3 : 'Bayern VS Frankfurt',
-    4 : 'Barcelona VS Elche'
-}
+games: dict = {number: f"{home} VS {away}" for number, (home, away) in FIXTURES.items()}
+
 
+def ask_number(prompt):
+    while True:
+        try:
+            number = int(input(prompt))
+        except ValueError:
+            print('Please enter a whole number.')
+            continue
+        if number >= 0:
+            return number
+        print('Please enter a number that is 0 or more.')
 
-choice = int(input('Enter the number of your preferred game: '))
+
+choice = ask_number('Enter the number of your preferred game: ')
+while choice not in games:
+    choice = ask_number(f'Pick a game from 1 to {len(games)}: ')
 print(f"You've picked '{games.get(choice)}'")
 
-h_score = int(input('Enter your goals prediction for the home team: '))
-a_score = int(input('Enter your goals prediction for the away team: '))
+h_score = ask_number('Enter your goals prediction for the home team: ')
+a_score = ask_number('Enter your goals prediction for the away team: ')
 print(f"You've predicted ({h_score}, {a_score})")
 pred = (h_score, a_score)
 
-import random
+home_team, away_team = FIXTURES[choice]
+print(exact(home_team, away_team).rate(h_score, a_score))
+
 
 class Score:
     def ft(self):
-        home = random.randint(1,7)
-        away = random.randint(1,7)
-        return (home, away) # the least a team can score is 1, and the highest is 7 (to keep it realistic)
+        # a realistic final score from the team strengths in match_simulator.py
+        return sample_score(home_team, away_team)
 
 
 print('Here is the final score')
 result = Score()
-a = print(result.ft())
+a = result.ft()
+print(a)
 
 if a == pred:
     print("You're awesome, you've won $5000.00")
@@ -1,6 +1,12 @@
 # Simple Shopping Cart
 # Goal: Simulate a real shopping system.
+import sys
+
+from fruit_catalog import Catalog, Product
+from receipts import ReceiptWriter
+
 store = {"apple": 200, "banana": 150, 'orange': 200, 'watermelon': 300}
+catalog = Catalog(Product(name, dollars * 100) for name, dollars in store.items())
 cart = { }
 print("""
 Welcome to the fruit store
@@ -14,11 +20,22 @@ while True:
     if item == 'done': # done to exit ordering
         break
 
-    if item not in store:
-        print('Sorry that item is not available')
+    if catalog.get(item) is None:
+        matches = catalog.search(item, limit=5)
+        if matches:
+            print('Did you mean: ' + ', '.join(p.name for p in matches) + '?')
+        else:
+            print('Sorry that item is not available')
         continue
 
-    qaunt = int(input(f"How many {item}s do you want? "))
+    try:
+        qaunt = int(input(f"How many {item}s do you want? "))
+    except ValueError:
+        print('Please enter a whole number.')
+        continue
+    if qaunt <= 0:
+        print('Please enter a number above zero.')
+        continue
 
     # adding to cart
     if item in cart:
@@ -27,16 +44,6 @@ while True:
         cart[item] = qaunt
 
 
-print('-----------------------------------')
-print('RECEIPT')
-print('-----------------------------------')
-total = 0
-for item, qty in cart.items():
-    cost = store[item] * qty
-    total += cost
-    print(f"{item} x{qty} = ${cost}")
-
-
-print('-----------------------------------')
-print(f"Total = ${total}.00")
-print('-----------------------------------')
\ No newline at end of file
+quote = catalog.quote(cart.items())
+with ReceiptWriter(sys.stdout) as receipt:
+    receipt.write(quote)
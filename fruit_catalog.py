@@ -0,0 +1,374 @@
+"""
+Product catalog and order pricing for fruit store.py.
+
+A catalog file has one product per line, all money in integer cents:
+    name,price,stock,tiers
+e.g. "apple,200,1500,10:180 50:160" - apples are $2.00 each, $1.80 each
+when buying 10 or more and $1.60 from 50; 1,500 are in stock. Names are
+lowercase and may contain spaces but not commas, colons or semicolons.
+
+Products are found by exact name (a dict) or by prefix (a sorted list of
+names and bisect), so "app" finds apple, apple-gala, ... without a scan.
+
+Pricing a cart is one pass over its lines: quantities are added up per
+product, each product's unit price comes from its tiers, and a discount
+code (DISCOUNTS) comes off the subtotal. place() does the same and, only
+if every line is in stock, takes the quantities off the shelf - all under
+one lock, so concurrent orders never oversell.
+
+An orders file has one order per line:
+    order_id,discount_code,item:qty;item:qty;...
+(the code may be empty). `process` places them all in file order.
+
+    python fruit_catalog.py generate catalog.csv --products 100000
+    python fruit_catalog.py orders catalog.csv orders.csv --count 1000000
+    python fruit_catalog.py process catalog.csv orders.csv --verify
+    python fruit_catalog.py search catalog.csv "blood"
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from persistence import atomic_write
+
+REASONS = ("unknown_item", "bad_quantity", "bad_code", "out_of_stock", "malformed")
+
+
+class Discount:
+    """`percent` off the subtotal, for orders of at least `min_subtotal` cents."""
+
+    __slots__ = ("code", "percent", "min_subtotal")
+
+    def __init__(self, code: str, percent: int, min_subtotal: int = 0) -> None:
+        self.code = code
+        self.percent = percent
+        self.min_subtotal = min_subtotal
+
+    def amount(self, subtotal: int) -> int:
+        if subtotal < self.min_subtotal:
+            return 0
+        return (subtotal * self.percent + 50) // 100  # to the nearest cent
+
+
+DISCOUNTS = {
+    "FRESH10": Discount("FRESH10", 10, 5_000),
+    "BULK15": Discount("BULK15", 15, 50_000),
+}
+
+
+def format_cents(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    return f"{sign}${abs(cents) // 100:,}.{abs(cents) % 100:02d}"
+
+
+class Product:
+    """One catalog line. `tiers` is ((min_qty, unit_price), ...) by min_qty."""
+
+    __slots__ = ("name", "price", "stock", "tiers", "_breaks")
+
+    def __init__(self, name: str, price: int, stock: int = 0,
+                 tiers: Iterable[Tuple[int, int]] = ()) -> None:
+        self.name = name
+        self.price = price
+        self.stock = stock
+        self.tiers = tuple(sorted(tiers))
+        self._breaks = [q for q, _ in self.tiers]
+
+    def unit_price(self, qty: int) -> int:
+        """The price of each item when buying qty of them."""
+        tier = bisect_right(self._breaks, qty)
+        return self.tiers[tier - 1][1] if tier else self.price
+
+    def to_line(self) -> str:
+        tiers = " ".join(f"{q}:{p}" for q, p in self.tiers)
+        return f"{self.name},{self.price},{self.stock},{tiers}\n"
+
+    @classmethod
+    def from_line(cls, line: str) -> "Product":
+        name, price, stock, tiers = line.split(",")
+        return cls(name.strip().lower(), int(price), int(stock),
+                   [tuple(map(int, t.split(":"))) for t in tiers.split()])
+
+
+class Quote:
+    """
+    A priced cart.
+
+    `lines` are (name, qty, unit price, line total); `code` is the discount
+    code applied, if any. If the cart can't be sold, `error` is one of
+    REASONS and `detail` says which item or code.
+    """
+
+    __slots__ = ("lines", "subtotal", "code", "discount", "total", "error", "detail")
+
+    def __init__(self) -> None:
+        self.lines: List[Tuple[str, int, int, int]] = []
+        self.subtotal = 0
+        self.code = ""
+        self.discount = 0
+        self.total = 0
+        self.error: Optional[str] = None
+        self.detail = ""
+
+    def fail(self, error: str, detail: str) -> "Quote":
+        self.error = error
+        self.detail = detail
+        return self
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class Catalog:
+    """
+    Products by name, with prefix search and stock.
+
+    Args:
+        products: The catalog's products; later duplicates of a name win.
+        discounts: Discount codes accepted by quote() and place().
+    """
+
+    def __init__(self, products: Iterable[Product] = (), discounts: Optional[Dict[str, Discount]] = None) -> None:
+        self.products: Dict[str, Product] = {p.name: p for p in products}
+        self._names = sorted(self.products)
+        self.discounts = DISCOUNTS if discounts is None else discounts
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "Catalog":
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        return cls(Product.from_line(line) for line in lines if line.strip())
+
+    def save(self, path: str) -> None:
+        atomic_write(path, "".join(self.products[name].to_line() for name in self._names))
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def get(self, name: str) -> Optional[Product]:
+        return self.products.get(name.strip().lower())
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> List[Product]:
+        """Products whose name starts with prefix, alphabetically."""
+        prefix = prefix.strip().lower()
+        start = bisect_left(self._names, prefix)
+        end = bisect_left(self._names, prefix + "\uffff", start)
+        if limit is not None:
+            end = min(end, start + limit)
+        return [self.products[name] for name in self._names[start:end]]
+
+    def quote(self, items: Iterable[Tuple[str, int]], code: Optional[str] = None) -> Quote:
+        """Price (name, qty) pairs; stock is not checked or changed."""
+        quote = Quote()
+        wanted: Dict[str, int] = {}
+        products = self.products
+        for name, qty in items:
+            name = name.strip().lower()
+            if name not in products:
+                return quote.fail("unknown_item", name)
+            if qty <= 0:
+                return quote.fail("bad_quantity", name)
+            wanted[name] = wanted.get(name, 0) + qty
+
+        subtotal = 0
+        lines = quote.lines
+        for name, qty in wanted.items():
+            unit = products[name].unit_price(qty)
+            lines.append((name, qty, unit, unit * qty))
+            subtotal += unit * qty
+        quote.subtotal = subtotal
+
+        if code:
+            discount = self.discounts.get(code.strip().upper())
+            if discount is None:
+                return quote.fail("bad_code", code)
+            quote.code = discount.code
+            quote.discount = discount.amount(subtotal)
+        quote.total = subtotal - quote.discount
+        return quote
+
+    def place(self, items: Iterable[Tuple[str, int]], code: Optional[str] = None) -> Quote:
+        """quote(), then take the items out of stock if all of them are there."""
+        quote = self.quote(items, code)
+        if not quote.ok:
+            return quote
+        products = self.products
+        with self._lock:
+            for name, qty, _, _ in quote.lines:
+                if products[name].stock < qty:
+                    return quote.fail("out_of_stock", name)
+            for name, qty, _, _ in quote.lines:
+                products[name].stock -= qty
+        return quote
+
+
+# ------------------ ORDER STREAMS ------------------
+
+def parse_order(line: str) -> Optional[Tuple[str, str, List[Tuple[str, int]]]]:
+    """(order_id, discount_code, [(name, qty), ...]), or None if the line is malformed."""
+    parts = line.rstrip("\n").split(",")
+    if len(parts) != 3:
+        return None
+    order_id, code, cart = parts
+    items = []
+    for entry in cart.split(";"):
+        name, _, qty = entry.rpartition(":")
+        try:
+            items.append((name, int(qty)))
+        except ValueError:
+            return None
+    return order_id, code, items
+
+
+class OrderStats:
+    """What a stream of orders did: placed, rejected by reason, takings."""
+
+    __slots__ = ("placed", "rejected", "revenue", "discounts", "sold")
+
+    def __init__(self) -> None:
+        self.placed = 0
+        self.rejected: Dict[str, int] = dict.fromkeys(REASONS, 0)
+        self.revenue = 0
+        self.discounts = 0
+        self.sold: Dict[str, int] = {}   # units per product
+
+    @property
+    def total(self) -> int:
+        return self.placed + sum(self.rejected.values())
+
+    def report(self) -> str:
+        return "\n".join([
+            f"  placed {self.placed:,} of {self.total:,} orders; rejected: "
+            + ", ".join(f"{r} {n:,}" for r, n in self.rejected.items()),
+            f"  revenue {format_cents(self.revenue)} after {format_cents(self.discounts)} of discounts; "
+            f"{sum(self.sold.values()):,} items sold",
+        ])
+
+
+def process_orders(catalog: Catalog, lines: Iterable[str]) -> OrderStats:
+    """Place every order in lines, in order."""
+    stats = OrderStats()
+    sold = stats.sold
+    rejected = stats.rejected
+    for line in lines:
+        if not line.strip():
+            continue
+        order = parse_order(line)
+        if order is None:
+            rejected["malformed"] += 1
+            continue
+        _, code, items = order
+        quote = catalog.place(items, code)
+        if not quote.ok:
+            rejected[quote.error] += 1
+            continue
+        stats.placed += 1
+        stats.revenue += quote.total
+        stats.discounts += quote.discount
+        for name, qty, _, _ in quote.lines:
+            sold[name] = sold.get(name, 0) + qty
+    return stats
+
+
+# ------------------ COMMAND LINE ------------------
+
+FRUITS = ["apple", "banana", "orange", "watermelon", "mango", "pear", "grape", "kiwi",
+          "blood orange", "cherry", "plum", "peach", "lemon", "lime", "papaya", "guava"]
+
+
+def generate_catalog(path: str, count: int, seed: int = 1) -> None:
+    """A catalog of `count` products named like "apple", "apple 2", ..."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        fruit = FRUITS[i % len(FRUITS)]
+        name = fruit if i < len(FRUITS) else f"{fruit} {i // len(FRUITS) + 1}"
+        price = rng.randrange(50, 2_000)
+        tiers = [(10, price * 9 // 10), (50, price * 8 // 10)] if rng.random() < 0.5 else []
+        lines.append(Product(name, price, rng.randrange(100, 10_000), tiers).to_line())
+    atomic_write(path, "".join(lines))
+
+
+def generate_orders(path: str, catalog: Catalog, count: int, seed: int = 1) -> None:
+    """`count` random orders against catalog, with a few bad ones mixed in."""
+    rng = random.Random(seed)
+    names = sorted(catalog.products)
+    codes = [""] * 8 + list(catalog.discounts)
+    with open(path, "w", encoding="utf-8") as f:
+        for start in range(0, count, 100_000):
+            rows = []
+            for i in range(start, min(start + 100_000, count)):
+                cart = ";".join(f"{rng.choice(names)}:{rng.choice((1, 1, 2, 3, 5, 12))}"
+                                for _ in range(rng.randint(1, 6)))
+                if rng.random() < 0.001:
+                    cart += ";dragonfruit:1"
+                rows.append(f"O{i:09d},{rng.choice(codes)},{cart}\n")
+            f.write("".join(rows))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Fruit store catalog and bulk orders.")
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    gen = modes.add_parser("generate", help="write a random catalog")
+    gen.add_argument("catalog")
+    gen.add_argument("--products", type=int, default=100_000)
+
+    orders = modes.add_parser("orders", help="write random orders for a catalog")
+    orders.add_argument("catalog")
+    orders.add_argument("orders")
+    orders.add_argument("--count", type=int, default=1_000_000)
+
+    process = modes.add_parser("process", help="place every order in an orders file")
+    process.add_argument("catalog")
+    process.add_argument("orders")
+    process.add_argument("--save", action="store_true", help="write the remaining stock back to the catalog")
+    process.add_argument("--verify", action="store_true", help="check stock went down by exactly what was sold")
+
+    search = modes.add_parser("search", help="list products by name prefix")
+    search.add_argument("catalog")
+    search.add_argument("prefix")
+    search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.mode == "generate":
+        generate_catalog(args.catalog, args.products)
+        return
+
+    start = time.perf_counter()
+    catalog = Catalog.load(args.catalog)
+    print(f"Loaded {len(catalog):,} products in {time.perf_counter() - start:.2f}s")
+
+    if args.mode == "orders":
+        generate_orders(args.orders, catalog, args.count)
+    elif args.mode == "search":
+        for p in catalog.search(args.prefix, args.limit):
+            tiers = ", ".join(f"{format_cents(u)} from {q}" for q, u in p.tiers)
+            print(f"  {p.name:<24} {format_cents(p.price):>9}  stock {p.stock:>6,}  {tiers}")
+    else:
+        before = {name: p.stock for name, p in catalog.products.items()}
+        start = time.perf_counter()
+        with open(args.orders, "r", encoding="utf-8") as f:
+            stats = process_orders(catalog, f)
+        elapsed = time.perf_counter() - start
+        print(stats.report())
+        print(f"{stats.total:,} orders in {elapsed:.2f}s ({stats.total / elapsed if elapsed else 0:,.0f} orders/sec)")
+        if args.verify:
+            bad = [name for name, p in catalog.products.items()
+                   if p.stock < 0 or before[name] - p.stock != stats.sold.get(name, 0)]
+            print("Stock is consistent" if not bad else f"Stock DIFFERS for {len(bad):,} products, e.g. {bad[0]}")
+            if bad:
+                sys.exit(1)
+        if args.save:
+            catalog.save(args.catalog)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
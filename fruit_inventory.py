@@ -0,0 +1,401 @@
+"""
+Stock reservations for concurrent checkouts in the fruit store.
+
+A checkout first reserves its items, then takes payment, then commits:
+
+    reservation = inventory.reserve([("apple", 3), ("kiwi", 12)])
+    if reservation is None:
+        ...  # not enough stock
+    ...      # take payment - slow, and no locks are held meanwhile
+    inventory.commit(reservation)   # or release(reservation)
+
+Reserved stock can't be sold to anyone else, so two checkouts can never
+both get the last apple. A reservation that is neither committed nor
+released within its ttl expires and its stock goes back on the shelf.
+
+Every product has its own lock, held only while its numbers change (never
+during payment). An order locks just its own products, in name order so
+two orders can't deadlock; checkouts of unrelated products never wait for
+each other, however busy a hot product gets. Expiry times go into
+EXPIRY_SHARDS heaps, so recording them isn't one global lock either.
+Reservations are handed to exactly one of commit/release/expiry by an
+atomic dict.pop(). Asyncio code can use the same calls: no lock is ever
+held across an await.
+
+The benchmark compares this with holding a lock across payment, one
+global lock ("global") or per-product locks ("item"):
+
+    python fruit_inventory.py bench --workers 1 2 4 8 16 32
+    python fruit_inventory.py bench --asyncio --workers 1 10 100 1000
+"""
+
+import argparse
+import asyncio
+import heapq
+import itertools
+import random
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fruit_catalog import Catalog, Product, Quote
+
+DEFAULT_TTL = 15 * 60.0    # seconds a reservation holds stock
+EXPIRY_SHARDS = 16
+SWEEP_INTERVAL = 1.0       # seconds between opportunistic expiry sweeps
+
+
+class Reservation:
+    """Stock held for one checkout: ((name, qty), ...) until `expires`."""
+
+    __slots__ = ("id", "lines", "expires")
+
+    def __init__(self, reservation_id: int, lines: Tuple[Tuple[str, int], ...], expires: float) -> None:
+        self.id = reservation_id
+        self.lines = lines
+        self.expires = expires
+
+
+class _Stock:
+    __slots__ = ("lock", "reserved")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.reserved = 0
+
+
+class Inventory:
+    """
+    Reservations against a Catalog's stock levels.
+
+    Once a catalog is managed by an Inventory, sell through checkout() or
+    reserve()/commit() rather than Catalog.place().
+
+    Args:
+        catalog: Where products and stock levels live.
+        ttl: Default seconds before a reservation expires.
+        clock: Time source, in seconds (time.monotonic by default).
+    """
+
+    def __init__(self, catalog: Catalog, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.catalog = catalog
+        self.ttl = ttl
+        self.clock = clock
+        self._stock: Dict[str, _Stock] = {name: _Stock() for name in catalog.products}
+        self._reservations: Dict[int, Reservation] = {}
+        self._ids = itertools.count(1)
+        self._heaps: List[List[Tuple[float, int]]] = [[] for _ in range(EXPIRY_SHARDS)]
+        self._heap_locks = [threading.Lock() for _ in range(EXPIRY_SHARDS)]
+        self._next_sweep = clock() + SWEEP_INTERVAL
+
+    def available(self, name: str) -> int:
+        return self.catalog.products[name].stock - self._stock[name].reserved
+
+    def reserved(self) -> int:
+        """Units held by open reservations."""
+        return sum(s.reserved for s in self._stock.values())
+
+    def reserve(self, items: Iterable[Tuple[str, int]], ttl: Optional[float] = None) -> Optional[Reservation]:
+        """
+        Hold (name, qty) items, all or nothing.
+
+        Returns None if any of them doesn't have enough unreserved stock.
+        Raises KeyError for a product that isn't in the catalog, and
+        ValueError for a quantity below 1 (a negative hold would add stock).
+        """
+        wanted: Dict[str, int] = {}
+        for name, qty in items:
+            if qty <= 0:
+                raise ValueError(f"bad quantity {qty} for {name!r}")
+            wanted[name] = wanted.get(name, 0) + qty
+        lines = tuple(sorted(wanted.items()))
+        now = self.clock()
+        if now >= self._next_sweep:
+            self.sweep(now)
+        if not self._hold(lines):
+            # Expired reservations may be sitting on the stock we need.
+            if not self.sweep(now) or not self._hold(lines):
+                return None
+
+        reservation = Reservation(next(self._ids), lines, now + (self.ttl if ttl is None else ttl))
+        self._reservations[reservation.id] = reservation
+        shard = reservation.id % EXPIRY_SHARDS
+        with self._heap_locks[shard]:
+            heapq.heappush(self._heaps[shard], (reservation.expires, reservation.id))
+        return reservation
+
+    def _hold(self, lines: Tuple[Tuple[str, int], ...]) -> bool:
+        products = self.catalog.products
+        stocks = [self._stock[name] for name, _ in lines]
+        for s in stocks:
+            s.lock.acquire()
+        try:
+            for (name, qty), s in zip(lines, stocks):
+                if products[name].stock - s.reserved < qty:
+                    return False
+            for (_, qty), s in zip(lines, stocks):
+                s.reserved += qty
+            return True
+        finally:
+            for s in stocks:
+                s.lock.release()
+
+    def _unhold(self, reservation: Reservation, sold: bool) -> None:
+        products = self.catalog.products
+        for name, qty in reservation.lines:
+            s = self._stock[name]
+            with s.lock:
+                s.reserved -= qty
+                if sold:
+                    products[name].stock -= qty
+
+    def commit(self, reservation: Reservation) -> bool:
+        """Sell the reserved items. False if the reservation expired or was released."""
+        if self._reservations.pop(reservation.id, None) is None:
+            return False
+        if self.clock() >= reservation.expires:
+            self._unhold(reservation, sold=False)
+            return False
+        self._unhold(reservation, sold=True)
+        return True
+
+    def release(self, reservation: Reservation) -> bool:
+        """Put the reserved items back. False if it was already committed, released or expired."""
+        if self._reservations.pop(reservation.id, None) is None:
+            return False
+        self._unhold(reservation, sold=False)
+        return True
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Release every reservation that has expired; returns how many."""
+        now = self.clock() if now is None else now
+        self._next_sweep = now + SWEEP_INTERVAL
+        expired = 0
+        for heap, lock in zip(self._heaps, self._heap_locks):
+            due = []
+            with lock:
+                while heap and heap[0][0] <= now:
+                    due.append(heapq.heappop(heap)[1])
+            for reservation_id in due:
+                reservation = self._reservations.pop(reservation_id, None)
+                if reservation is not None:  # else already committed or released
+                    self._unhold(reservation, sold=False)
+                    expired += 1
+        return expired
+
+    def checkout(self, items: Iterable[Tuple[str, int]], code: Optional[str] = None,
+                 pay: Optional[Callable[[Quote], bool]] = None) -> Quote:
+        """
+        Price, reserve, take payment (if `pay` is given) and commit one order.
+
+        Besides quote()'s errors, the result can fail with "out_of_stock",
+        "payment" (pay returned False) or "expired".
+        """
+        quote = self.catalog.quote(items, code)
+        if not quote.ok:
+            return quote
+        reservation = self.reserve((name, qty) for name, qty, _, _ in quote.lines)
+        if reservation is None:
+            return quote.fail("out_of_stock", "")
+        if pay is not None and not pay(quote):
+            self.release(reservation)
+            return quote.fail("payment", "")
+        if not self.commit(reservation):
+            return quote.fail("expired", "")
+        return quote
+
+
+# ------------------ CONTENTION BENCHMARK ------------------
+
+MODES = ("reserve", "item", "global")
+
+
+def bench_catalog(products: int, hot_stock: int) -> Catalog:
+    """`products` fruits with plenty of stock, plus one hot item with little."""
+    return Catalog([Product(f"fruit {i}", 100, 1_000_000) for i in range(products)]
+                   + [Product("hot", 100, hot_stock)])
+
+
+def bench_orders(catalog: Catalog, count: int, hot_share: float, seed: int = 1) -> List[List[Tuple[str, int]]]:
+    rng = random.Random(seed)
+    names = [n for n in catalog.products if n != "hot"]
+    orders = []
+    for _ in range(count):
+        order = [(rng.choice(names), rng.randint(1, 5)) for _ in range(rng.randint(1, 3))]
+        if rng.random() < hot_share:
+            order.append(("hot", 1))
+        orders.append(order)
+    return orders
+
+
+class _Result:
+    __slots__ = ("sold", "refused", "units", "latencies")
+
+    def __init__(self) -> None:
+        self.sold = 0
+        self.refused = 0
+        self.units = 0
+        self.latencies: List[float] = []
+
+    def add(self, order, ok: bool, latency: float) -> None:
+        self.latencies.append(latency)
+        if ok:
+            self.sold += 1
+            self.units += sum(qty for _, qty in order)
+        else:
+            self.refused += 1
+
+
+def _locked_checkout(catalog: Catalog, locks: Dict[str, threading.Lock], order, payment: float) -> bool:
+    """The naive way: hold the lock(s) while checking, paying and decrementing."""
+    wanted: Dict[str, int] = {}
+    for name, qty in order:
+        wanted[name] = wanted.get(name, 0) + qty
+    held = list(dict.fromkeys(locks[name] for name in sorted(wanted)))
+    for lock in held:
+        lock.acquire()
+    try:
+        products = catalog.products
+        if any(products[name].stock < qty for name, qty in wanted.items()):
+            return False
+        time.sleep(payment)
+        for name, qty in wanted.items():
+            products[name].stock -= qty
+        return True
+    finally:
+        for lock in held:
+            lock.release()
+
+
+def run_threads(mode: str, workers: int, orders, inventory: Inventory, payment: float) -> _Result:
+    catalog = inventory.catalog
+    if mode == "global":
+        shared = threading.Lock()
+        locks = {name: shared for name in catalog.products}
+    else:
+        locks = {name: threading.Lock() for name in catalog.products}
+    result = _Result()
+    queue = iter(orders)
+    queue_lock = threading.Lock()
+    result_lock = threading.Lock()
+
+    def pay(quote: Quote) -> bool:
+        time.sleep(payment)
+        return True
+
+    def worker() -> None:
+        while True:
+            with queue_lock:
+                order = next(queue, None)
+            if order is None:
+                return
+            start = time.perf_counter()
+            if mode == "reserve":
+                ok = inventory.checkout(order, pay=pay).ok
+            else:
+                ok = _locked_checkout(catalog, locks, order, payment)
+            latency = time.perf_counter() - start
+            with result_lock:
+                result.add(order, ok, latency)
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return result
+
+
+def run_tasks(mode: str, workers: int, orders, inventory: Inventory, payment: float) -> _Result:
+    catalog = inventory.catalog
+    result = _Result()
+    queue = iter(orders)
+
+    async def worker(lock: Optional[asyncio.Lock]) -> None:
+        for order in queue:
+            start = time.perf_counter()
+            quote = catalog.quote(order)
+            if lock is not None:  # "global": one asyncio.Lock held across payment
+                async with lock:
+                    ok = all(catalog.products[name].stock >= qty for name, qty, _, _ in quote.lines)
+                    if ok:
+                        await asyncio.sleep(payment)
+                        for name, qty, _, _ in quote.lines:
+                            catalog.products[name].stock -= qty
+            else:
+                reservation = inventory.reserve((name, qty) for name, qty, _, _ in quote.lines)
+                ok = reservation is not None
+                if ok:
+                    await asyncio.sleep(payment)
+                    ok = inventory.commit(reservation)
+            result.add(order, ok, time.perf_counter() - start)
+
+    async def run() -> None:
+        lock = asyncio.Lock() if mode == "global" else None
+        await asyncio.gather(*(worker(lock) for _ in range(workers)))
+
+    asyncio.run(run())
+    return result
+
+
+def bench(workers: List[int], modes: List[str], count: int, products: int, hot_share: float,
+          hot_stock: int, payment_ms: float, use_asyncio: bool) -> bool:
+    """Print throughput per mode and worker count; False if stock ever went wrong."""
+    payment = payment_ms / 1000
+    consistent = True
+    print(f"{count:,} orders over {products:,} products, {hot_share:.0%} also want the hot item "
+          f"(stock {hot_stock:,}); payment takes {payment_ms:g}ms; "
+          f"{'asyncio tasks' if use_asyncio else 'threads'}")
+    print(f"  {'mode':<8} {'workers':>7} {'orders/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'sold':>7} {'refused':>8}")
+    run = run_tasks if use_asyncio else run_threads
+    for mode in modes:
+        if use_asyncio and mode == "item":
+            continue  # tasks holding per-product locks across an await is just "reserve" without expiry
+        for n in workers:
+            catalog = bench_catalog(products, hot_stock)
+            before = sum(p.stock for p in catalog.products.values())
+            orders = bench_orders(catalog, count, hot_share)
+            inventory = Inventory(catalog)
+            start = time.perf_counter()
+            result = run(mode, n, orders, inventory, payment)
+            elapsed = time.perf_counter() - start
+
+            # Stock fell by exactly what was sold, and never below zero.
+            after = sum(p.stock for p in catalog.products.values())
+            if (before - after != result.units or inventory.reserved()
+                    or any(p.stock < 0 for p in catalog.products.values())):
+                consistent = False
+                print(f"  {mode} with {n} workers: stock is INCONSISTENT")
+
+            latencies = sorted(result.latencies)
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+            print(f"  {mode:<8} {n:>7} {count / elapsed:>10,.0f} {p50:>8.2f} {p99:>8.2f} "
+                  f"{result.sold:>7,} {result.refused:>8,}")
+    return consistent
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent checkouts under contention.")
+    modes = parser.add_subparsers(dest="mode", required=True)
+    b = modes.add_parser("bench", help="throughput by locking mode and worker count")
+    b.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    b.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    b.add_argument("--orders", type=int, default=2000)
+    b.add_argument("--products", type=int, default=1000)
+    b.add_argument("--hot-share", type=float, default=0.2, help="fraction of orders that include the hot item")
+    b.add_argument("--hot-stock", type=int, default=100)
+    b.add_argument("--payment-ms", type=float, default=2.0, help="simulated payment time per order")
+    b.add_argument("--asyncio", action="store_true", help="run checkouts as asyncio tasks instead of threads")
+    args = parser.parse_args(argv)
+
+    ok = bench(args.workers, args.modes, args.orders, args.products, args.hot_share,
+               args.hot_stock, args.payment_ms, args.asyncio)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
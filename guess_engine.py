@@ -0,0 +1,313 @@
+"""
+Number guessing game engine shared by guess_game.py and "guess game.py".
+
+The game: a secret number is picked between `low` and `high`; the player
+has `max_trials` guesses and is told "HIGHER" or "LOWER" after each miss.
+Winning on attempt n scores (max_trials - n + 1) * 20 points; losing
+scores 0.
+
+Besides the interactive game this module has:
+    GuessingGame  the rules without any input()/print(), for code to play
+    strategies    "binary" (always guess the middle of what's left - the
+                  optimal player), "random" (a random number that's still
+                  possible) and "linear" (count up from the bottom)
+    simulate()    plays many games per strategy and reports win rate,
+                  mean attempts and the score distribution. Uses NumPy
+                  (all games advance together, one array op per round)
+                  when it is installed, otherwise a process pool.
+
+Simulate from the command line, e.g.
+    python guess_engine.py --games 1000000 --high 1000 --trials 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; simulate() falls back to processes
+    np = None
+
+LOW = 1
+HIGH = 20
+MAX_TRIALS = 5
+
+# Games per vectorized batch / per process-pool job.
+BATCH_SIZE = 1_000_000
+
+
+def score_for(attempts: int, max_trials: int = MAX_TRIALS) -> int:
+    """Points for winning on attempt number `attempts`."""
+    return (max_trials - attempts + 1) * 20
+
+
+class GuessingGame:
+    """
+    One round of the guessing game, with no input or output.
+
+    Args:
+        low, high: Range of the secret number (inclusive).
+        max_trials: Guesses allowed.
+        secret: The number to guess (random if not given).
+    """
+
+    def __init__(self, low: int = LOW, high: int = HIGH, max_trials: int = MAX_TRIALS,
+                 secret: Optional[int] = None) -> None:
+        if low > high:
+            raise ValueError("low must not be greater than high")
+        self.low = low
+        self.high = high
+        self.max_trials = max_trials
+        self.secret = random.randint(low, high) if secret is None else secret
+        self.attempts = 0
+        self.won = False
+
+    @property
+    def over(self) -> bool:
+        return self.won or self.attempts >= self.max_trials
+
+    @property
+    def score(self) -> int:
+        return score_for(self.attempts, self.max_trials) if self.won else 0
+
+    def guess(self, number: int) -> str:
+        """Make a guess. Returns "correct", "higher" or "lower"."""
+        if self.over:
+            raise RuntimeError("the game is over")
+        self.attempts += 1
+        if number == self.secret:
+            self.won = True
+            return "correct"
+        return "higher" if number < self.secret else "lower"
+
+
+# ------------------ STRATEGIES ------------------
+# Each strategy picks a guess from the range still possible (lo..hi).
+# pick() works on ints; pick_many() on NumPy arrays of many games at once.
+
+class BinarySearch:
+    """Guess the middle of what's left. Never needs more than log2(range)+1 guesses."""
+    name = "binary"
+
+    def pick(self, lo, hi, rng):
+        return (lo + hi) // 2
+
+    def pick_many(self, lo, hi, rng):
+        return (lo + hi) // 2
+
+
+class RandomGuess:
+    """Guess any number that is still possible."""
+    name = "random"
+
+    def pick(self, lo, hi, rng):
+        return rng.randint(lo, hi)
+
+    def pick_many(self, lo, hi, rng):
+        return rng.integers(lo, hi + 1)
+
+
+class Linear:
+    """Count up from the lowest possible number."""
+    name = "linear"
+
+    def pick(self, lo, hi, rng):
+        return lo
+
+    def pick_many(self, lo, hi, rng):
+        return lo.copy()
+
+
+STRATEGIES = {s.name: s for s in (BinarySearch(), RandomGuess(), Linear())}
+
+
+def play_auto(game: GuessingGame, strategy, rng: Optional[random.Random] = None) -> GuessingGame:
+    """Let a strategy play `game` to the end."""
+    rng = rng or random.Random()
+    lo, hi = game.low, game.high
+    while not game.over:
+        number = strategy.pick(lo, hi, rng)
+        hint = game.guess(number)
+        if hint == "higher":
+            lo = number + 1
+        elif hint == "lower":
+            hi = number - 1
+    return game
+
+
+# ------------------ SIMULATION ------------------
+
+class SimulationResult:
+    """Totals from many games of one strategy."""
+
+    def __init__(self, strategy: str, max_trials: int) -> None:
+        self.strategy = strategy
+        self.max_trials = max_trials
+        self.games = 0
+        self.wins = 0
+        self.total_attempts = 0
+        self.attempt_counts: Counter = Counter()  # winning attempt number -> games
+
+    def merge(self, other: "SimulationResult") -> None:
+        self.games += other.games
+        self.wins += other.wins
+        self.total_attempts += other.total_attempts
+        self.attempt_counts.update(other.attempt_counts)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def mean_attempts(self) -> float:
+        """Average guesses used per game (a loss uses all max_trials)."""
+        return self.total_attempts / self.games if self.games else 0.0
+
+    @property
+    def score_distribution(self) -> Dict[int, int]:
+        """Points -> number of games (0 points = lost)."""
+        scores = {score_for(n, self.max_trials): c for n, c in self.attempt_counts.items()}
+        scores[0] = self.games - self.wins
+        return dict(sorted(scores.items(), reverse=True))
+
+    @property
+    def mean_score(self) -> float:
+        return sum(s * c for s, c in self.score_distribution.items()) / self.games if self.games else 0.0
+
+
+def _simulate_python(args) -> SimulationResult:
+    strategy_name, games, low, high, max_trials, seed = args
+    strategy = STRATEGIES[strategy_name]
+    rng = random.Random(seed)
+    result = SimulationResult(strategy_name, max_trials)
+    for _ in range(games):
+        game = play_auto(GuessingGame(low, high, max_trials, rng.randint(low, high)), strategy, rng)
+        result.games += 1
+        result.total_attempts += game.attempts
+        if game.won:
+            result.wins += 1
+            result.attempt_counts[game.attempts] += 1
+    return result
+
+
+def _simulate_numpy(strategy, games, low, high, max_trials, rng) -> SimulationResult:
+    result = SimulationResult(strategy.name, max_trials)
+    secret = rng.integers(low, high + 1, size=games)
+    lo = np.full(games, low, dtype=np.int64)
+    hi = np.full(games, high, dtype=np.int64)
+    won_at = np.zeros(games, dtype=np.int64)   # 0 = not won (yet)
+
+    for attempt in range(1, max_trials + 1):
+        active = won_at == 0
+        if not active.any():
+            break
+        guess = strategy.pick_many(lo, hi, rng)
+        hit = active & (guess == secret)
+        won_at[hit] = attempt
+        higher = active & (guess < secret)
+        lower = active & (guess > secret)
+        lo[higher] = guess[higher] + 1
+        hi[lower] = guess[lower] - 1
+
+    wins = won_at[won_at > 0]
+    result.games = games
+    result.wins = int(wins.size)
+    result.total_attempts = int(wins.sum()) + (games - result.wins) * max_trials
+    result.attempt_counts = Counter({n: int(c) for n, c in enumerate(np.bincount(wins)) if n and c})
+    return result
+
+
+def simulate(strategy_name: str, games: int, low: int = LOW, high: int = HIGH,
+             max_trials: int = MAX_TRIALS, workers: int = 1, seed: Optional[int] = None) -> SimulationResult:
+    """
+    Play `games` games with one strategy and return the totals.
+
+    Uses NumPy if it is installed; otherwise splits the games across
+    `workers` processes running the plain-Python engine.
+    """
+    strategy = STRATEGIES[strategy_name]
+    total = SimulationResult(strategy_name, max_trials)
+    batches = [min(BATCH_SIZE, games - start) for start in range(0, games, BATCH_SIZE)]
+
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        for size in batches:
+            total.merge(_simulate_numpy(strategy, size, low, high, max_trials, rng))
+        return total
+
+    seeds = random.Random(seed)
+    jobs = [(strategy_name, size, low, high, max_trials, seeds.getrandbits(64)) for size in batches]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            for part in pool.map(_simulate_python, jobs):
+                total.merge(part)
+    else:
+        for job in jobs:
+            total.merge(_simulate_python(job))
+    return total
+
+
+# ------------------ INTERACTIVE ------------------
+
+def play(low: int = LOW, high: int = HIGH, max_trials: int = MAX_TRIALS, title: str = "NUMBER GUESSING GAME") -> None:
+    """Play one game in the terminal."""
+    game = GuessingGame(low, high, max_trials)
+
+    print(title)
+    print(f"Guess the secret number. (Hint: It's between {low} and {high})")
+    print(f"You have {max_trials} attempts. Good luck!")
+
+    while not game.over:
+        try:
+            guess = int(input(f"Enter Guess #{game.attempts + 1}: "))
+        except ValueError:
+            print("Invalid input! Please enter a whole number.")
+            continue
+
+        hint = game.guess(guess)
+        if hint == "correct":
+            print(f"\nYou're CORRECT! The number was {game.secret}.")
+            print(f"You guessed it in {game.attempts} attempt(s).")
+            print(f"Final score: {game.score} points.")
+            return
+        print(f"Nope! The number is {hint.upper()}.")
+
+    print("Game Over! You've used up all attempts.")
+    print(f"The number was {game.secret}. Better luck next time.")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate the number guessing game.")
+    parser.add_argument("--games", type=int, default=1_000_000, help="games per strategy")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), action="append",
+                        help="strategy to run (repeatable; default: all)")
+    parser.add_argument("--low", type=int, default=LOW)
+    parser.add_argument("--high", type=int, default=HIGH)
+    parser.add_argument("--trials", type=int, default=MAX_TRIALS, help="guesses allowed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes to use when NumPy isn't installed")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    engine = "NumPy" if np is not None else f"{args.workers} process(es)"
+    print(f"{args.games:,} games per strategy, numbers {args.low}-{args.high}, "
+          f"{args.trials} trials, using {engine}")
+    for name in args.strategy or sorted(STRATEGIES):
+        start = time.perf_counter()
+        result = simulate(name, args.games, args.low, args.high, args.trials, args.workers, args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"\n[{name}] {elapsed:.2f}s ({result.games / elapsed:,.0f} games/sec)")
+        print(f"  win rate: {result.win_rate:.2%}   mean attempts: {result.mean_attempts:.3f}"
+              f"   mean score: {result.mean_score:.2f}")
+        distribution = "  ".join(f"{s}:{c / result.games:.2%}" for s, c in result.score_distribution.items())
+        print(f"  scores: {distribution}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
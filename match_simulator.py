@@ -0,0 +1,295 @@
+"""
+Football match simulator for football prediction.py.
+
+Each team has an attack and a defence strength (TEAMS). For a fixture,
+home and away goals are Poisson with means
+
+    home: LEAGUE_GOALS * home attack * away defence * HOME_ADVANTAGE
+    away: LEAGUE_GOALS * away attack * home defence
+
+"poisson" treats the two scores as independent. "dixon-coles" (Dixon &
+Coles, 1997) corrects the low scores 0-0, 1-0, 0-1 and 1-1, which plain
+Poisson gets wrong in real football, by a factor tau(x, y) set by rho.
+
+simulate() plays many matches per fixture and reports exact-score,
+win/draw/loss and over/under probabilities. With NumPy, a whole batch of
+matches is one rng.poisson() call per side (Dixon-Coles by rejection
+sampling: accept each draw with probability tau / max tau). Without it,
+scores are drawn from the exact score table with random.choices().
+exact() gives the same report straight from that table, which is what a
+prediction is scored against.
+
+    python match_simulator.py --matches 5000000 --model dixon-coles
+    python match_simulator.py --fixture 1 --predict 2 1 --exact
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; simulate() falls back to random.choices()
+    np = None
+
+LEAGUE_GOALS = 1.35      # mean goals per team per match
+HOME_ADVANTAGE = 1.2
+DEFAULT_RHO = -0.13      # Dixon-Coles low-score correction
+MAX_GOALS = 15           # score table size per side; more is lumped in with MAX_GOALS
+MODELS = ("poisson", "dixon-coles")
+OVER_UNDER = (0.5, 1.5, 2.5, 3.5, 4.5)
+
+# Matches per vectorized batch.
+BATCH_SIZE = 1_000_000
+
+# team: (attack, defence); above 1 means scores more / concedes more.
+TEAMS = {
+    "Chelsea": (1.15, 0.85),
+    "Man U": (1.05, 0.95),
+    "Atalanta": (1.20, 1.00),
+    "Napoli": (1.25, 0.80),
+    "Bayern": (1.60, 0.75),
+    "Frankfurt": (1.00, 1.10),
+    "Barcelona": (1.50, 0.75),
+    "Elche": (0.75, 1.30),
+}
+
+FIXTURES = {
+    1: ("Chelsea", "Man U"),
+    2: ("Atalanta", "Napoli"),
+    3: ("Bayern", "Frankfurt"),
+    4: ("Barcelona", "Elche"),
+}
+
+
+def goal_rates(home: str, away: str) -> Tuple[float, float]:
+    """Expected goals (home, away) for a fixture."""
+    home_attack, home_defence = TEAMS[home]
+    away_attack, away_defence = TEAMS[away]
+    return (LEAGUE_GOALS * home_attack * away_defence * HOME_ADVANTAGE,
+            LEAGUE_GOALS * away_attack * home_defence)
+
+
+def tau(x: int, y: int, lam: float, mu: float, rho: float) -> float:
+    """The Dixon-Coles correction for a score of x-y."""
+    if x == 0 and y == 0:
+        return 1 - lam * mu * rho
+    if x == 0 and y == 1:
+        return 1 + lam * rho
+    if x == 1 and y == 0:
+        return 1 + mu * rho
+    if x == 1 and y == 1:
+        return 1 - rho
+    return 1.0
+
+
+def _taus(lam: float, mu: float, rho: float) -> Dict[Tuple[int, int], float]:
+    taus = {(x, y): tau(x, y, lam, mu, rho) for x in (0, 1) for y in (0, 1)}
+    if min(taus.values()) < 0:
+        raise ValueError(f"rho={rho} is too large for goal rates {lam:.2f} and {mu:.2f}")
+    return taus
+
+
+def score_table(lam: float, mu: float, rho: float = 0.0) -> List[List[float]]:
+    """P(home scores x, away scores y) for x, y in 0..MAX_GOALS (the last row/column holds the tail)."""
+    def poisson(rate):
+        probs = [math.exp(-rate)]
+        for k in range(1, MAX_GOALS + 1):
+            probs.append(probs[-1] * rate / k)
+        probs[-1] += max(0.0, 1 - sum(probs))
+        return probs
+
+    home, away = poisson(lam), poisson(mu)
+    table = [[h * a for a in away] for h in home]
+    for (x, y), t in _taus(lam, mu, rho).items():
+        table[x][y] *= t  # the four corrections cancel out, so the table still sums to 1
+    return table
+
+
+class Forecast:
+    """
+    A fixture's score distribution, from simulation or the exact table.
+
+    `table[x][y]` is the probability of an x-y final score.
+    """
+
+    __slots__ = ("home", "away", "model", "matches", "table")
+
+    def __init__(self, home: str, away: str, model: str, table: List[List[float]], matches: int = 0) -> None:
+        self.home = home
+        self.away = away
+        self.model = model
+        self.table = table
+        self.matches = matches   # 0 for an exact forecast
+
+    def chance(self, home_goals: int, away_goals: int) -> float:
+        """P(the score), where MAX_GOALS stands for MAX_GOALS or more (the table's last cell)."""
+        if home_goals < 0 or away_goals < 0:
+            return 0.0  # a negative index would read the table from the end
+        return self.table[min(home_goals, MAX_GOALS)][min(away_goals, MAX_GOALS)]
+
+    def outcomes(self) -> Tuple[float, float, float]:
+        """(home win, draw, away win)."""
+        win = draw = loss = 0.0
+        for x, row in enumerate(self.table):
+            for y, p in enumerate(row):
+                if x > y:
+                    win += p
+                elif x == y:
+                    draw += p
+                else:
+                    loss += p
+        return win, draw, loss
+
+    def over(self, line: float) -> float:
+        """P(total goals > line)."""
+        return sum(p for x, row in enumerate(self.table) for y, p in enumerate(row) if x + y > line)
+
+    def expected_goals(self) -> Tuple[float, float]:
+        return (sum(x * p for x, row in enumerate(self.table) for p in row),
+                sum(y * p for row in self.table for y, p in enumerate(row)))
+
+    def likeliest(self, count: int = 5) -> List[Tuple[Tuple[int, int], float]]:
+        scores = [((x, y), p) for x, row in enumerate(self.table) for y, p in enumerate(row)]
+        return sorted(scores, key=lambda item: -item[1])[:count]
+
+    def rate(self, home_goals: int, away_goals: int) -> str:
+        """How good a prediction of home_goals-away_goals is."""
+        p = self.chance(home_goals, away_goals)
+        (best, best_p), = self.likeliest(1)
+        win, draw, loss = self.outcomes()
+        result = win if home_goals > away_goals else draw if home_goals == away_goals else loss
+        return (f"{score_label(home_goals, away_goals)} has a {p:.1%} chance "
+                f"(log score {math.log2(p) if p else -math.inf:.2f} bits); "
+                f"its result has {result:.1%}. The likeliest score is {score_label(*best)} ({best_p:.1%}).")
+
+    def report(self) -> str:
+        home_xg, away_xg = self.expected_goals()
+        win, draw, loss = self.outcomes()
+        source = f"{self.matches:,} simulated matches" if self.matches else "exact"
+        lines = [
+            f"{self.home} vs {self.away} ({self.model}, {source})",
+            f"  expected goals {home_xg:.2f} - {away_xg:.2f}",
+            f"  {self.home} win {win:.1%}   draw {draw:.1%}   {self.away} win {loss:.1%}",
+            "  likeliest scores: " + ", ".join(f"{score_label(x, y)} {p:.1%}" for (x, y), p in self.likeliest()),
+            "  over/under: " + "   ".join(f"o{line} {self.over(line):.1%}" for line in OVER_UNDER),
+        ]
+        return "\n".join(lines)
+
+
+def score_label(home_goals: int, away_goals: int) -> str:
+    """A score as "2-1"; goals that fall in the table's last cell show as "15+"."""
+    return "-".join(f"{MAX_GOALS}+" if goals >= MAX_GOALS else str(goals) for goals in (home_goals, away_goals))
+
+
+def exact(home: str, away: str, model: str = "dixon-coles", rho: float = DEFAULT_RHO) -> Forecast:
+    lam, mu = goal_rates(home, away)
+    return Forecast(home, away, model, score_table(lam, mu, rho if model == "dixon-coles" else 0.0))
+
+
+def _counts_numpy(lam: float, mu: float, rho: float, matches: int, rng) -> List[int]:
+    size = MAX_GOALS + 1
+    counts = np.zeros(size * size, dtype=np.int64)
+    taus = _taus(lam, mu, rho)
+    top = max(1.0, max(taus.values()))
+    for start in range(0, matches, BATCH_SIZE):
+        n = min(BATCH_SIZE, matches - start)
+        home = rng.poisson(lam, n)
+        away = rng.poisson(mu, n)
+        if rho:
+            # Rejection sampling: keep a draw with probability tau/top, redraw the rest.
+            pending = np.arange(n)
+            while pending.size:
+                h, a = home[pending], away[pending]
+                weight = np.ones(pending.size)
+                for (x, y), t in taus.items():
+                    weight[(h == x) & (a == y)] = t
+                rejected = pending[rng.random(pending.size) * top >= weight]
+                home[rejected] = rng.poisson(lam, rejected.size)
+                away[rejected] = rng.poisson(mu, rejected.size)
+                pending = rejected
+        cells = np.minimum(home, MAX_GOALS) * size + np.minimum(away, MAX_GOALS)
+        counts += np.bincount(cells, minlength=size * size)
+    return counts.tolist()
+
+
+def _counts_python(table: List[List[float]], matches: int, rng: random.Random) -> List[int]:
+    cum_weights = []
+    total = 0.0
+    for row in table:
+        for p in row:
+            total += p
+            cum_weights.append(total)
+    counts = [0] * len(cum_weights)
+    cells = range(len(cum_weights))
+    for start in range(0, matches, BATCH_SIZE):
+        n = min(BATCH_SIZE, matches - start)
+        for cell in rng.choices(cells, cum_weights=cum_weights, k=n):
+            counts[cell] += 1
+    return counts
+
+
+def simulate(home: str, away: str, matches: int, model: str = "dixon-coles",
+             rho: float = DEFAULT_RHO, seed: Optional[int] = None) -> Forecast:
+    """Play `matches` simulated matches of home vs away."""
+    lam, mu = goal_rates(home, away)
+    rho = rho if model == "dixon-coles" else 0.0
+    if np is not None:
+        counts = _counts_numpy(lam, mu, rho, matches, np.random.default_rng(seed))
+    else:
+        counts = _counts_python(score_table(lam, mu, rho), matches, random.Random(seed))
+    size = MAX_GOALS + 1
+    table = [[counts[x * size + y] / matches for y in range(size)] for x in range(size)]
+    return Forecast(home, away, model, table, matches)
+
+
+def sample_score(home: str, away: str, model: str = "dixon-coles", rng: Optional[random.Random] = None) -> Tuple[int, int]:
+    """One realistic final score for home vs away."""
+    lam, mu = goal_rates(home, away)
+    table = score_table(lam, mu, DEFAULT_RHO if model == "dixon-coles" else 0.0)
+    cells = [(x, y) for x in range(len(table)) for y in range(len(table))]
+    return (rng or random).choices(cells, weights=[p for row in table for p in row])[0]
+
+
+def _match_count(text: str) -> int:
+    matches = int(text)
+    if matches < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return matches
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Simulate football matches and score predictions.")
+    parser.add_argument("--fixture", type=int, choices=sorted(FIXTURES), action="append",
+                        help="fixture number (repeatable; default: all)")
+    parser.add_argument("--matches", type=_match_count, default=1_000_000, help="simulated matches per fixture")
+    parser.add_argument("--model", choices=MODELS, default="dixon-coles")
+    parser.add_argument("--rho", type=float, default=DEFAULT_RHO, help="Dixon-Coles low-score correction")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--exact", action="store_true", help="also print the exact distribution")
+    parser.add_argument("--predict", type=int, nargs=2, metavar=("HOME", "AWAY"), help="rate a score prediction")
+    args = parser.parse_args(argv)
+    if args.predict and min(args.predict) < 0:
+        parser.error("--predict goals can't be negative")
+
+    print(f"Sampling with {'NumPy' if np is not None else 'random.choices (NumPy not installed)'}")
+    for number in args.fixture or sorted(FIXTURES):
+        home, away = FIXTURES[number]
+        start = time.perf_counter()
+        forecast = simulate(home, away, args.matches, args.model, args.rho, args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"\n{number}. " + forecast.report())
+        print(f"  {args.matches:,} matches in {elapsed:.2f}s ({args.matches / elapsed if elapsed else 0:,.0f}/sec)")
+        if args.exact or args.predict:
+            truth = exact(home, away, args.model, args.rho)
+            if args.exact:
+                print(truth.report())
+            if args.predict:
+                print("  Prediction: " + truth.rate(*args.predict))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
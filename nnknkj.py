@@ -2,6 +2,8 @@
 import random
 import time
 
+from task_store import Task, TaskStore
+
 # --------------------------
 # DATA
 # --------------------------
@@ -22,19 +24,15 @@ motivational_quotes = [
     "Keep going — you’re closer than you think."
 ]
 
-# Load tasks from file
+TASKS_FILE = "tasks.jsonl"
+
+# Load tasks from file (an old tasks.txt is converted the first time)
 def load_tasks():
-    try:
-        with open("tasks.txt", "r") as f:
-            return [line.strip() for line in f.readlines()]
-    except FileNotFoundError:
-        return []
+    return TaskStore.open(TASKS_FILE, legacy=["tasks.txt"])
 
-# Save tasks to file
+# Save tasks to file (only the changes are appended)
 def save_tasks(tasks):
-    with open("tasks.txt", "w") as f:
-        for t in tasks:
-            f.write(t + "\n")
+    tasks.flush()
 
 
 # --------------------------
@@ -60,27 +58,29 @@ def main():
 
         if choice == "1":
             task = input("Enter new task: ")
-            tasks.append(task)
+            task_id = tasks.add(Task(title=task))
             save_tasks(tasks)
-            print("Task added!")
+            print(f"Task added! (#{task_id})")
 
         elif choice == "2":
             if not tasks:
                 print("No tasks yet!")
             else:
                 print("\nYour Tasks:")
-                for i, t in enumerate(tasks, 1):
-                    print(f"{i}. {t}")
+                for t in tasks:
+                    print(f"{t.id}. {t.title}{' ✓' if t.done else ''}")
 
         elif choice == "3":
             if not tasks:
                 print("No tasks to mark!")
             else:
                 num = int(input("Task number to mark done: "))
-                if 1 <= num <= len(tasks):
-                    print(f"Good job finishing: {tasks[num-1]}!")
-                    tasks[num-1] += " ✓"
+                task = tasks.update(num, done=True)
+                if task:
                     save_tasks(tasks)
+                    print(f"Good job finishing: {task.title}!")
+                elif tasks.was_removed(num):
+                    print("That task was already removed.")
                 else:
                     print("Invalid number")
 
@@ -89,10 +89,12 @@ def main():
                 print("No tasks to remove!")
             else:
                 num = int(input("Task number to remove: "))
-                if 1 <= num <= len(tasks):
-                    removed = tasks.pop(num-1)
+                removed = tasks.remove(num)
+                if removed:
                     save_tasks(tasks)
-                    print(f"Removed: {removed}")
+                    print(f"Removed: {removed.title}")
+                elif tasks.was_removed(num):
+                    print("That task was already removed.")
                 else:
                     print("Invalid number")
 
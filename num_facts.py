@@ -1,30 +1,231 @@
-print('WELCOME TO THE NUMBER FACTS PROGRAM.')
+import argparse
+import sys
+import time
 
-while True:    
-    num = int(input('Enter a whole number: '))
+from number_facts import describe
 
-    if num % 2 == 0:
-        print(f'{num} is even.')
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch mode falls back to plain ints
+    np = None
 
-    if num % 2 == 1:
-        print(f'{num} is odd.')
+# Bytes read per chunk in batch mode.
+CHUNK_BYTES = 8 * 1024 * 1024
 
-    if num > 0:
-        print(f'{num} is positive.')
+# Largest |n| whose square still fits in 64 bits.
+SQUARE_SAFE = 3037000499
 
-    if num < 0:
-        print(f'{num} is negative.')
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
 
-    if num == 0:
-        print('The number is zero.')
+# The middle columns of a table row, by kind (3 * odd + sign code).
+ROW_MIDDLES = tuple(f"\t{parity}\t{sign}\t" for parity in ("even", "odd") for sign in ("0", "+", "-"))
 
-    print(f'The square of {num} is {num * num}')
 
-    try_again = input('Do you want to try again? (yes/no): ').lower()
+def has_lone_sign(data):
+    """
+    Whether some "-" or "+" in data isn't followed by a digit.
 
-    if try_again == 'no':
-        print('Goodbye!')
-        break  
-    elif try_again != 'yes':
-        print("Invalid input. Exiting program.")
-        break
+    np.fromstring reads a lone "-" as 0, or as the sign of the next number,
+    where int() rejects it.
+    """
+    b = np.frombuffer(data, dtype=np.uint8)
+    signs = np.flatnonzero((b == ord("-")) | (b == ord("+")))
+    if not len(signs):
+        return False
+    if signs[-1] == len(b) - 1:
+        return True
+    after = b[signs + 1]
+    return bool(np.any((after < ord("0")) | (after > ord("9"))))
+
+
+def parse_numbers(data):
+    """
+    Parse whitespace-separated integers from bytes.
+
+    Returns (values, bad): values is an int64 array when NumPy is available
+    and every token is a whole number that fits in 64 bits (parsed in one
+    call), otherwise a list of ints; bad is the count of skipped tokens.
+    """
+    if np is not None and not has_lone_sign(data):
+        try:
+            a = np.fromstring(data, dtype=np.int64, sep=" ")
+        except ValueError:  # a token that isn't a whole number
+            a = None
+        # Numbers too big for 64 bits come back clamped, not as an error.
+        if a is not None and not (len(a) and (a.min() == INT64_MIN or a.max() == INT64_MAX)):
+            return a, 0
+
+    tokens = data.split()
+    try:
+        return list(map(int, tokens)), 0
+    except ValueError:
+        good = []
+        for token in tokens:
+            try:
+                good.append(int(token))
+            except ValueError:
+                pass
+        return good, len(tokens) - len(good)
+
+
+def read_numbers(stream, chunk_bytes=CHUNK_BYTES):
+    """
+    Yield chunks of integers read from a binary stream (see parse_numbers).
+
+    Numbers may be separated by any whitespace. A number cut in half at the
+    end of a chunk is carried over to the next one. Tokens that aren't
+    whole numbers are skipped; the count of them is the generator's return
+    value.
+    """
+    tail = b""
+    bad = 0
+    while True:
+        block = stream.read(chunk_bytes)
+        if not block:
+            break
+        data = tail + block
+        tail = b""
+        if not block[-1:].isspace():
+            parts = data.rsplit(None, 1)
+            data, tail = (b"", parts[0]) if len(parts) == 1 else parts
+        values, skipped = parse_numbers(data)
+        bad += skipped
+        yield values
+    if tail:
+        values, skipped = parse_numbers(tail)
+        bad += skipped
+        if len(values):
+            yield values
+    return bad
+
+
+def as_int64(values):
+    """values as an int64 array, or None without NumPy or if one doesn't fit."""
+    if np is None:
+        return None
+    if isinstance(values, np.ndarray):
+        return values
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        return None
+
+
+def classify(values):
+    """
+    Classify a chunk of integers.
+
+    Returns (numbers, kinds, squares) as lists: kinds are 3 * odd + a sign
+    code (0 zero, 1 positive, 2 negative), an index into ROW_MIDDLES.
+    Chunks that fit in 64 bits go through NumPy; anything bigger, or any
+    chunk without NumPy, is done with plain Python ints.
+    """
+    a = as_int64(values)
+    if a is not None:
+        kinds = 3 * (a & 1) + (a > 0) + 2 * (a < 0)
+        numbers = a.tolist()
+        # Both ends: -INT64_MIN doesn't fit in 64 bits, so abs() can't be trusted.
+        if len(a) and a.min() >= -SQUARE_SAFE and a.max() <= SQUARE_SAFE:
+            squares = (a * a).tolist()
+        else:
+            squares = [v * v for v in numbers]
+        return numbers, kinds.tolist(), squares
+
+    numbers = list(values)
+    kinds = [3 * (v & 1) + (v > 0) + 2 * (v < 0) for v in numbers]
+    return numbers, kinds, [v * v for v in numbers]
+
+
+def count_chunk(values):
+    """(odd, positive, negative, zero) counts for a chunk of integers."""
+    a = as_int64(values)
+    if a is not None:
+        positive = int(np.count_nonzero(a > 0))
+        negative = int(np.count_nonzero(a < 0))
+        return int(np.count_nonzero(a & 1)), positive, negative, len(a) - positive - negative
+
+    odd = sum(v & 1 for v in values)
+    positive = sum(v > 0 for v in values)
+    negative = sum(v < 0 for v in values)
+    return odd, positive, negative, len(values) - positive - negative
+
+
+def write_table(values, out):
+    """Write one tab-separated row per number: number, parity, sign, square."""
+    numbers, kinds, squares = classify(values)
+    # One map over whole columns; the parity and sign columns are picked
+    # from ROW_MIDDLES rather than formatted per row.
+    out.write("".join(map("{}{}{}\n".format, numbers, map(ROW_MIDDLES.__getitem__, kinds), squares)))
+
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(description="Classify many whole numbers at once.")
+    parser.add_argument("input", nargs="?", default="-", help="file of numbers (default: stdin)")
+    parser.add_argument("--output", help="file to write the table to (default: stdout)")
+    parser.add_argument("--summary", action="store_true", help="only print totals, no table")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    out = open(args.output, "w") if args.output else sys.stdout
+    totals = [0, 0, 0, 0]
+    count = 0
+    start = time.perf_counter()
+    try:
+        if not args.summary:
+            out.write("number\tparity\tsign\tsquare\n")
+        numbers = read_numbers(source)
+        while True:
+            try:
+                values = next(numbers)
+            except StopIteration as done:
+                bad = done.value
+                break
+            count += len(values)
+            if args.summary:
+                totals = [t + c for t, c in zip(totals, count_chunk(values))]
+            else:
+                write_table(values, out)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    if args.summary:
+        odd, positive, negative, zero = totals
+        print(f"numbers: {count}\neven: {count - odd}\nodd: {odd}\n"
+              f"positive: {positive}\nnegative: {negative}\nzero: {zero}")
+    if bad:
+        print(f"skipped {bad} invalid token(s)", file=sys.stderr)
+    rate = count / elapsed if elapsed else 0.0
+    print(f"{count:,} numbers in {elapsed:.2f}s ({rate:,.0f}/sec)", file=sys.stderr)
+
+
+def main():
+    print('WELCOME TO THE NUMBER FACTS PROGRAM.')
+
+    while True:
+        num = int(input('Enter a whole number: '))
+
+        for line in describe(num):
+            print(line)
+
+        try_again = input('Do you want to try again? (yes/no): ').lower()
+
+        if try_again == 'no':
+            print('Goodbye!')
+            break
+        elif try_again != 'yes':
+            print("Invalid input. Exiting program.")
+            break
+
+
+if __name__ == "__main__":
+    # No arguments: interactive. With arguments, e.g.
+    #   python num_facts.py numbers.txt --output facts.tsv
+    #   seq -5 5 | python num_facts.py - --summary
+    if len(sys.argv) > 1:
+        batch_main(sys.argv[1:])
+    else:
+        main()
@@ -1,11 +1,208 @@
+import math
+import re
+import time
 import tkinter as tk
 from tkinter import ttk
 
+from background import BackgroundWorker
+from number_facts import describe, is_square, prime_flags
+
+# How often the window checks for results (~60 fps).
+POLL_MS = 16
+
+# Wait this long after the last keystroke before analyzing what was typed.
+TYPING_DELAY_MS = 300
+
+
+# Numbers per message in range analysis, and bars in its histogram.
+RANGE_CHUNK = 1 << 18
+HISTOGRAM_BARS = 20
+
+# "1-100", "1..100" or "1 to 100" (either end may be negative)
+RANGE_PATTERN = re.compile(r"^(-?\d+)\s*(?:-|\.\.|to)\s*(-?\d+)$")
+
+
+def count_squares(lo, hi):
+    """How many perfect squares are in lo..hi."""
+    lo = max(lo, 0)
+    if hi < lo:
+        return 0
+    return math.isqrt(hi) - (math.isqrt(lo - 1) if lo > 0 else -1)
+
+
+# Runs in the worker process
+def analyze_job(num):
+    yield "result", describe(num)
+
+
+# Runs in the worker process: counts for lo..hi, one chunk per message
+def range_job(lo, hi):
+    width = -(-(hi - lo + 1) // HISTOGRAM_BARS)  # numbers per bar
+    for start in range(lo, hi + 1, RANGE_CHUNK):
+        end = min(start + RANGE_CHUNK - 1, hi)
+        flags = prime_flags(start, end)
+
+        # primes per histogram bar for the bars this chunk touches
+        bars = []
+        bar = (start - lo) // width
+        while lo + bar * width <= end:
+            first = max(start, lo + bar * width)
+            last = min(end, lo + (bar + 1) * width - 1)
+            bars.append((bar, flags.count(1, first - start, last - start + 1)))
+            bar += 1
+
+        evens = end // 2 - (start - 1) // 2
+        yield "chunk", (end - start + 1, evens, flags.count(1), count_squares(start, end), bars)
+
+
+class VirtualList(tk.Frame):
+    """
+    A scrolling list of `count` rows that only builds the rows on screen.
+
+    Args:
+        get_rows: get_rows(start, stop) returns the text of rows start..stop-1.
+    """
+
+    def __init__(self, parent, count, get_rows, height=12, **text_options):
+        super().__init__(parent, bg=text_options.get("bg"))
+        self.count = count
+        self.get_rows = get_rows
+        self.height = height
+        self.top = 0
+
+        self.text = tk.Text(self, height=height, wrap="none", bd=0, **text_options)
+        self.scrollbar = tk.Scrollbar(self, command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.text.pack(side="left", fill="both", expand=True)
+        self.text.bind("<MouseWheel>", lambda e: self.scroll_to(self.top - e.delta // 40) or "break")
+        self.text.bind("<Button-4>", lambda e: self.scroll_to(self.top - 3) or "break")
+        self.text.bind("<Button-5>", lambda e: self.scroll_to(self.top + 3) or "break")
+        self.render()
+
+    # Scrollbar callback: ("moveto", fraction) or ("scroll", n, "units"/"pages")
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * self.count))
+        elif args[0] == "scroll":
+            step = self.height if args[2] == "pages" else 1
+            self.scroll_to(self.top + int(args[1]) * step)
+
+    def scroll_to(self, top):
+        top = max(0, min(top, self.count - self.height))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def render(self):
+        stop = min(self.top + self.height, self.count)
+        self.text.configure(state="normal")
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, "\n".join(self.get_rows(self.top, stop)))
+        self.text.configure(state="disabled")
+        if self.count:
+            self.scrollbar.set(self.top / self.count, stop / self.count)
+
+
+class RangeView(tk.Toplevel):
+    """Totals, a histogram of primes and every number of lo..hi, streamed in."""
+
+    def __init__(self, parent, lo, hi, theme):
+        super().__init__(parent, bg=theme["bg"])
+        self.title(f"Number Facts: {lo:,} to {hi:,}")
+        self.geometry("440x520")
+        self.lo, self.hi = lo, hi
+        self.total = hi - lo + 1
+        self.done = self.evens = self.primes = self.squares = 0
+        self.bars = [0] * HISTOGRAM_BARS
+        self.started = time.perf_counter()
+
+        self.summary_label = tk.Label(
+            self, text="", font=("Segoe UI", 10), justify="left",
+            bg=theme["bg"], fg=theme["text"]
+        )
+        self.summary_label.pack(pady=(10, 5), padx=10, anchor="w")
+
+        self.histogram = tk.Canvas(self, width=420, height=120, bg=theme["frame"], highlightthickness=0)
+        self.histogram.pack(padx=10)
+
+        self.rows = VirtualList(
+            self, self.total, self.format_rows, height=14,
+            font=("Consolas", 10), bg=theme["frame"], fg=theme["text"]
+        )
+        self.rows.pack(pady=10, padx=10, fill="both", expand=True)
+
+        self.worker = BackgroundWorker()
+        self.worker.submit(range_job, lo, hi)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.show_totals()
+        self.after(POLL_MS, self.poll_worker)
+
+    def format_rows(self, start, stop):
+        first = self.lo + start
+        flags = prime_flags(first, self.lo + stop - 1)
+        return [
+            f"{n:>16,}  {'even' if n % 2 == 0 else 'odd ':4}  {'prime' if flags[i] else '     '}"
+            f"  {'square' if is_square(n) else ''}"
+            for i, n in enumerate(range(first, self.lo + stop))
+        ]
+
+    def poll_worker(self):
+        changed = False
+        for kind, payload in self.worker.poll():
+            if kind == "chunk":
+                count, evens, primes, squares, bars = payload
+                self.done += count
+                self.evens += evens
+                self.primes += primes
+                self.squares += squares
+                for bar, n in bars:
+                    self.bars[bar] += n
+                changed = True
+            elif kind == "error":
+                self.summary_label.configure(text=f"Analysis failed: {payload}")
+                return
+        if changed:
+            self.show_totals()
+            self.draw_histogram()
+        if self.worker.busy:
+            self.after(POLL_MS, self.poll_worker)
+
+    def show_totals(self):
+        elapsed = time.perf_counter() - self.started
+        state = "Done" if self.done == self.total else "Working..."
+        self.summary_label.configure(text=(
+            f"{state} {self.done:,} of {self.total:,} numbers ({self.done / self.total:.0%}) in {elapsed:.1f}s\n"
+            f"Even: {self.evens:,}   Odd: {self.done - self.evens:,}\n"
+            f"Primes: {self.primes:,}   Perfect squares: {self.squares:,}"
+        ))
+
+    def draw_histogram(self):
+        canvas = self.histogram
+        canvas.delete("all")
+        width, height = int(canvas["width"]), int(canvas["height"])
+        tallest = max(self.bars) or 1
+        bar_width = width / HISTOGRAM_BARS
+        for i, n in enumerate(self.bars):
+            top = height - 15 - (height - 25) * n / tallest
+            canvas.create_rectangle(i * bar_width + 2, top, (i + 1) * bar_width - 2, height - 15,
+                                    fill="#0969DA", width=0)
+        canvas.create_text(4, 2, anchor="nw", text=f"primes per {self.total // HISTOGRAM_BARS or 1:,} numbers",
+                           font=("Segoe UI", 8), fill=self.summary_label["fg"])
+        canvas.create_text(2, height - 2, anchor="sw", text=f"{self.lo:,}", font=("Segoe UI", 8),
+                           fill=self.summary_label["fg"])
+        canvas.create_text(width - 2, height - 2, anchor="se", text=f"{self.hi:,}", font=("Segoe UI", 8),
+                           fill=self.summary_label["fg"])
+
+    def close(self):
+        self.worker.close()
+        self.destroy()
+
+
 class NumberFactsApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Number Facts Program")
-        self.root.geometry("400x420")
+        self.root.geometry("400x570")
         self.root.resizable(False, False)
 
 
@@ -46,7 +243,7 @@ class NumberFactsApp:
 
         # Input Label
         self.input_label = tk.Label(
-            self.frame, text="Enter a whole number:",
+            self.frame, text="Enter a whole number or a range (1-1000):",
             font=("Segoe UI", 11),
             bg=self.theme["frame"], fg=self.theme["text"]
         )
@@ -59,6 +256,8 @@ class NumberFactsApp:
             justify="center"
         )
         self.num_entry.pack(ipady=4)
+        self.num_entry.bind("<KeyRelease>", self.on_edit)
+        self.num_entry.bind("<Return>", lambda event: self.analyze_number())
 
         # Analyze Button
         self.analyze_btn = tk.Button(
@@ -67,11 +266,20 @@ class NumberFactsApp:
             bg=self.theme["button_bg"], fg=self.theme["button_fg"],
             command=self.analyze_number
         )
-        self.analyze_btn.pack(pady=15, ipadx=10, ipady=4)
+        self.analyze_btn.pack(pady=(15, 5), ipadx=10, ipady=4)
+
+        # Progress (the work happens in a background process)
+        self.progress = ttk.Progressbar(self.frame, mode="indeterminate", length=200)
+        self.progress.pack(pady=(5, 0))
+        self.status_label = tk.Label(
+            self.frame, text="", font=("Segoe UI", 9),
+            bg=self.theme["frame"], fg=self.theme["text"]
+        )
+        self.status_label.pack()
 
         # Result Box
         self.result_box = tk.Text(
-            self.frame, height=8, width=36,
+            self.frame, height=13, width=36,
             font=("Segoe UI", 11),
             bg=self.theme["frame"], fg=self.theme["text"],
             bd=0
@@ -87,6 +295,13 @@ class NumberFactsApp:
         )
         self.theme_btn.pack(pady=10)
 
+        self.worker = BackgroundWorker()
+        self.last_text = ""
+        self.typing_timer = None
+        self.started = 0.0
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.root.after(POLL_MS, self.poll_worker)
+
     
     # Apply Theme
     def apply_theme(self):
@@ -109,11 +324,12 @@ class NumberFactsApp:
             (self.num_entry, "bg", "fg"),
             (self.analyze_btn, "bg", "fg"),
             (self.result_box, "bg", "fg"),
+            (self.status_label, "bg", "fg"),
             (self.theme_btn, "bg", "fg")
         ]
 
         for w, bg, fg in widgets:
-            if bg: w.configure(bg=self.theme["frame"] if w in [self.frame, self.result_box] else self.theme["bg"])
+            if bg: w.configure(bg=self.theme["frame"] if w in [self.frame, self.result_box, self.status_label] else self.theme["bg"])
             if fg: w.configure(fg=self.theme["text"])
 
         self.num_entry.configure(bg=self.theme["entry_bg"], fg=self.theme["text"])
@@ -122,31 +338,74 @@ class NumberFactsApp:
 
     
     # Analyze Number Logic
-    def analyze_number(self):
+    def analyze_number(self, typed=False):
+        if self.typing_timer:
+            self.root.after_cancel(self.typing_timer)
+            self.typing_timer = None
+        self.last_text = self.num_entry.get().strip()
+
+        # A range opens its own window, but only when asked for
+        match = RANGE_PATTERN.match(self.last_text)
+        if match:
+            lo, hi = sorted(map(int, match.groups()))
+            if typed:
+                self.status_label.configure(text="Press Enter to analyze the range")
+            else:
+                RangeView(self.root, lo, hi, self.theme)
+            return
+
         self.result_box.delete("1.0", tk.END)
         try:
-            num = int(self.num_entry.get())
-        except:
+            num = int(self.last_text)
+        except ValueError:
+            self.stop_job("")
             self.result_box.insert(tk.END, "Please enter a valid whole number.")
             return
 
-        # Conditions
-        if num % 2 == 0:
-            self.result_box.insert(tk.END, f"{num} is even.\n")
-        else:
-            self.result_box.insert(tk.END, f"{num} is odd.\n")
+        self.worker.submit(analyze_job, num)
+        self.started = time.perf_counter()
+        self.status_label.configure(text="Analyzing...")
+        self.progress.start(15)
+
+    # A new number makes the running analysis stale
+    def on_edit(self, event):
+        text = self.num_entry.get().strip()
+        if text == self.last_text:
+            return
+        self.last_text = text
+        self.stop_job("")
+        if self.typing_timer:
+            self.root.after_cancel(self.typing_timer)
+        self.typing_timer = self.root.after(TYPING_DELAY_MS, self.analyze_number, True) if text else None
+
+    def stop_job(self, status):
+        self.worker.cancel()
+        self.progress.stop()
+        self.status_label.configure(text=status)
+
+    # Pick up results from the worker without blocking
+    def poll_worker(self):
+        for kind, payload in self.worker.poll():
+            if kind == "result":
+                self.result_box.delete("1.0", tk.END)
+                self.result_box.insert(tk.END, "\n".join(payload))
+            elif kind == "error":
+                self.result_box.insert(tk.END, f"Analysis failed: {payload}")
+            elif kind == "done":
+                self.progress.stop()
+                self.status_label.configure(text=f"Done in {time.perf_counter() - self.started:.2f}s")
 
-        if num > 0:
-            self.result_box.insert(tk.END, f"{num} is positive.\n")
-        elif num < 0:
-            self.result_box.insert(tk.END, f"{num} is negative.\n")
-        else:
-            self.result_box.insert(tk.END, "The number is zero.\n")
+        if self.worker.busy:
+            self.status_label.configure(text=f"Analyzing... {time.perf_counter() - self.started:.1f}s")
+        self.root.after(POLL_MS, self.poll_worker)
 
-        self.result_box.insert(tk.END, f"The square of {num} is {num*num}\n")
+    def close(self):
+        self.worker.close()
+        self.root.destroy()
 
 
 # Run The App
-root = tk.Tk()
-app = NumberFactsApp(root)
-root.mainloop()
+if __name__ == "__main__":
+    root = tk.Tk()
+    app = NumberFactsApp(root)
+    root.mainloop()
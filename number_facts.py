@@ -0,0 +1,310 @@
+"""
+Number facts shared by num_facts.py and numb_fact_gui.py.
+
+facts(n) returns a NumberFacts with parity, sign, square, primality, prime
+factorization, divisor count, perfect square/cube, Fibonacci membership
+and digit sum; describe(n) turns that into the sentences the programs
+print.
+
+How it stays fast:
+    Primes come from a sieve that grows on demand, one segment at a time,
+    up to SIEVE_LIMIT; numbers below that are looked up, not tested.
+    Bigger numbers use Miller-Rabin (deterministic below 3.3e24) and are
+    factored by trial division with the sieved primes and then Pollard's
+    rho. Factorizations are memoized, so asking again is a dict lookup.
+"""
+
+import math
+import random
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# The sieve never grows past this; larger numbers use Miller-Rabin.
+SIEVE_LIMIT = 20_000_000
+
+# Smallest amount the sieve grows by.
+SEGMENT_SIZE = 1 << 16
+
+# prime_flags() tests ranges shorter than this one number at a time rather
+# than growing the sieve to sqrt(hi) for them.
+FEW_NUMBERS = 1000
+
+# Trial division with sieved primes up to this before Pollard's rho.
+TRIAL_LIMIT = 10_000
+
+# Miller-Rabin with these bases is exact for n < 3.3e24.
+MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+class _Sieve:
+    """Prime flags for 0..limit, extended a segment at a time."""
+
+    def __init__(self) -> None:
+        # Plain sieve for the first segment. It holds every prime up to
+        # sqrt(SIEVE_LIMIT), which is all any later segment needs.
+        flags = bytearray(b"\x01") * (SEGMENT_SIZE + 1)
+        flags[0] = flags[1] = 0
+        for p in range(2, math.isqrt(SEGMENT_SIZE) + 1):
+            if flags[p]:
+                flags[p * p::p] = bytes(len(range(p * p, SEGMENT_SIZE + 1, p)))
+        self.flags = flags
+        self.primes: List[int] = [i for i, f in enumerate(flags) if f]
+
+    @property
+    def limit(self) -> int:
+        return len(self.flags) - 1
+
+    def extend(self, n: int) -> None:
+        """Make sure flags cover 0..n (at least doubling, to amortize)."""
+        if n <= self.limit:
+            return
+        new_limit = min(max(n, 2 * self.limit, self.limit + SEGMENT_SIZE), SIEVE_LIMIT)
+        low = self.limit + 1
+        segment = _sieve_segment(low, new_limit, self.primes)
+        self.flags += segment
+        self.primes.extend(i for i in range(low, new_limit + 1) if segment[i - low])
+
+    def primes_up_to(self, n: int) -> List[int]:
+        self.extend(n)
+        return self.primes[:bisect_right(self.primes, n)]
+
+
+def _sieve_segment(low: int, high: int, primes: List[int]) -> bytearray:
+    """Prime flags for low..high (low > 1), given every prime up to sqrt(high)."""
+    root = math.isqrt(high)
+    segment = bytearray(b"\x01") * (high - low + 1)
+    for p in primes:
+        if p > root:
+            break
+        start = max(p * p, (low + p - 1) // p * p)
+        segment[start - low::p] = bytes(len(range(start - low, len(segment), p)))
+    return segment
+
+
+_sieve = _Sieve()
+
+
+def _miller_rabin(n: int) -> bool:
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    for a in MR_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    if n <= SIEVE_LIMIT:
+        _sieve.extend(n)
+        return bool(_sieve.flags[n])
+    return _is_probable_prime(n)
+
+
+def _is_probable_prime(n: int) -> bool:
+    """Primality of n > 41 without touching the sieve."""
+    for p in MR_BASES:
+        if n % p == 0:
+            return False
+    return _miller_rabin(n)
+
+
+def prime_flags(lo: int, hi: int) -> bytearray:
+    """
+    flags[i] is 1 if lo + i is prime, for lo..hi.
+
+    Long ranges are sieved one segment at a time with primes up to
+    sqrt(hi), so the cached sieve only grows to sqrt(hi), not to hi.
+    """
+    if hi < lo:
+        return bytearray()
+    if hi < 0:
+        return bytearray(hi - lo + 1)  # no negative number is prime
+    head = bytearray(max(0, min(hi + 1, 0) - lo))  # negative numbers
+    lo = max(lo, 0)
+    if hi <= _sieve.limit:
+        return head + _sieve.flags[lo:hi + 1]
+    if lo <= _sieve.limit:
+        head += _sieve.flags[lo:]
+        lo = _sieve.limit + 1
+
+    root = math.isqrt(hi)
+    if root > SIEVE_LIMIT or (root > _sieve.limit and hi - lo < FEW_NUMBERS):
+        # Only a few numbers, or too big to sieve: test them one by one.
+        return head + bytearray(_is_probable_prime(n) for n in range(lo, hi + 1))
+    return head + _sieve_segment(lo, hi, _sieve.primes_up_to(root))
+
+
+def _pollard_rho(n: int) -> int:
+    """A non-trivial factor of composite n (Brent's variant)."""
+    if n % 2 == 0:
+        return 2
+    while True:
+        c = random.randrange(1, n)
+        y, m, g, r, q = random.randrange(n), 128, 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def _split(n: int, found: dict) -> None:
+    if n == 1:
+        return
+    if is_prime(n):
+        found[n] = found.get(n, 0) + 1
+        return
+    d = _pollard_rho(n)
+    _split(d, found)
+    _split(n // d, found)
+
+
+@lru_cache(maxsize=4096)
+def factorize(n: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    Prime factorization of |n| as ((prime, exponent), ...), smallest first.
+
+    Empty for 0, 1 and -1.
+    """
+    n = abs(n)
+    found = {}
+    if n < 2:
+        return ()
+    for p in _sieve.primes_up_to(min(TRIAL_LIMIT, math.isqrt(n))):
+        if p * p > n:
+            break
+        while n % p == 0:
+            found[p] = found.get(p, 0) + 1
+            n //= p
+    _split(n, found)
+    return tuple(sorted(found.items()))
+
+
+def divisor_count(n: int) -> Optional[int]:
+    """Number of positive divisors of |n| (None for 0, which has infinitely many)."""
+    if n == 0:
+        return None
+    return math.prod(e + 1 for _, e in factorize(n))
+
+
+def integer_root(n: int, k: int) -> int:
+    """floor(n ** (1/k)) for n >= 0, exact for any size of int."""
+    if n < 2:
+        return n
+    x = 1 << ((n.bit_length() + k - 1) // k)  # >= the root
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def is_square(n: int) -> bool:
+    return n >= 0 and math.isqrt(n) ** 2 == n
+
+
+def is_cube(n: int) -> bool:
+    return integer_root(abs(n), 3) ** 3 == abs(n)
+
+
+def is_fibonacci(n: int) -> bool:
+    """n is a Fibonacci number iff 5n^2 + 4 or 5n^2 - 4 is a perfect square."""
+    return n >= 0 and (is_square(5 * n * n + 4) or is_square(5 * n * n - 4))
+
+
+def digit_sum(n: int) -> int:
+    return sum(map(int, str(abs(n))))
+
+
+@dataclass(frozen=True)
+class NumberFacts:
+    """Everything the programs report about one number."""
+
+    number: int
+    even: bool
+    sign: int                      # -1, 0 or 1
+    square: int
+    prime: bool
+    factors: Tuple[Tuple[int, int], ...]
+    divisors: Optional[int]
+    perfect_square: bool
+    perfect_cube: bool
+    fibonacci: bool
+    digit_sum: int
+
+
+def facts(n: int) -> NumberFacts:
+    return NumberFacts(
+        number=n,
+        even=n % 2 == 0,
+        sign=(n > 0) - (n < 0),
+        square=n * n,
+        prime=is_prime(n),
+        factors=factorize(n),
+        divisors=divisor_count(n),
+        perfect_square=is_square(n),
+        perfect_cube=is_cube(n),
+        fibonacci=is_fibonacci(n),
+        digit_sum=digit_sum(n),
+    )
+
+
+def format_factors(factors: Tuple[Tuple[int, int], ...]) -> str:
+    return " x ".join(f"{p}^{e}" if e > 1 else str(p) for p, e in factors)
+
+
+def describe(n: int) -> List[str]:
+    """The facts about n as sentences, one per line."""
+    f = facts(n)
+    lines = [f"{n} is {'even' if f.even else 'odd'}."]
+    if f.sign > 0:
+        lines.append(f"{n} is positive.")
+    elif f.sign < 0:
+        lines.append(f"{n} is negative.")
+    else:
+        lines.append("The number is zero.")
+    lines.append(f"The square of {n} is {f.square}")
+
+    if f.prime:
+        lines.append(f"{n} is prime.")
+    elif abs(n) > 1:
+        lines.append(f"{n} = {'-' if n < 0 else ''}{format_factors(f.factors)}")
+    if f.divisors is not None:
+        lines.append(f"It has {f.divisors} divisor(s).")
+    if f.perfect_square:
+        lines.append(f"{n} is a perfect square ({math.isqrt(n)}^2).")
+    if f.perfect_cube:
+        root = integer_root(abs(n), 3)
+        lines.append(f"{n} is a perfect cube ({f'(-{root})' if n < 0 else root}^3).")
+    if f.fibonacci:
+        lines.append(f"{n} is a Fibonacci number.")
+    lines.append(f"Its digits add up to {f.digit_sum}.")
+    return lines
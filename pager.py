@@ -0,0 +1,154 @@
+"""
+Shared pager for the console apps.
+
+Long listings (expenses, tasks) are rendered one page at a time instead of
+one print() per row. Rows are pulled lazily from the source, so jumping to
+page N or filtering never builds a copy of the whole list, and each page is
+written to the terminal in a single write() call.
+
+Rows are always numbered by their position in the underlying list (1-based),
+even when a filter hides some of them. That way "delete number 7" still
+points at the right row no matter which page or filter was on screen.
+"""
+
+import sys
+from collections.abc import Sequence
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+DEFAULT_PAGE_SIZE = 20
+
+
+class Pager:
+    """
+    Renders a source of rows page by page.
+
+    Args:
+        source: The rows to show. Lists are indexed directly; any other
+                iterable is consumed lazily (and re-iterated per page).
+        format_row: Turns (number, row) into one line of text, without "\\n".
+        page_size: Rows per page.
+        match: Optional (row, text) -> bool used by the "f" filter command.
+        out: Stream to write pages to (defaults to sys.stdout).
+    """
+
+    def __init__(
+        self,
+        source: Iterable,
+        format_row: Callable[[int, object], str],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        match: Optional[Callable[[object, str], bool]] = None,
+        out: Optional[TextIO] = None,
+    ) -> None:
+        self.source = source
+        self.format_row = format_row
+        self.page_size = max(1, page_size)
+        self.match = match
+        self.out = out
+        self.predicate: Optional[Callable[[object], bool]] = None
+
+    def set_filter(self, text: str) -> None:
+        """Show only rows matching text (empty text clears the filter)."""
+        text = text.strip()
+        if not text or self.match is None:
+            self.predicate = None
+            return
+        self.predicate = lambda row: self.match(row, text)
+
+    def _rows(self) -> Iterator[Tuple[int, object]]:
+        """Yield (index, row) pairs, applying the current filter lazily."""
+        rows = enumerate(self.source)
+        if self.predicate is None:
+            return rows
+        predicate = self.predicate
+        return ((i, row) for i, row in rows if predicate(row))
+
+    def page(self, number: int) -> Tuple[List[Tuple[int, object]], bool]:
+        """
+        Fetch one page of rows.
+
+        Args:
+            number: 1-based page number.
+
+        Returns:
+            (rows, has_more) where rows holds (index, row) pairs for the page
+            and has_more tells whether a later page exists.
+        """
+        start = (max(1, number) - 1) * self.page_size
+        stop = start + self.page_size
+
+        if self.predicate is None and isinstance(self.source, Sequence):
+            end = min(stop, len(self.source))
+            rows = [(i, self.source[i]) for i in range(start, end)]
+            return rows, stop < len(self.source)
+
+        # Pull one extra row to learn whether there is a next page.
+        rows = list(islice(self._rows(), start, stop + 1))
+        return rows[:self.page_size], len(rows) > self.page_size
+
+    def page_count(self) -> Optional[int]:
+        """Number of pages, or None if it can't be known without a full scan."""
+        if self.predicate is None and isinstance(self.source, Sequence):
+            return max(1, -(-len(self.source) // self.page_size))
+        return None
+
+    def render(self, number: int) -> bool:
+        """
+        Write one page in a single write() call.
+
+        Returns:
+            True if there is a page after this one.
+        """
+        rows, has_more = self.page(number)
+        total = self.page_count()
+        header = f"Page {number}" + (f"/{total}" if total else "")
+        if self.predicate is not None:
+            header += " (filtered)"
+
+        lines = [f"--- {header} ---"]
+        if rows:
+            lines.extend(self.format_row(i + 1, row) for i, row in rows)
+        else:
+            lines.append("(nothing to show)")
+
+        out = self.out or sys.stdout
+        out.write("\n".join(lines) + "\n")
+        out.flush()
+        return has_more
+
+    def browse(self) -> None:
+        """Interactive loop: next/previous page, go to page N, filter, quit."""
+        number = 1
+        while True:
+            has_more = self.render(number)
+            if number == 1 and not has_more and self.predicate is None:
+                return  # everything fit on one page, nothing to navigate
+            prompt = "[n]ext, [p]rev, [g N] go to page"
+            if self.match is not None:
+                prompt += ", [f TEXT] filter"
+            command = input(prompt + ", [q]uit: ").strip()
+            action, _, arg = command.partition(" ")
+            action = action.lower()
+
+            if action in ("", "q"):
+                return
+            elif action == "n":
+                if has_more:
+                    number += 1
+                else:
+                    print("Already on the last page.")
+            elif action == "p":
+                number = max(1, number - 1)
+            elif action == "g":
+                try:
+                    number = max(1, int(arg))
+                    total = self.page_count()
+                    if total is not None:
+                        number = min(number, total)
+                except ValueError:
+                    print("Enter a page number, e.g. g 3")
+            elif action == "f" and self.match is not None:
+                self.set_filter(arg)
+                number = 1
+            else:
+                print("Invalid command.")
@@ -0,0 +1,216 @@
+"""
+Offline password cracker for password_guessing.py - a CPU benchmark and a
+demonstration of how strong the generated passwords are.
+
+The game's generator is treated as an offline target: we only get the
+SHA-256 hash of a password (or the plain text with --hash plain) and try
+candidates until one matches.
+
+Modes:
+    brute   Try every combination for the unknown positions. The target is
+            a fresh password from the game's policy; use a short --length
+            and/or reveal some characters (--unknown N keeps only N random
+            positions hidden) to keep the keyspace searchable.
+    dict    Try every word of a wordlist, plus simple variations
+            (Capitalized, UPPER, trailing 0-99, leetspeak).
+
+Work is split into jobs (one per first unknown character for brute force,
+one per block of words for dictionary mode) and spread over a process
+pool. Every job reports how many guesses it made and how long it took, so
+the summary shows guesses/sec overall and per worker process. Once any
+job finds the password, the others stop.
+
+Examples:
+    python password_cracker.py brute --length 4 --workers 4
+    python password_cracker.py brute --length 8 --unknown 4
+    python password_cracker.py dict words.txt --target Sunshine42
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+from itertools import product
+from multiprocessing import Event, Pool
+from typing import Iterable, List, Optional, Tuple
+
+from password_guessing import GUESSING_POLICY, generate_password
+
+# How often (in guesses) a job checks whether another job already won.
+CHECK_EVERY = 1 << 16
+WORDS_PER_JOB = 2000
+LEET = str.maketrans("aeiost", "431057")
+
+_found = None  # multiprocessing.Event shared with the workers
+
+
+def _init_worker(found) -> None:
+    global _found
+    _found = found
+
+
+def _digest(text: str, algorithm: str) -> bytes:
+    if algorithm == "plain":
+        return text.encode()
+    return hashlib.new(algorithm, text.encode()).digest()
+
+
+# ------------------ JOBS (run in worker processes) ------------------
+
+def _brute_job(args) -> Tuple[int, int, float, Optional[str]]:
+    """Try every candidate whose first unknown character is `first`."""
+    template, first, alphabet, unknown, target, algorithm = args
+    start = time.perf_counter()
+    new = hashlib.new if algorithm != "plain" else None
+    guesses = 0
+    result = None
+    for tail in product(alphabet, repeat=unknown - 1):
+        candidate = template.format(first, *tail)
+        data = candidate.encode()
+        if (new(algorithm, data).digest() if new else data) == target:
+            result = candidate
+            guesses += 1
+            _found.set()
+            break
+        guesses += 1
+        if not guesses % CHECK_EVERY and _found.is_set():
+            break
+    return os.getpid(), guesses, time.perf_counter() - start, result
+
+
+def _variants(word: str) -> Iterable[str]:
+    yield word
+    yield word.capitalize()
+    yield word.upper()
+    yield word.translate(LEET)
+    for n in range(100):
+        yield f"{word}{n}"
+        yield f"{word.capitalize()}{n}"
+
+
+def _dict_job(args) -> Tuple[int, int, float, Optional[str]]:
+    """Try the variants of a block of words."""
+    words, target, algorithm = args
+    start = time.perf_counter()
+    guesses = 0
+    result = None
+    for word in words:
+        if _found.is_set():
+            break
+        for candidate in _variants(word):
+            guesses += 1
+            if _digest(candidate, algorithm) == target:
+                result = candidate
+                _found.set()
+                break
+        if result:
+            break
+    return os.getpid(), guesses, time.perf_counter() - start, result
+
+
+# ------------------ RUNNING ------------------
+
+def _run(jobs: List[tuple], job_fn, workers: int) -> Tuple[Optional[str], int, float, dict]:
+    """Run jobs on a pool; return (password, guesses, seconds, per-process stats)."""
+    found = Event()
+    per_worker = {}
+    total = 0
+    password = None
+    start = time.perf_counter()
+    with Pool(workers, initializer=_init_worker, initargs=(found,)) as pool:
+        for pid, guesses, seconds, result in pool.imap_unordered(job_fn, jobs):
+            count, busy = per_worker.get(pid, (0, 0.0))
+            per_worker[pid] = (count + guesses, busy + seconds)
+            total += guesses
+            if result:
+                password = result
+                pool.terminate()
+                break
+    return password, total, time.perf_counter() - start, per_worker
+
+
+def _report(password: Optional[str], total: int, elapsed: float, per_worker: dict, keyspace: Optional[int]) -> None:
+    rate = total / elapsed if elapsed else 0.0
+    print(f"\nResult: {'found ' + repr(password) if password else 'not found'}")
+    print(f"Guesses: {total:,} in {elapsed:.2f}s = {rate:,.0f} guesses/sec")
+    if keyspace:
+        print(f"Keyspace: {keyspace:,} ({total / keyspace:.1%} searched)")
+    print("Per worker:")
+    for pid, (count, busy) in sorted(per_worker.items()):
+        print(f"  pid {pid}: {count:,} guesses, {count / busy if busy else 0:,.0f} guesses/sec")
+
+    # What this speed means for the game's full-strength passwords.
+    if rate:
+        bits = GUESSING_POLICY.entropy()
+        years = 2 ** bits / 2 / rate / (365 * 24 * 3600)
+        print(f"At this rate a full {GUESSING_POLICY.max_length}-character game password "
+              f"({bits:.1f} bits) takes ~{years:,.0f} years on average.")
+
+
+def brute(length: int, unknown: Optional[int], workers: int, algorithm: str, target_text: Optional[str]) -> None:
+    alphabet = GUESSING_POLICY.sampler().alphabet
+    password = target_text or generate_password(length)
+    unknown = len(password) if unknown is None else max(1, min(unknown, len(password)))
+
+    hidden = sorted(random.sample(range(len(password)), unknown))
+    template = "".join("{}" if i in hidden else c.replace("{", "{{").replace("}", "}}")
+                       for i, c in enumerate(password))
+    shown = "".join("?" if i in hidden else c for i, c in enumerate(password))
+    target = _digest(password, algorithm)
+
+    print(f"Target: {shown} ({algorithm}), alphabet of {len(alphabet)}, {workers} worker(s)")
+    jobs = [(template, first, alphabet, unknown, target, algorithm) for first in alphabet]
+    _report(*_run(jobs, _brute_job, workers), len(alphabet) ** unknown)
+
+
+def dictionary(wordlist: str, workers: int, algorithm: str, target_text: Optional[str]) -> None:
+    with open(wordlist, "r", encoding="utf-8", errors="ignore") as f:
+        words = [line.strip() for line in f if line.strip()]
+    if not words:
+        sys.exit(f"{wordlist} has no words in it")
+    password = target_text or random.choice(words).capitalize() + str(random.randrange(100))
+    target = _digest(password, algorithm)
+
+    print(f"Target hash ({algorithm}) from a {len(words):,}-word list, {workers} worker(s)")
+    jobs = [(words[i:i + WORDS_PER_JOB], target, algorithm) for i in range(0, len(words), WORDS_PER_JOB)]
+    _report(*_run(jobs, _dict_job, workers), None)
+
+
+def main(argv=None) -> None:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    common.add_argument("--hash", default="sha256", help="hash used for the target, or 'plain'")
+    common.add_argument("--target", help="crack this password instead of a random one")
+
+    parser = argparse.ArgumentParser(description="Crack password_guessing.py passwords offline.")
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    brute_parser = modes.add_parser("brute", parents=[common], help="try every combination")
+    brute_parser.add_argument("--length", type=int, default=4, help="password length")
+    brute_parser.add_argument("--unknown", type=int, help="how many positions are hidden (default: all)")
+
+    dict_parser = modes.add_parser("dict", parents=[common], help="try words from a wordlist")
+    dict_parser.add_argument("wordlist")
+
+    args = parser.parse_args(argv)
+    if args.hash != "plain" and args.hash not in hashlib.algorithms_available:
+        parser.error(f"unknown hash {args.hash!r}")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.mode == "brute" and args.target:
+        outside = sorted(set(args.target) - set(GUESSING_POLICY.sampler().alphabet))
+        if outside:
+            # A hidden position holding one of these could never be found.
+            parser.error(f"--target uses characters brute force doesn't try: {''.join(outside)!r}")
+
+    if args.mode == "brute":
+        brute(args.length, args.unknown, args.workers, args.hash, args.target)
+    else:
+        dictionary(args.wordlist, args.workers, args.hash, args.target)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,36 +1,119 @@
-import random
-import string
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from password_policy import DEFAULT_POLICY, PasswordPolicy
+
+# Passwords per job in --workers mode.
+CHUNK_SIZE = 50_000
+
+# Shortest password with room for the default rules: a letter, a digit and a symbol.
+MIN_LENGTH = 3
+
+
+def make_policy(length=12, **rules):
+    """The default policy (letters, digits, symbols; one of each) at a fixed length."""
+    return PasswordPolicy(min_length=length, max_length=length, **rules)
+
+
+def generate_passwords(count, length=12, policy=None):
+    """
+    Yield `count` passwords of `length` characters.
+
+    Uses the OS's secure random source. By default every password has at
+    least one letter, one digit and one symbol; pass a PasswordPolicy to
+    change the rules (it then decides the length too).
+    """
+    if length < MIN_LENGTH and policy is None:
+        raise ValueError(f"length must be at least {MIN_LENGTH} (one letter, digit and symbol)")
+    return (policy or make_policy(length)).generate(count)
+
 
 def generate_password(length=12):
-    # Characters to choose from
-    letters = string.ascii_letters      # a-z + A-Z
-    digits = string.digits              # 0-9
-    symbols = string.punctuation        # ! @ # $ % & *
+    return next(generate_passwords(1, length))
+
 
-    # Combine all characters
-    all_chars = letters + digits + symbols
+def _make_chunk(args):
+    count, policy = args
+    return "\n".join(policy.generate(count)) + "\n"
 
-    # Ensure at least one of each (optional but good practice)
-    password = [
-        random.choice(letters),
-        random.choice(digits),
-        random.choice(symbols),
-    ]
 
-    # Fill the remaining characters randomly
-    for _ in range(length - 3):
-        password.append(random.choice(all_chars))
+def write_passwords(count, policy=DEFAULT_POLICY, out=None, workers=1):
+    """
+    Stream `count` passwords to `out` (default stdout), one per line.
 
-    # Shuffle so the password isn’t predictable
-    random.shuffle(password)
+    Output is written in large chunks rather than line by line. With
+    workers > 1 the chunks are generated in separate processes.
+    """
+    out = out or sys.stdout
+    jobs = []
+    left = count
+    while left > 0:
+        jobs.append((min(CHUNK_SIZE, left), policy))
+        left -= CHUNK_SIZE
+
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            for chunk in pool.map(_make_chunk, jobs):
+                out.write(chunk)
+    else:
+        for job in jobs:
+            out.write(_make_chunk(job))
+    out.flush()
 
-    return "".join(password)
 
 def main():
     print("=== Random Password Generator ===")
-    length = int(input("Enter password length: "))
-    result = generate_password(length)
+    while True:
+        try:
+            length = int(input("Enter password length: "))
+            result = generate_password(length)
+            break
+        except ValueError:
+            print(f"Please enter a whole number, at least {MIN_LENGTH}.")
     print(f"\nYour generated password is:\n{result}")
+    print(f"Strength: {make_policy(length).entropy():.1f} bits of entropy")
+
+
+def bulk_main(argv):
+    parser = argparse.ArgumentParser(description="Generate many secure passwords at once.")
+    parser.add_argument("--count", type=int, required=True, help="number of passwords")
+    parser.add_argument("--length", type=int, default=12, help="characters per password")
+    parser.add_argument("--max-length", type=int, help="pick lengths between --length and this")
+    parser.add_argument("--no-symbols", action="store_true", help="letters and digits only")
+    parser.add_argument("--min-digits", type=int, default=1, help="digits each password needs")
+    parser.add_argument("--min-symbols", type=int, default=1, help="symbols each password needs")
+    parser.add_argument("--exclude", default="", help="characters never to use")
+    parser.add_argument("--exclude-ambiguous", action="store_true", help="leave out l/1/I, O/0 and similar")
+    parser.add_argument("--output", help="file to write to (default: stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="processes to use")
+    args = parser.parse_args(argv)
+
+    policy = PasswordPolicy(
+        min_length=args.length,
+        max_length=args.max_length or args.length,
+        symbols=not args.no_symbols,
+        min_digits=args.min_digits,
+        min_symbols=0 if args.no_symbols else args.min_symbols,
+        exclude=args.exclude,
+        exclude_ambiguous=args.exclude_ambiguous,
+    )
+    try:
+        print(f"Policy entropy: {policy.entropy():.1f} bits per password", file=sys.stderr)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            write_passwords(args.count, policy, f, args.workers)
+    else:
+        write_passwords(args.count, policy, sys.stdout, args.workers)
+
 
 if __name__ == "__main__":
-    main()
+    # No arguments: interactive. With arguments, e.g.
+    #   python password_generator.py --count 1000000 --length 16 --output pw.txt
+    if len(sys.argv) > 1:
+        bulk_main(sys.argv[1:])
+    else:
+        main()
@@ -1,23 +1,45 @@
-import random
-print("Welcome to the password guessing game!")
+import sys
+from dataclasses import replace
+
+from password_policy import PasswordPolicy
+
+# 8 characters from letters, digits and !@#$%^&*() with no "one of each" rule
+GUESSING_POLICY = PasswordPolicy(
+    min_length=8, max_length=8,
+    symbol_chars="!@#$%^&*()",
+    min_letters=0, min_digits=0, min_symbols=0,
+)
+
 # Generate a random password
 def generate_password(length=8):
-    characters = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!@#$%^&*()"
-    password = ''.join(random.choice(characters) for _ in range(length))
-    return password
-password = generate_password()
-max_attempts = 5
-attempts = 0
-print("A random password has been generated. Try to guess it!")
-while attempts < max_attempts:
-    guess = input(f"Attempt {attempts + 1}/{max_attempts}: Enter your guess: ")
-    attempts += 1
-    if guess == password:
-        print(f"Congratulations! You've guessed the password '{password}' correctly in {attempts} attempts.")
-        break
+    policy = GUESSING_POLICY
+    if length != policy.max_length:
+        policy = replace(policy, min_length=length, max_length=length)
+    return next(policy.generate(1))
+
+def main():
+    print("Welcome to the password guessing game!")
+    password = generate_password()
+    max_attempts = 5
+    attempts = 0
+    print("A random password has been generated. Try to guess it!")
+    print(f"(It has {GUESSING_POLICY.entropy():.0f} bits of entropy, so good luck...)")
+    while attempts < max_attempts:
+        guess = input(f"Attempt {attempts + 1}/{max_attempts}: Enter your guess: ")
+        attempts += 1
+        if guess == password:
+            print(f"Congratulations! You've guessed the password '{password}' correctly in {attempts} attempts.")
+            break
+        else:
+            print("Incorrect guess. Try again.")
     else:
-        print("Incorrect guess. Try again.")
-else:
-    print(f"Sorry, you've used all your attempts. The correct password was '{password}'.")
+        print(f"Sorry, you've used all your attempts. The correct password was '{password}'.")
 
-    
\ No newline at end of file
+if __name__ == "__main__":
+    # python password_guessing.py --solve brute --length 4
+    # lets the computer crack it instead (see password_cracker.py).
+    if sys.argv[1:2] == ["--solve"]:
+        import password_cracker
+        password_cracker.main(sys.argv[2:])
+    else:
+        main()
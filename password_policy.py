@@ -0,0 +1,216 @@
+"""
+Password policies shared by password_generator.py and password_guessing.py.
+
+A PasswordPolicy says which kinds of characters may be used, how many of
+each a password needs at least, which characters to leave out and how long
+passwords may be. policy.sampler() turns it into a Sampler that generates
+passwords; samplers are cached per policy, so asking again for the same
+policy doesn't rebuild its alphabet and lookup tables.
+
+How passwords are drawn:
+    Random bytes come from os.urandom (the same source as `secrets`) in
+    large blocks and are mapped to the alphabet with bytes.translate.
+    Byte values above the largest multiple of the alphabet size are
+    dropped, so there is no modulo bias. Candidates that don't meet the
+    minimum counts are thrown away and redrawn, which keeps every valid
+    password equally likely.
+
+Entropy:
+    policy.entropy() is the exact number of bits of randomness in one
+    generated password: log2 of how many valid passwords there are (for
+    each allowed length), counted with the minimum-count rules applied.
+"""
+
+import math
+import os
+import secrets
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator, List, Tuple
+
+AMBIGUOUS = "Il1|O0o`'\""
+
+# Random bytes are read from the OS in blocks this big.
+BLOCK_SIZE = 64 * 1024
+
+# Refuse policies where fewer than this fraction of random candidates pass
+# the minimum counts (rejection sampling would crawl).
+MIN_ACCEPTANCE = 1e-3
+
+
+@dataclass(frozen=True)
+class PasswordPolicy:
+    """
+    Rules for generated passwords.
+
+    Attributes:
+        min_length / max_length: Length range (each length equally likely).
+        lower, upper, digits, symbols: Which character classes are allowed.
+        min_lower, min_upper, min_letters, min_digits, min_symbols:
+            Minimum characters of each class (letters = lower + upper).
+        symbol_chars: Characters counted as symbols.
+        exclude: Characters never to use.
+        exclude_ambiguous: Also leave out look-alikes such as l/1/I and O/0.
+    """
+
+    min_length: int = 12
+    max_length: int = 12
+    lower: bool = True
+    upper: bool = True
+    digits: bool = True
+    symbols: bool = True
+    min_lower: int = 0
+    min_upper: int = 0
+    min_letters: int = 1
+    min_digits: int = 1
+    min_symbols: int = 1
+    symbol_chars: str = string.punctuation
+    exclude: str = ""
+    exclude_ambiguous: bool = False
+
+    def sampler(self) -> "Sampler":
+        """The (cached) compiled sampler for this policy."""
+        return _compile(self)
+
+    def entropy(self) -> float:
+        """Bits of randomness in one password generated under this policy."""
+        return self.sampler().entropy
+
+    def generate(self, count: int = 1) -> Iterator[str]:
+        """Yield `count` passwords that follow this policy."""
+        return self.sampler().generate(count)
+
+
+DEFAULT_POLICY = PasswordPolicy()
+
+
+class Sampler:
+    """Precomputed alphabet, byte lookup table and checks for one policy."""
+
+    def __init__(self, policy: PasswordPolicy) -> None:
+        if not 1 <= policy.min_length <= policy.max_length:
+            raise ValueError("need 1 <= min_length <= max_length")
+
+        removed = set(policy.exclude) | (set(AMBIGUOUS) if policy.exclude_ambiguous else set())
+
+        def keep(chars: str, allowed: bool) -> str:
+            return "".join(c for c in dict.fromkeys(chars) if c not in removed) if allowed else ""
+
+        lower = keep(string.ascii_lowercase, policy.lower)
+        upper = keep(string.ascii_uppercase, policy.upper)
+        digits = keep(string.digits, policy.digits)
+        symbols = keep("".join(c for c in policy.symbol_chars if not c.isalnum()), policy.symbols)
+
+        self.policy = policy
+        self.alphabet = lower + upper + digits + symbols
+        if not self.alphabet:
+            raise ValueError("policy allows no characters")
+        if max(map(ord, self.alphabet)) > 255:
+            raise ValueError("only characters up to U+00FF are supported")
+
+        rules = [
+            (lower, policy.min_lower, "lowercase letters"),
+            (upper, policy.min_upper, "uppercase letters"),
+            (lower + upper, policy.min_letters, "letters"),
+            (digits, policy.min_digits, "digits"),
+            (symbols, policy.min_symbols, "symbols"),
+        ]
+        for chars, minimum, name in rules:
+            if minimum > 0 and not chars:
+                raise ValueError(f"policy requires {name} but allows none")
+        required = max(policy.min_lower + policy.min_upper, policy.min_letters) + policy.min_digits + policy.min_symbols
+        if required > policy.max_length:
+            raise ValueError("minimum counts don't fit in max_length")
+
+        # (characters as bytes, minimum) for every rule that actually applies.
+        self._checks: List[Tuple[bytes, int]] = [
+            (chars.encode("latin-1"), minimum) for chars, minimum, _ in rules if minimum > 0
+        ]
+        self._table, self._rejected = _byte_table(self.alphabet)
+
+        sizes = (len(lower), len(upper), len(digits), len(symbols))
+        lengths = range(max(policy.min_length, required), policy.max_length + 1)
+        if not lengths:
+            raise ValueError("minimum counts don't fit in max_length")
+        self._lengths = lengths
+        counts = [_count_valid(policy, sizes, n) for n in lengths]
+        self.entropy = math.log2(len(lengths)) + sum(math.log2(c) for c in counts) / len(lengths)
+        acceptance = min(c / len(self.alphabet) ** n for c, n in zip(counts, lengths))
+        if acceptance < MIN_ACCEPTANCE:
+            raise ValueError("minimum counts are too strict for this length; allow longer passwords")
+
+    def _valid(self, candidate: bytes) -> bool:
+        # translate(None, chars) deletes chars, so the length drop is the count.
+        size = len(candidate)
+        for chars, minimum in self._checks:
+            if size - len(candidate.translate(None, chars)) < minimum:
+                return False
+        return True
+
+    def generate(self, count: int) -> Iterator[str]:
+        """Yield `count` passwords."""
+        lengths = self._lengths
+        fixed = lengths[0] if len(lengths) == 1 else None
+        made = 0
+        buffer = b""
+        pos = 0
+        while made < count:
+            length = fixed or lengths[secrets.randbelow(len(lengths))]
+            while len(buffer) - pos < length:
+                buffer = buffer[pos:] + os.urandom(BLOCK_SIZE).translate(self._table, self._rejected)
+                pos = 0
+            candidate = buffer[pos:pos + length]
+            pos += length
+            if self._valid(candidate):
+                yield candidate.decode("latin-1")
+                made += 1
+
+
+@lru_cache(maxsize=64)
+def _compile(policy: PasswordPolicy) -> Sampler:
+    return Sampler(policy)
+
+
+def _byte_table(alphabet: str) -> Tuple[bytes, bytes]:
+    """
+    Build a bytes.translate() table that turns a random byte into a character.
+
+    Only the first 256 - (256 % len(alphabet)) byte values are used (the rest
+    are deleted), so every character is exactly equally likely - a plain
+    `byte % len(alphabet)` would favour the first few characters.
+    """
+    size = len(alphabet)
+    usable = 256 - 256 % size
+    table = bytes(ord(alphabet[b % size]) for b in range(usable)) + bytes(256 - usable)
+    return table, bytes(range(usable, 256))
+
+
+def _count_valid(policy: PasswordPolicy, sizes: Tuple[int, int, int, int], length: int) -> int:
+    """
+    Number of distinct passwords of `length` that meet the minimum counts.
+
+    Positions are split between letters, digits and symbols; for each split,
+    multiply the ways to choose the positions by the ways to fill them.
+    """
+    n_lower, n_upper, n_digits, n_symbols = sizes
+
+    # letters[k] = ways to fill k letter positions meeting the letter minimums
+    letters = []
+    for k in range(length + 1):
+        if k < policy.min_letters:
+            letters.append(0)
+            continue
+        letters.append(sum(
+            math.comb(k, a) * n_lower ** a * n_upper ** (k - a)
+            for a in range(policy.min_lower, k - policy.min_upper + 1)
+        ))
+
+    total = 0
+    for d in range(policy.min_digits, length + 1):
+        for s in range(policy.min_symbols, length - d + 1):
+            k = length - d - s
+            if letters[k]:
+                total += (math.comb(length, d) * math.comb(length - d, s)
+                          * n_digits ** d * n_symbols ** s * letters[k])
+    return total
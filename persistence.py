@@ -0,0 +1,217 @@
+"""
+Write-behind persistence for the console apps.
+
+Instead of saving on every add/remove, an app marks its data dirty and
+carries on. A background thread waits for the debounce window to pass (so
+a burst of edits becomes one write) and then calls the app's save
+function. On exit - normal return, Ctrl+C or SIGTERM - any pending change
+is flushed before the process goes away.
+
+Usage:
+    writer = WriteBehind(store.flush)
+    store.add(task)
+    writer.mark_dirty()
+    ...
+    writer.close()  # flushes whatever is still pending
+
+atomic_write() is the helper for savers that rewrite a whole file.
+"""
+
+import atexit
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from typing import Callable, Optional
+
+DEFAULT_DELAY = 0.5  # seconds to coalesce edits before writing
+
+
+def atomic_write(path: str, text: str) -> None:
+    """
+    Replace path with text so readers never see a half-written file.
+
+    The data goes to a temp file in the same directory, is fsync'd, and is
+    then renamed over the original (rename is atomic on the same disk).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class WriteBehind:
+    """
+    Debounced background saver.
+
+    Args:
+        save: Writes the current data to disk. Called on the background
+              thread (or on the caller's thread from flush()/close()).
+        delay: Debounce window in seconds. The first change starts the
+               window; every change made before it closes is written in
+               the same save.
+        name: Shown in error messages.
+    """
+
+    def __init__(self, save: Callable[[], None], delay: float = DEFAULT_DELAY, name: str = "data") -> None:
+        self.save = save
+        self.delay = delay
+        self.name = name
+
+        self._cond = threading.Condition()
+        self._version = 0          # bumped on every mark_dirty()
+        self._saved_version = 0    # last version that reached the disk
+        self._deadline: Optional[float] = None
+        self._closed = False
+        self._write_lock = threading.Lock()  # one save at a time
+
+        self._thread = threading.Thread(target=self._run, name=f"write-behind:{name}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        _install_signal_handlers()
+        _WRITERS.append(self)
+
+    @property
+    def dirty(self) -> bool:
+        """True while there are changes that haven't been written yet."""
+        with self._cond:
+            return self._version != self._saved_version
+
+    def mark_dirty(self) -> None:
+        """Record that the data changed. Never touches the disk."""
+        with self._cond:
+            self._version += 1
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.delay
+                self._cond.notify()
+
+    def flush(self) -> None:
+        """Write pending changes now, on the calling thread."""
+        with self._write_lock:
+            with self._cond:
+                version = self._version
+                if version == self._saved_version:
+                    return
+                self._deadline = None
+            self.save()
+            with self._cond:
+                self._saved_version = max(self._saved_version, version)
+                if self._version != self._saved_version and self._deadline is None:
+                    # More edits arrived while we were writing.
+                    self._deadline = time.monotonic() + self.delay
+                    self._cond.notify()
+
+    def close(self) -> None:
+        """Flush anything pending and stop the background thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+        if self in _WRITERS:
+            _WRITERS.remove(self)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._deadline is None:
+                        self._cond.wait()
+                        continue
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                # Keep the thread alive whatever went wrong, or nothing
+                # would ever be saved again.
+                if isinstance(e, OSError):
+                    print(f"\n Could not save {self.name}: {e}", file=sys.stderr)
+                else:
+                    print(f"\n Could not save {self.name}:", file=sys.stderr)
+                    traceback.print_exc()
+                with self._cond:
+                    # Try again after another window rather than spinning.
+                    self._deadline = time.monotonic() + self.delay
+
+
+# --------------------------
+# SHUTDOWN HANDLING
+# --------------------------
+
+_WRITERS = []
+_handlers_installed = False
+
+# A signal handler runs on the main thread in between whatever it was
+# doing, which may be holding the very locks a save needs (or be halfway
+# through changing the data). So the handler only writes the signal number
+# to a pipe; a separate thread reads it, saves everything once the main
+# thread has let go of those locks, and then re-sends the signal to the
+# main thread, whose handler now exits the way the default one would.
+_wakeup_write = -1
+_exiting = False
+
+
+def _flush_all() -> None:
+    for writer in list(_WRITERS):
+        writer.close()
+
+
+def _on_signal(signum, frame) -> None:
+    if _exiting:
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+        return
+    try:
+        os.write(_wakeup_write, bytes([signum]))
+    except OSError:
+        pass  # pipe full: a save on shutdown is already on its way
+
+
+def _shutdown_thread(wakeup_read: int) -> None:
+    global _exiting
+    signum = os.read(wakeup_read, 1)[0]
+    try:
+        _flush_all()
+    except Exception:
+        traceback.print_exc()
+    _exiting = True
+    if hasattr(signal, "pthread_kill"):
+        signal.pthread_kill(threading.main_thread().ident, signum)
+    else:
+        os._exit(128 + signum)
+
+
+def _install_signal_handlers() -> None:
+    """Flush pending writes on SIGTERM/SIGHUP (Ctrl+C already runs atexit)."""
+    global _handlers_installed, _wakeup_write
+    if _handlers_installed or threading.current_thread() is not threading.main_thread():
+        return
+    _handlers_installed = True
+    wakeup_read, _wakeup_write = os.pipe()
+    os.set_blocking(_wakeup_write, False)  # the handler must never block
+    threading.Thread(target=_shutdown_thread, args=(wakeup_read,), name="write-behind:shutdown",
+                     daemon=True).start()
+    for name in ("SIGTERM", "SIGHUP"):
+        signum = getattr(signal, name, None)
+        if signum is not None and signal.getsignal(signum) in (signal.SIG_DFL, None):
+            signal.signal(signum, _on_signal)
@@ -0,0 +1,243 @@
+"""
+Question bank for tkinker_quiz.py, stored as JSON lines.
+
+Each line of the bank is one question:
+    {"id": 7, "topic": "biology", "difficulty": "easy",
+     "question": "...", "options": ["...", "...", "...", "..."], "answer": 0}
+`answer` is the index of the correct option.
+
+Next to the bank sits an index (bank + ".idx"): one JSON header line
+listing every (topic, difficulty) group, then the byte offset of every
+question as a packed 8-byte integer, grouped so each group is one
+contiguous run. Opening a bank reads only the header; sampling a quiz
+picks random positions, reads their offsets from the memory-mapped index
+and seeks straight to those lines. So opening the bank and drawing a quiz
+cost the same for 10 questions or 10 million.
+
+The index is rebuilt automatically when the bank's size or modification
+time no longer match the header.
+
+    python question_bank.py generate big_bank.jsonl --count 200000
+    python question_bank.py bench big_bank.jsonl
+"""
+
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+INDEX_VERSION = 1
+OFFSET = struct.Struct("<Q")
+
+
+class Question:
+    """One multiple-choice question; `answer` is the index of the right option."""
+
+    __slots__ = ("id", "topic", "difficulty", "text", "options", "answer")
+
+    def __init__(self, id: int, topic: str, difficulty: str, text: str, options: List[str], answer: int) -> None:
+        self.id = id
+        self.topic = topic
+        self.difficulty = difficulty
+        self.text = text
+        self.options = options
+        self.answer = answer
+
+    @classmethod
+    def from_line(cls, line: bytes) -> "Question":
+        d = json.loads(line)
+        return cls(d["id"], d["topic"], d["difficulty"], d["question"], d["options"], d["answer"])
+
+    def to_line(self) -> str:
+        return json.dumps({
+            "id": self.id, "topic": self.topic, "difficulty": self.difficulty,
+            "question": self.text, "options": self.options, "answer": self.answer,
+        }, ensure_ascii=False) + "\n"
+
+
+def write_bank(path: str, questions: Iterable[Question]) -> None:
+    """Write questions to a new bank file (the index is built on first open)."""
+    with open(path, "w", encoding="utf-8") as f:
+        for q in questions:
+            f.write(q.to_line())
+
+
+def _stamp(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def build_index(path: str) -> None:
+    """Scan the bank once and write its index."""
+    groups: Dict[Tuple[str, str], array] = {}
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                d = json.loads(line)
+                groups.setdefault((d["topic"], d["difficulty"]), array("Q")).append(offset)
+            offset += len(line)
+
+    header = {"version": INDEX_VERSION, "bank": list(_stamp(path)), "groups": []}
+    start = 0
+    for (topic, difficulty), offsets in sorted(groups.items()):
+        header["groups"].append([topic, difficulty, start, len(offsets)])
+        start += len(offsets)
+
+    tmp = path + ".idx.tmp"
+    with open(tmp, "wb") as f:
+        f.write(json.dumps(header).encode() + b"\n")
+        for key in sorted(groups):
+            offsets = groups[key]
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            f.write(offsets.tobytes())
+    os.replace(tmp, path + ".idx")
+
+
+class QuestionBank:
+    """
+    A bank of questions on disk, read lazily.
+
+    Args:
+        path: The .jsonl bank file.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.groups: List[Tuple[str, str, int, int]] = []  # (topic, difficulty, start, count)
+        self.stamp: Tuple[int, int] = (0, 0)
+        self._open_index()
+        self._bank = open(path, "rb")
+
+    def _open_index(self) -> None:
+        index_path = self.path + ".idx"
+        for attempt in range(2):
+            try:
+                f = open(index_path, "rb")
+            except FileNotFoundError:
+                build_index(self.path)
+                continue
+            header = json.loads(f.readline())
+            if header.get("version") == INDEX_VERSION and header["bank"] == list(_stamp(self.path)):
+                self._index_file = f
+                self._data_start = f.tell()
+                self.groups = [tuple(g) for g in header["groups"]]
+                self.stamp = tuple(header["bank"])  # (size, mtime_ns) of the bank when indexed
+                size = os.fstat(f.fileno()).st_size
+                self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+                return
+            f.close()
+            build_index(self.path)  # stale: the bank changed since it was indexed
+        raise RuntimeError(f"could not index {self.path}")
+
+    def close(self) -> None:
+        if isinstance(self._index, mmap.mmap):
+            self._index.close()
+        self._index_file.close()
+        self._bank.close()
+
+    def topics(self) -> List[str]:
+        return sorted({g[0] for g in self.groups})
+
+    def difficulties(self) -> List[str]:
+        return sorted({g[1] for g in self.groups})
+
+    def runs(self, topic: Optional[str] = None, difficulty: Optional[str] = None) -> List[Tuple[int, int]]:
+        """(start, count) runs of index positions holding the matching questions."""
+        return [(start, count) for t, d, start, count in self.groups
+                if (topic is None or t == topic) and (difficulty is None or d == difficulty)]
+
+    def count(self, topic: Optional[str] = None, difficulty: Optional[str] = None) -> int:
+        return sum(count for _, count in self.runs(topic, difficulty))
+
+    def get(self, position: int) -> Question:
+        """The question at an index position (see runs())."""
+        (offset,) = OFFSET.unpack_from(self._index, self._data_start + OFFSET.size * position)
+        self._bank.seek(offset)
+        return Question.from_line(self._bank.readline())
+
+    def sample(self, n: int, topic: Optional[str] = None, difficulty: Optional[str] = None,
+               rng: Optional[random.Random] = None) -> List[Question]:
+        """
+        Up to n different random questions, optionally from one topic and/or
+        difficulty. Only the chosen questions are read from disk.
+        """
+        rng = rng or random
+        runs = self.runs(topic, difficulty)
+        ends = []
+        total = 0
+        for _, count in runs:
+            total += count
+            ends.append(total)
+
+        quiz = []
+        for k in rng.sample(range(total), min(n, total)):
+            run = bisect_right(ends, k)
+            start, count = runs[run]
+            quiz.append(self.get(start + k - (ends[run] - count)))
+        return quiz
+
+
+# ------------------ COMMAND LINE ------------------
+
+def _generate(path: str, count: int) -> None:
+    """A synthetic bank of arithmetic questions, for trying out big banks."""
+    rng = random.Random(1)
+    levels = [("easy", 10), ("medium", 100), ("hard", 1000)]
+    ops = [("addition", "+", lambda a, b: a + b), ("multiplication", "x", lambda a, b: a * b)]
+
+    def questions():
+        for i in range(count):
+            topic, sign, fn = ops[i % len(ops)]
+            difficulty, size = levels[i // len(ops) % len(levels)]
+            a, b = rng.randint(1, size), rng.randint(1, size)
+            right = fn(a, b)
+            options = list({right, right + 1, right - 1, right + 10})
+            rng.shuffle(options)
+            yield Question(i + 1, topic, difficulty, f"What is {a} {sign} {b}?",
+                           [str(o) for o in options], options.index(right))
+
+    write_bank(path, questions())
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Build and test question banks.")
+    modes = parser.add_subparsers(dest="mode", required=True)
+    gen = modes.add_parser("generate", help="write a synthetic bank")
+    gen.add_argument("bank")
+    gen.add_argument("--count", type=int, default=100_000)
+    modes.add_parser("index", help="(re)build a bank's index").add_argument("bank")
+    bench = modes.add_parser("bench", help="time opening a bank and drawing quizzes")
+    bench.add_argument("bank")
+    bench.add_argument("--size", type=int, default=10, help="questions per quiz")
+    args = parser.parse_args(argv)
+
+    if args.mode == "generate":
+        _generate(args.bank, args.count)
+        build_index(args.bank)
+        print(f"Wrote {args.count:,} questions to {args.bank}")
+    elif args.mode == "index":
+        build_index(args.bank)
+    else:
+        start = time.perf_counter()
+        bank = QuestionBank(args.bank)
+        opened = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(100):
+            bank.sample(args.size)
+        per_quiz = (time.perf_counter() - start) / 100
+        print(f"{bank.count():,} questions in {len(bank.groups)} groups")
+        print(f"open: {opened * 1000:.2f} ms, quiz of {args.size}: {per_quiz * 1000:.2f} ms")
+        bank.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,394 @@
+"""
+Quiz logic for tkinker_quiz.py, with no GUI and no globals.
+
+QuizEngine runs one quiz over a QuestionBank: next_question(), answer(),
+score. In adaptive mode it uses QuizStats, a small JSON file of
+per-question results kept across sessions, to decide what to ask:
+
+    Every question sits in a Leitner box. A wrong answer sends it back to
+    box 0; a right answer moves it up one box, unless it took longer
+    than SLOW_MS (then it stays put). Questions are drawn at random with
+    weight BOX_WEIGHTS[box], so missed questions come back often and
+    well-known ones rarely. Questions never seen yet get NEW_WEIGHT.
+
+Only questions that have stats get a slot in a Fenwick tree (binary
+indexed tree) of weights; the rest all weigh NEW_WEIGHT and are drawn
+uniformly without being listed. Starting a quiz costs O(questions with
+stats), not O(bank), and drawing a question and changing one weight are
+both O(log n), even for banks of millions of questions.
+
+Stats are saved in the background a moment after each answer (see
+persistence.WriteBehind), so closing the window mid-quiz keeps them.
+
+Headless use, e.g. from a test or the terminal:
+    python quiz_engine.py science_quiz.jsonl --length 5
+    python quiz_engine.py big_bank.jsonl --simulate 10000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+from persistence import WriteBehind, atomic_write
+from question_bank import Question, QuestionBank
+
+STATS_VERSION = 1
+
+# Draw weight per Leitner box (box 0 = just missed).
+BOX_WEIGHTS = (16, 8, 4, 2, 1)
+NEW_WEIGHT = 8
+
+# A right answer slower than this doesn't move the question up a box.
+SLOW_MS = 10_000
+
+
+class FenwickTree:
+    """Prefix sums over integer weights with O(log n) update and search."""
+
+    def __init__(self, weights: List[int]) -> None:
+        self.size = len(weights)
+        tree = [0] + list(weights)
+        for i in range(1, self.size + 1):  # O(n) build
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def append(self, weight: int) -> None:
+        """Add a new last index with the given weight, in O(log n)."""
+        self.size += 1
+        i = self.size
+        value, j, low = weight, i - 1, i - (i & -i)
+        while j > low:  # node i also covers its children's ranges
+            value += self._tree[j]
+            j -= j & -j
+        self._tree.append(value)
+
+    def add(self, index: int, delta: int) -> None:
+        i = index + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def total(self) -> int:
+        total, i = 0, self.size
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, target: int) -> int:
+        """The index where the running total first exceeds target (0 <= target < total())."""
+        pos = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self._tree[nxt] <= target:
+                pos = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return pos
+
+
+class QuizStats:
+    """
+    Per-question results across sessions, saved as one small JSON file.
+
+    Each question that has been asked has an entry
+    [position, box, attempts, correct, total_ms]; `position` is where the
+    question sits in the bank's index, valid while the bank is unchanged.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.bank_stamp: List[int] = []
+        self.entries: Dict[int, List[int]] = {}
+        self.lock = threading.Lock()  # save() may run on a background thread
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == STATS_VERSION:
+                self.bank_stamp = data["bank"]
+                self.entries = {int(k): v for k, v in data["questions"].items()}
+
+    def save(self) -> None:
+        if self.path:
+            with self.lock:
+                text = json.dumps({
+                    "version": STATS_VERSION,
+                    "bank": self.bank_stamp,
+                    "questions": self.entries,
+                }, separators=(",", ":"))
+            atomic_write(self.path, text)
+
+    def use_bank(self, bank: QuestionBank) -> None:
+        """Forget stored positions if the bank changed since they were saved."""
+        if self.bank_stamp != list(bank.stamp):
+            for entry in self.entries.values():
+                entry[0] = -1
+            self.bank_stamp = list(bank.stamp)
+
+    def record(self, question_id: int, position: int, correct: bool, ms: int) -> None:
+        with self.lock:
+            self._record(question_id, position, correct, ms)
+
+    def _record(self, question_id: int, position: int, correct: bool, ms: int) -> None:
+        entry = self.entries.setdefault(question_id, [position, 1, 0, 0, 0])
+        entry[0] = position
+        entry[2] += 1
+        entry[4] += ms
+        if not correct:
+            entry[1] = 0
+        else:
+            entry[3] += 1
+            if ms <= SLOW_MS:
+                entry[1] = min(entry[1] + 1, len(BOX_WEIGHTS) - 1)
+
+    def weight(self, question_id: int) -> int:
+        entry = self.entries.get(question_id)
+        return BOX_WEIGHTS[entry[1]] if entry else NEW_WEIGHT
+
+    def accuracy(self, question_id: int) -> Optional[float]:
+        entry = self.entries.get(question_id)
+        return entry[3] / entry[2] if entry else None
+
+    def mean_ms(self, question_id: int) -> Optional[float]:
+        entry = self.entries.get(question_id)
+        return entry[4] / entry[2] if entry else None
+
+
+class QuizEngine:
+    """
+    One quiz of `length` questions.
+
+    Args:
+        bank: Where the questions come from.
+        stats: Results so far (a throwaway in-memory QuizStats if not given).
+        length: Questions per quiz.
+        adaptive: Pick questions by their Leitner weights; otherwise a
+            plain random sample.
+        topic, difficulty: Only ask matching questions.
+    """
+
+    def __init__(self, bank: QuestionBank, stats: Optional[QuizStats] = None, length: int = 10,
+                 adaptive: bool = True, topic: Optional[str] = None, difficulty: Optional[str] = None,
+                 rng: Optional[random.Random] = None) -> None:
+        self.bank = bank
+        self.stats = stats or QuizStats()
+        self.stats.use_bank(bank)
+        self.adaptive = adaptive
+        self.rng = rng or random.Random()
+
+        # Positions in the matching runs are numbered 0..size-1 ("local").
+        self._runs = bank.runs(topic, difficulty)
+        self._ends = []
+        size = 0
+        for _, count in self._runs:
+            size += count
+            self._ends.append(size)
+        self.size = size
+        self.length = min(length, size)
+
+        if adaptive:
+            # Tree slots only for questions with stats; see the module docstring.
+            self._slots: Dict[int, int] = {}       # local position -> tree slot
+            self._slot_locals: List[int] = []
+            self._weights: List[int] = []          # per slot
+            for question_id, entry in self.stats.entries.items():
+                local = self._local(entry[0])
+                if local is not None and local not in self._slots:
+                    self._slots[local] = len(self._slot_locals)
+                    self._slot_locals.append(local)
+                    self._weights.append(self.stats.weight(question_id))
+            self._tree = FenwickTree(self._weights)
+            self._taken_new = set()                # slotless questions asked this quiz
+            self._new_weights: Dict[int, int] = {}  # their weights once answered
+            self._new_locals: Optional[List[int]] = None  # built by _draw_new() if needed
+            self._stale = 0                        # of those, how many have slots now
+        self._asked_locals: List[int] = []
+        self._saver = WriteBehind(self.stats.save, name=self.stats.path) if self.stats.path else None
+        self.new_quiz()
+
+    def _local(self, position: int) -> Optional[int]:
+        base = 0
+        for start, count in self._runs:
+            if start <= position < start + count:
+                return base + position - start
+            base += count
+        return None
+
+    def _position(self, local: int) -> int:
+        run = bisect_right(self._ends, local)
+        start, count = self._runs[run]
+        return start + local - (self._ends[run] - count)
+
+    def new_quiz(self) -> None:
+        """Start over with a fresh set of questions."""
+        if self.adaptive:
+            # Questions asked last quiz were taken out of the draw; put them back.
+            for local in self._asked_locals:
+                slot = self._slots.get(local)
+                if slot is not None:
+                    self._tree.add(slot, self._weights[slot])
+                elif local in self._new_weights:
+                    # Answered for the first time: it has stats now.
+                    self._slots[local] = len(self._slot_locals)
+                    self._slot_locals.append(local)
+                    self._weights.append(self._new_weights[local])
+                    self._tree.append(self._new_weights[local])
+                    self._stale += 1
+            self._taken_new.clear()
+            self._new_weights.clear()
+        else:
+            self._order = self.rng.sample(range(self.size), self.length)
+        self._asked_locals = []
+        self.score = 0
+        self.asked = 0
+        self.current: Optional[Question] = None
+        self._current_local = -1
+        self._shown_at = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.asked >= self.length
+
+    def next_question(self) -> Optional[Question]:
+        """The next question, or None when the quiz is over."""
+        if self.finished:
+            self.current = None
+            return None
+        if self.adaptive:
+            local = self._draw()
+            self._asked_locals.append(local)
+        else:
+            local = self._order[self.asked]
+        self._current_local = local
+        self.current = self.bank.get(self._position(local))
+        self._shown_at = time.perf_counter()
+        return self.current
+
+    def _draw(self) -> int:
+        """A weighted random question, taken out of the draw until new_quiz() (no repeats)."""
+        tree_total = self._tree.total()
+        free_new = self.size - len(self._slots) - len(self._taken_new)
+        target = self.rng.randrange(tree_total + NEW_WEIGHT * free_new)
+        if target < tree_total:
+            slot = self._tree.find(target)
+            self._tree.add(slot, -self._weights[slot])
+            return self._slot_locals[slot]
+        local = self._draw_new()
+        self._taken_new.add(local)
+        return local
+
+    def _draw_new(self) -> int:
+        """A uniformly random question with no stats that hasn't been asked this quiz."""
+        for _ in range(32):
+            local = self.rng.randrange(self.size)
+            if local not in self._slots and local not in self._taken_new:
+                return local
+        # Nearly every question has stats: choose from a list of the others,
+        # rebuilt once half of it has been given slots since.
+        if self._new_locals is None or 2 * self._stale > len(self._new_locals):
+            self._new_locals = [i for i in range(self.size) if i not in self._slots]
+            self._stale = 0
+        while True:
+            local = self.rng.choice(self._new_locals)
+            if local not in self._slots and local not in self._taken_new:
+                return local
+
+    def answer(self, choice: int, elapsed_ms: Optional[int] = None) -> bool:
+        """Answer the current question with option `choice`; True if right."""
+        question = self.current
+        if question is None:
+            raise RuntimeError("no question to answer")
+        if elapsed_ms is None:
+            elapsed_ms = int((time.perf_counter() - self._shown_at) * 1000)
+        correct = choice == question.answer
+        self.asked += 1
+        self.score += correct
+        local = self._current_local
+        self.stats.record(question.id, self._position(local), correct, elapsed_ms)
+        if self.adaptive:
+            # Used once the question is back in the draw.
+            slot = self._slots.get(local)
+            if slot is None:
+                self._new_weights[local] = self.stats.weight(question.id)
+            else:
+                self._weights[slot] = self.stats.weight(question.id)
+        if self._saver:
+            self._saver.mark_dirty()
+        return correct
+
+    def finish(self) -> None:
+        """Save the stats now."""
+        if self._saver:
+            self._saver.flush()
+        else:
+            self.stats.save()
+
+
+# ------------------ COMMAND LINE ------------------
+
+def _play(engine: QuizEngine) -> None:
+    while engine.next_question():
+        q = engine.current
+        print(f"\nQ{engine.asked + 1}: {q.text}")
+        for i, option in enumerate(q.options, 1):
+            print(f"  {i}. {option}")
+        try:
+            choice = int(input("Your answer: ")) - 1
+        except ValueError:
+            choice = -1
+        if engine.answer(choice):
+            print("Correct!")
+        else:
+            print(f"Wrong - it was {q.options[q.answer]}.")
+    print(f"\nYour Score: {engine.score}/{engine.asked}")
+
+
+def _simulate(engine: QuizEngine, count: int) -> None:
+    """A pretend student who knows ~70% of the questions, for timing."""
+    known = {}
+    start = time.perf_counter()
+    answered = 0
+    while answered < count:
+        engine.new_quiz()
+        while answered < count and engine.next_question():
+            q = engine.current
+            right = known.setdefault(q.id, engine.rng.random() < 0.7)
+            engine.answer(q.answer if right else -1, elapsed_ms=3000)
+            answered += 1
+    elapsed = time.perf_counter() - start
+    print(f"{answered:,} questions from a bank of {engine.size:,} in {elapsed:.2f}s "
+          f"({answered / elapsed:,.0f}/sec)")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Take a quiz in the terminal.")
+    parser.add_argument("bank", help="question bank (.jsonl)")
+    parser.add_argument("--stats", help="file to keep per-question results in")
+    parser.add_argument("--length", type=int, default=10)
+    parser.add_argument("--topic")
+    parser.add_argument("--difficulty")
+    parser.add_argument("--fixed", action="store_true", help="plain random quiz, not adaptive")
+    parser.add_argument("--simulate", type=int, metavar="N", help="answer N questions automatically")
+    args = parser.parse_args(argv)
+
+    bank = QuestionBank(args.bank)
+    engine = QuizEngine(bank, QuizStats(args.stats), args.length, not args.fixed, args.topic, args.difficulty)
+    if args.simulate:
+        _simulate(engine, args.simulate)
+    else:
+        _play(engine)
+    engine.finish()
+    bank.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
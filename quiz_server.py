@@ -0,0 +1,256 @@
+"""
+Quiz server for a classroom or contest: many players, one question bank.
+
+The whole bank is loaded into memory once and shared by every player;
+each connection is one player session, kept in a small __slots__ object.
+Everything runs in a single asyncio event loop.
+
+Protocol: one command per line, one JSON object per reply line.
+    START [length]   start a new quiz     -> {"length": 10}
+    NEXT             next question        -> {"n": 1, "question": {"id", "text", "options"}}
+                                             or {"done": true, "score": 7, "length": 10}
+    ANSWER i         answer with option i -> {"correct": true, "answer": 2, "score": 1}
+    QUIT             close the session
+Errors come back as {"error": "..."}.
+
+    python quiz_server.py serve science_quiz.jsonl --port 8765
+    python quiz_server.py load --port 8765 --clients 1000 --quizzes 5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from array import array
+from typing import List, Optional
+
+from question_bank import QuestionBank
+
+DEFAULT_PORT = 8765
+DEFAULT_LENGTH = 10
+MAX_LENGTH = 100
+
+# Pending output per connection before we wait for the client to read it.
+HIGH_WATER = 64 * 1024
+
+
+class Session:
+    """One player's quiz."""
+
+    __slots__ = ("order", "pos", "score", "answered")
+
+    def __init__(self) -> None:
+        self.order = array("I")  # bank positions of this quiz's questions
+        self.pos = 0             # questions served so far
+        self.score = 0
+        self.answered = True     # the last served question has been answered
+
+
+def _reply(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+
+async def _skip_line(reader: asyncio.StreamReader) -> None:
+    """Drop input up to and including the next newline (the rest of an overlong line)."""
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)  # all buffered, and no newline among them
+        except asyncio.IncompleteReadError:
+            return  # the connection closed first
+
+
+class QuizServer:
+    """
+    Serves quizzes from one in-memory copy of a question bank.
+
+    Args:
+        bank_path: The .jsonl question bank.
+        default_length: Questions per quiz when START doesn't say.
+    """
+
+    def __init__(self, bank_path: str, default_length: int = DEFAULT_LENGTH) -> None:
+        bank = QuestionBank(bank_path)
+        # Each question is pre-encoded once; serving it is a bytes join.
+        self.payloads: List[bytes] = []
+        self.answers = array("B")
+        for start, count in bank.runs():
+            for position in range(start, start + count):
+                q = bank.get(position)
+                self.payloads.append(json.dumps(
+                    {"id": q.id, "text": q.text, "options": q.options},
+                    ensure_ascii=False, separators=(",", ":")).encode())
+                self.answers.append(q.answer)
+        bank.close()
+        self.default_length = default_length
+        self.active = 0
+        self.requests = 0
+
+    def handle_line(self, session: Session, line: str) -> Optional[bytes]:
+        """The reply to one command line (None means close the connection)."""
+        command, _, arg = line.strip().partition(" ")
+        command = command.upper()
+
+        if command == "NEXT":
+            if not session.order:
+                return _reply({"error": "send START first"})
+            if session.pos >= len(session.order):
+                return _reply({"done": True, "score": session.score, "length": len(session.order)})
+            payload = self.payloads[session.order[session.pos]]
+            session.pos += 1
+            session.answered = False
+            return b'{"n":%d,"question":%s}\n' % (session.pos, payload)
+
+        if command == "ANSWER":
+            if session.answered:
+                return _reply({"error": "no question to answer"})
+            try:
+                choice = int(arg)
+            except ValueError:
+                return _reply({"error": "ANSWER needs an option number"})
+            answer = self.answers[session.order[session.pos - 1]]
+            correct = choice == answer
+            session.score += correct
+            session.answered = True
+            return b'{"correct":%s,"answer":%d,"score":%d}\n' % (
+                b"true" if correct else b"false", answer, session.score)
+
+        if command == "START":
+            try:
+                length = int(arg) if arg else self.default_length
+            except ValueError:
+                return _reply({"error": "START takes a number of questions"})
+            if not self.payloads:
+                return _reply({"error": "the question bank is empty"})
+            length = max(1, min(length, MAX_LENGTH, len(self.payloads)))
+            session.order = array("I", random.sample(range(len(self.payloads)), length))
+            session.pos = session.score = 0
+            session.answered = True
+            return _reply({"length": length})
+
+        if command == "QUIT":
+            return None
+        return _reply({"error": f"unknown command {command!r}"})
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session = Session()
+        self.active += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial  # a last line without a newline, or b"" at the end
+                except asyncio.LimitOverrunError:
+                    # Longer than the stream limit. Skip all of it, not just
+                    # what is buffered, or its tail would be read as a command.
+                    await _skip_line(reader)
+                    writer.write(_reply({"error": "line too long"}))
+                    continue
+                if not line:
+                    break
+                self.requests += 1
+                reply = self.handle_line(session, line.decode("utf-8", "replace"))
+                if reply is None:
+                    break
+                writer.write(reply)
+                if writer.transport.get_write_buffer_size() > HIGH_WATER:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.active -= 1
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        print(f"Serving {len(self.payloads):,} questions on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+# ------------------ LOAD GENERATOR ------------------
+
+async def _player(host: str, port: int, quizzes: int, latencies: List[float], rng: random.Random) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def call(command: bytes) -> dict:
+        start = time.perf_counter()
+        writer.write(command)
+        line = await reader.readline()
+        latencies.append(time.perf_counter() - start)
+        return json.loads(line)
+
+    try:
+        for _ in range(quizzes):
+            await call(b"START\n")
+            while True:
+                reply = await call(b"NEXT\n")
+                if "done" in reply:
+                    break
+                choice = rng.randrange(len(reply["question"]["options"]))
+                await call(b"ANSWER %d\n" % choice)
+        writer.write(b"QUIT\n")
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def load_test(host: str, port: int, clients: int, quizzes: int) -> None:
+    latencies: List[float] = []
+    rng = random.Random()
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(_player(host, port, quizzes, latencies, rng) for _ in range(clients)),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+    failed = [r for r in results if isinstance(r, Exception)]
+
+    latencies.sort()
+    print(f"{clients} players x {quizzes} quiz(zes): {len(latencies):,} requests in {elapsed:.2f}s")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} requests/sec")
+    if latencies:
+        print("latency ms: " + "  ".join(
+            f"p{int(p * 100)}={_percentile(latencies, p) * 1000:.2f}" for p in (0.5, 0.9, 0.99)
+        ) + f"  max={latencies[-1] * 1000:.2f}")
+    if failed:
+        print(f"{len(failed)} player(s) failed, e.g. {failed[0]!r}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Serve quizzes to many players, or load-test a server.")
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    serve = modes.add_parser("serve", help="run the server")
+    serve.add_argument("bank", help="question bank (.jsonl)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--length", type=int, default=DEFAULT_LENGTH, help="questions per quiz")
+
+    load = modes.add_parser("load", help="simulate many players")
+    load.add_argument("--host", default="127.0.0.1")
+    load.add_argument("--port", type=int, default=DEFAULT_PORT)
+    load.add_argument("--clients", type=int, default=100, help="concurrent players")
+    load.add_argument("--quizzes", type=int, default=1, help="quizzes per player")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.mode == "serve":
+            asyncio.run(QuizServer(args.bank, args.length).serve(args.host, args.port))
+        else:
+            asyncio.run(load_test(args.host, args.port, args.clients, args.quizzes))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,184 @@
+"""
+Receipts for fruit store orders, as plain text, CSV or JSON lines.
+
+ReceiptWriter renders each priced order (a fruit_catalog.Quote) into an
+in-memory list of strings and writes them out in batches of `batch`
+receipts with one write() call, so a million receipts cost a few
+thousand writes instead of several print() calls per line item. Money
+is integer cents throughout and only turned into "12.34" text at the
+end.
+
+    text   the receipt fruit store.py prints, one block per order
+    csv    order_id,kind,item,qty,unit_price,amount - one row per item,
+           plus "discount" and "total" rows
+    json   one object per line; money in integer cents
+
+    python receipts.py catalog.csv orders.csv --format json --output receipts.jsonl
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Callable, List, TextIO
+
+from fruit_catalog import Catalog, Quote, parse_order
+
+FORMATS = ("text", "csv", "json")
+BATCH_RECEIPTS = 2000
+RULE = "-----------------------------------\n"
+CSV_HEADER = "order_id,kind,item,qty,unit_price,amount\n"
+CACHE_LIMIT = 100_000  # most strings remembered per cache
+
+
+def dollars(cents: int) -> str:
+    """Cents as "1234.56" (no $ or thousands separators)."""
+    if cents < 0:
+        return "-" + dollars(-cents)
+    whole, part = divmod(cents, 100)
+    return f"{whole}.{part:02d}"
+
+
+def csv_field(text: str) -> str:
+    if "," in text or '"' in text or "\n" in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def json_string(text: str) -> str:
+    if text.isascii() and text.isprintable() and '"' not in text and "\\" not in text:
+        return f'"{text}"'  # nothing to escape
+    return json.dumps(text, ensure_ascii=False)
+
+
+class _Cache(dict):
+    """value -> convert(value), computed on first use; `cache[value]` is a plain dict lookup after that."""
+
+    def __init__(self, convert: Callable) -> None:
+        super().__init__()
+        self.convert = convert
+
+    def __missing__(self, value):
+        text = self.convert(value)
+        if len(self) < CACHE_LIMIT:
+            self[value] = text
+        return text
+
+
+class ReceiptWriter:
+    """
+    Buffered receipt output.
+
+    Args:
+        out: Where receipts go (a text file or sys.stdout).
+        fmt: One of FORMATS.
+        batch: Receipts to collect before each write.
+    """
+
+    def __init__(self, out: TextIO, fmt: str = "text", batch: int = BATCH_RECEIPTS) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown receipt format {fmt!r}")
+        self.out = out
+        self.batch = batch
+        self.count = 0
+        self._parts: List[str] = []
+        self._pending = 0
+        self._render = getattr(self, "_" + fmt)
+        # Prices and item names repeat a lot; format each one once.
+        self._money = _Cache(dollars)
+        self._names = _Cache(csv_field if fmt == "csv" else json_string)
+        if fmt == "csv":
+            self._parts.append(CSV_HEADER)
+
+    def __enter__(self) -> "ReceiptWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+    def write(self, quote: Quote, order_id: str = "") -> None:
+        self._render(quote, order_id)
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.batch:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            self.out.write("".join(self._parts))
+            self._parts.clear()
+        self._pending = 0
+        self.out.flush()
+
+    # ------------------ FORMATS ------------------
+
+    def _text(self, quote: Quote, order_id: str) -> None:
+        money = self._money
+        parts = [RULE, f"RECEIPT {order_id}\n" if order_id else "RECEIPT\n", RULE]
+        for name, qty, unit, amount in quote.lines:
+            parts.append(f"{name} x{qty} @ ${money[unit]} = ${money[amount]}\n")
+        parts.append(RULE)
+        if quote.discount:
+            parts.append(f"Subtotal = ${money[quote.subtotal]}\n"
+                         f"Discount {quote.code} = -${money[quote.discount]}\n")
+        parts.append(f"Total = ${money[quote.total]}\n")
+        parts.append(RULE)
+        self._parts.append("".join(parts))
+
+    def _csv(self, quote: Quote, order_id: str) -> None:
+        money = self._money
+        names = self._names
+        order = csv_field(order_id)
+        rows = [f"{order},item,{names[name]},{qty},{money[unit]},{money[amount]}\n"
+                for name, qty, unit, amount in quote.lines]
+        if quote.discount:
+            rows.append(f"{order},discount,{names[quote.code]},,,-{money[quote.discount]}\n")
+        rows.append(f"{order},total,,,,{money[quote.total]}\n")
+        self._parts.append("".join(rows))
+
+    def _json(self, quote: Quote, order_id: str) -> None:
+        # Built by hand: json.dumps() per receipt would dominate the cost.
+        names = self._names
+        lines = ",".join([f"[{names[name]},{qty},{unit},{amount}]" for name, qty, unit, amount in quote.lines])
+        self._parts.append(
+            f'{{"order":{json_string(order_id)},"lines":[{lines}],"subtotal":{quote.subtotal},'
+            f'"code":{names[quote.code]},"discount":{quote.discount},"total":{quote.total}}}\n')
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Place a file of orders and write their receipts.")
+    parser.add_argument("catalog")
+    parser.add_argument("orders")
+    parser.add_argument("--format", choices=FORMATS, default="text")
+    parser.add_argument("--output", default="-", help="receipt file (default: stdout)")
+    parser.add_argument("--batch", type=int, default=BATCH_RECEIPTS, help="receipts per write")
+    args = parser.parse_args(argv)
+
+    catalog = Catalog.load(args.catalog)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    rejected = 0
+    start = time.perf_counter()
+    try:
+        with ReceiptWriter(out, args.format, args.batch) as writer, \
+                open(args.orders, "r", encoding="utf-8") as f:
+            for line in f:
+                order = parse_order(line)
+                if order is None:
+                    rejected += 1
+                    continue
+                order_id, code, items = order
+                quote = catalog.place(items, code)
+                if quote.ok:
+                    writer.write(quote, order_id)
+                else:
+                    rejected += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"{writer.count:,} receipts ({rejected:,} orders rejected) in {elapsed:.2f}s "
+          f"({writer.count / elapsed if elapsed else 0:,.0f} receipts/sec)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
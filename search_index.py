@@ -0,0 +1,260 @@
+"""
+Inverted index for searching tasks, expenses and study items.
+
+Each record the app wants searchable is added under a key (e.g. a task ID)
+with some text (title, subject, name, category...). The text is split into
+lowercase words, and every word maps to the documents that contain it.
+
+Queries:
+    "maths"        documents with a word starting with "maths"
+    "calc hw"      documents matching every term (AND); each term is a prefix
+Results come back most recently added/changed first.
+
+Why it's fast:
+    Document numbers only ever grow, so a newer document always has a
+    bigger number. Each word's posting list is a dict of document numbers
+    in insertion order, which gives O(1) add/remove, O(1) "does this
+    document contain the word" checks, and newest-first iteration with
+    reversed(). A query walks the rarest term's postings from the newest
+    end and checks the other terms by membership, stopping as soon as it
+    has enough results - it never sorts or intersects whole lists.
+
+Persistence:
+    The index is saved as a JSON snapshot plus a small append-only log of
+    changes made since (path and path + ".log"), so starting up loads the
+    postings directly instead of re-reading and re-splitting every record.
+    The app saves a stamp of its data with the index (set_stamp(), e.g.
+    file_stamp() of its data file) and rebuilds when it no longer matches.
+"""
+
+import heapq
+import json
+import os
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from persistence import atomic_write
+
+WORD_RE = re.compile(r"\w+")
+
+# Rewrite the snapshot once the log has this many lines.
+COMPACT_LOG_LINES = 5000
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into unique lowercase words, in order."""
+    return list(dict.fromkeys(WORD_RE.findall(text.lower())))
+
+
+def file_stamp(path: str) -> Optional[list]:
+    """[size, mtime in ns] of path (None if it's missing): changes whenever the file is written."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+class SearchIndex:
+    """
+    Incrementally updated inverted index over (key, text) documents.
+
+    Args:
+        path: Snapshot file to load from and save to, or None for an
+              in-memory index.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._clear()
+        if path:
+            self._load()
+
+    def _clear(self) -> None:
+        self.next_doc = 1
+        self.stamp = None                   # see set_stamp()
+        self._postings: Dict[str, Dict[int, None]] = {}
+        self._terms: List[str] = []         # sorted, for prefix lookups
+        self._doc_key: Dict[int, str] = {}
+        self._doc_terms: Dict[int, List[str]] = {}
+        self._key_doc: Dict[str, int] = {}
+        self._pending: List[list] = []
+        self._log_lines = 0
+
+    def __len__(self) -> int:
+        return len(self._key_doc)
+
+    def __contains__(self, key) -> bool:
+        return str(key) in self._key_doc
+
+    # ------------------ UPDATES ------------------
+
+    def add(self, key, text: str) -> None:
+        """Index text under key, replacing whatever key had before."""
+        key = str(key)
+        self._remove(key)
+        self._add(key, text)
+        self._pending.append(["+", key, text])
+
+    def remove(self, key) -> None:
+        """Drop key from the index (no-op if it isn't there)."""
+        key = str(key)
+        if self._remove(key):
+            self._pending.append(["-", key])
+
+    def set_stamp(self, stamp) -> None:
+        """Record what state of the app's data the index matches (anything JSON can store)."""
+        self.stamp = stamp
+        self._pending.append(["s", stamp])
+
+    def rebuild(self, documents: Iterable, stamp=None) -> None:
+        """Replace the whole index with (key, text) pairs and save a snapshot."""
+        self._clear()
+        for key, text in documents:
+            self._add(str(key), text, sort=False)
+        self._terms = sorted(self._postings)  # once, not one insert per new term
+        self.stamp = stamp
+        self.save()
+
+    def _add(self, key: str, text: str, sort: bool = True) -> None:
+        doc = self.next_doc
+        self.next_doc += 1
+        terms = tokenize(text)
+        self._key_doc[key] = doc
+        self._doc_key[doc] = key
+        self._doc_terms[doc] = terms
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                if sort:
+                    self._terms.insert(bisect_left(self._terms, term), term)
+            posting[doc] = None
+
+    def _remove(self, key: str) -> bool:
+        doc = self._key_doc.pop(key, None)
+        if doc is None:
+            return False
+        del self._doc_key[doc]
+        for term in self._doc_terms.pop(doc):
+            posting = self._postings[term]
+            del posting[doc]
+            if not posting:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+        return True
+
+    # ------------------ QUERIES ------------------
+
+    def _matching_postings(self, prefix: str) -> List[Dict[int, None]]:
+        """Posting lists of every term starting with prefix."""
+        start = bisect_left(self._terms, prefix)
+        result = []
+        for term in self._terms[start:]:
+            if not term.startswith(prefix):
+                break
+            result.append(self._postings[term])
+        return result
+
+    @staticmethod
+    def _newest_first(postings: List[Dict[int, None]]) -> Iterator[int]:
+        """Documents in any of the postings, newest first, without repeats."""
+        if len(postings) == 1:
+            return reversed(postings[0])
+        merged = heapq.merge(*(reversed(p) for p in postings), reverse=True)
+        return _unique(merged)
+
+    def search(self, query: str, limit: int = 20) -> List[str]:
+        """
+        Find keys whose text matches every term of query (each as a prefix).
+
+        Returns:
+            Up to limit keys, most recently indexed first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        groups = [self._matching_postings(term) for term in terms]
+        if not all(groups):
+            return []
+
+        # Drive from the rarest term; check the rest by dict membership.
+        groups.sort(key=lambda g: sum(len(p) for p in g))
+        driver, others = groups[0], groups[1:]
+        results = []
+        for doc in self._newest_first(driver):
+            if all(any(doc in p for p in group) for group in others):
+                results.append(self._doc_key[doc])
+                if len(results) >= limit:
+                    break
+        return results
+
+    # ------------------ SAVING ------------------
+
+    def _log_path(self) -> str:
+        return self.path + ".log"
+
+    def _load(self) -> None:
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.next_doc = data["next_doc"]
+            self.stamp = data.get("stamp")
+            docs, keys, terms = data["docs"], data["keys"], data["terms"]
+            self._doc_key = dict(zip(docs, keys))
+            self._key_doc = dict(zip(keys, docs))
+            self._doc_terms = dict(zip(docs, terms))
+            self._postings = {term: dict.fromkeys(posting) for term, posting in data["postings"].items()}
+            self._terms = sorted(self._postings)
+
+        if os.path.exists(self._log_path()):
+            with open(self._log_path(), "r", encoding="utf-8") as f:
+                for line in f:
+                    row = json.loads(line)
+                    if row[0] == "s":
+                        self.stamp = row[1]
+                    else:
+                        self._remove(row[1])
+                        if row[0] == "+":
+                            self._add(row[1], row[2])
+                    self._log_lines += 1
+
+    def flush(self) -> None:
+        """Append changes since the last flush to the log."""
+        if self.path is None or not self._pending:
+            self._pending.clear()
+            return
+        rows, self._pending = self._pending, []
+        with open(self._log_path(), "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+        self._log_lines += len(rows)
+        if self._log_lines >= COMPACT_LOG_LINES:
+            self.save()
+
+    def save(self) -> None:
+        """Write a full snapshot and clear the log."""
+        self._pending.clear()
+        if self.path is None:
+            return
+        # Parallel lists load much faster than a dict of small objects.
+        data = {
+            "next_doc": self.next_doc,
+            "stamp": self.stamp,
+            "docs": list(self._doc_key),
+            "keys": list(self._doc_key.values()),
+            "terms": list(self._doc_terms.values()),
+            "postings": {term: list(posting) for term, posting in self._postings.items()},
+        }
+        atomic_write(self.path, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+        if os.path.exists(self._log_path()):
+            os.remove(self._log_path())
+        self._log_lines = 0
+
+
+def _unique(docs: Iterator[int]) -> Iterator[int]:
+    last = None
+    for doc in docs:
+        if doc != last:
+            yield doc
+            last = doc
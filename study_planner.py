@@ -1,88 +1,213 @@
-import json
-import os
+import sys
 
-DATA_FILE = "study_data.json"
+from search_index import SearchIndex
+from study_scheduler import StudyScheduler, normalize_priority
+from task_store import Task, TaskStore
+
+DATA_FILE = "study_tasks.jsonl"
+INDEX_FILE = "study_index.json"
 
 # ------------------ DATA HANDLING ------------------
 
 def load_data():
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "r") as f:
-            return json.load(f)
-    return {"tasks": []}
+    # An old study_data.json is converted the first time.
+    tasks = TaskStore.open(DATA_FILE, legacy=["study_data.json"])
+    with tasks.transaction():
+        if tasks.meta.get("stats", {}).get("version") != STATS_VERSION:
+            tasks.set_meta("stats", compute_stats(tasks))
+    return tasks
+
+def save_data(tasks):
+    tasks.flush()
+
+def index_stamp(tasks):
+    # Tasks are only ever added here (never renamed or removed), so the next
+    # ID and the count change whenever the indexed text does.
+    return [tasks.next_id, len(tasks)]
 
-def save_data(data):
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+def load_index(tasks):
+    # Rebuilt only when it has drifted from the task file.
+    index = SearchIndex(INDEX_FILE)
+    if index.stamp != index_stamp(tasks):
+        index.rebuild(((task.id, f"{task.title} {task.subject}") for task in tasks), index_stamp(tasks))
+    return index
 
 # ------------------ TASK FUNCTIONS ------------------
 
-def add_task(data):
+def add_task(tasks):
     print("\n--- ADD NEW TASK ---")
     title = input("Task title: ")
     subject = input("Subject: ")
-    duration = int(input("Estimated duration (minutes): "))
+    try:
+        duration = int(input("Estimated duration (minutes): "))
+    except ValueError:
+        duration = 0
+    if duration <= 0:
+        print("The duration must be a whole number of minutes, more than 0.\n")
+        return None
     priority = input("Priority (Low/Medium/High): ")
+    deadline = input("Deadline (YYYY-MM-DD, leave blank for none): ").strip()
 
-    task = {
-        "title": title,
-        "subject": subject,
-        "duration": duration,
-        "priority": priority,
-        "completed": False
-    }
+    task = Task(title=title, subject=subject, duration=duration, priority=priority, deadline=deadline)
 
-    data["tasks"].append(task)
-    save_data(data)
+    # In one transaction, so the stats this adds to are the latest any
+    # session saved, and no other session's update can land in between.
+    with tasks.transaction():
+        tasks.add(task)
+        stats = tasks.meta["stats"]
+        record_task(stats, task, "pending", 1)
+        tasks.set_meta("stats", stats)
     print("Task added successfully!\n")
+    return task
 
-def view_tasks(data, filter_by=None):
+def view_tasks(tasks, filter_by=None):
     print("\n--- TASK LIST ---")
-    for i, task in enumerate(data["tasks"], start=1):
-        if filter_by == "pending" and task["completed"]:
+    if filter_by and tasks.meta["stats"][filter_by] == 0:
+        print(f"No {filter_by} tasks.\n")  # known from the stats, no scan needed
+        return
+    for task in tasks:
+        if filter_by == "pending" and task.done:
             continue
-        if filter_by == "completed" and not task["completed"]:
+        if filter_by == "completed" and not task.done:
             continue
 
-        status = "✓ Completed" if task["completed"] else "✗ Pending"
-        print(f"{i}. {task['title']} | {task['subject']} | {task['duration']} mins | {task['priority']} | {status}")
+        status = "✓ Completed" if task.done else "✗ Pending"
+        due = f" | due {task.deadline}" if task.deadline else ""
+        print(f"{task.id}. {task.title} | {task.subject} | {task.duration} mins | {task.priority}{due} | {status}")
     print()
 
-def mark_completed(data):
-    view_tasks(data, filter_by="pending")
+def mark_completed(tasks):
+    view_tasks(tasks, filter_by="pending")
     task_num = int(input("Enter task number to mark as completed: "))
-    if 1 <= task_num <= len(data["tasks"]):
-        data["tasks"][task_num - 1]["completed"] = True
-        save_data(data)
-        print("Task marked as completed!\n")
-    else:
-        print("Invalid number.\n")
+    with tasks.transaction():
+        # Checked inside the transaction: another session may have just
+        # completed (and counted) it.
+        task = tasks.get(task_num)
+        if task is None:
+            print("Invalid number.\n")
+            return None
+        if task.done:
+            print("That task is already completed.\n")
+            return None
+        tasks.update(task_num, done=True)
+        stats = tasks.meta["stats"]
+        record_task(stats, task, "pending", -1)
+        record_task(stats, task, "completed", 1)
+        tasks.set_meta("stats", stats)
+    print("Task marked as completed!\n")
+    return task
 
 # ------------------ ANALYTICS ------------------
 
-def show_stats(data):
+# Stats are kept up to date as tasks are added and completed, and saved
+# with the tasks, so viewing them never has to go through every task:
+#   {"version": 2, "completed": n, "pending": n, "completed_minutes": n,
+#    "subjects":   {subject:  {"completed": n, "pending": n, "minutes": n}},
+#    "priorities": {priority: {"completed": n, "pending": n, "minutes": n}}}
+# Priorities are normalized the way the scheduler does it (low/medium/high).
+# Every change is made inside tasks.transaction(), so sessions sharing the
+# file each add to the latest saved stats instead of overwriting them.
+STATS_VERSION = 2
+
+def empty_stats():
+    return {"version": STATS_VERSION, "completed": 0, "pending": 0, "completed_minutes": 0,
+            "subjects": {}, "priorities": {}}
+
+def record_task(stats, task, status, change):
+    """Add change (+1/-1) to the "pending" or "completed" counts for task."""
+    minutes = task.duration * change if status == "completed" else 0
+    stats[status] += change
+    stats["completed_minutes"] += minutes
+
+    priority = normalize_priority(task.priority)
+    for group, key in (("subjects", task.subject), ("priorities", priority)):
+        rollup = stats[group].setdefault(key, {"completed": 0, "pending": 0, "minutes": 0})
+        rollup[status] += change
+        rollup["minutes"] += minutes
+
+def compute_stats(tasks):
+    """Build the stats from scratch by going through every task."""
+    stats = empty_stats()
+    for task in tasks:
+        record_task(stats, task, "completed" if task.done else "pending", 1)
+    return stats
+
+def verify_stats(tasks):
+    """Recompute the stats and fix the saved ones if they drifted."""
+    with tasks.transaction():
+        saved = tasks.meta["stats"]
+        fresh = compute_stats(tasks)
+        if saved == fresh:
+            print("Stats OK.")
+            return True
+        tasks.set_meta("stats", fresh)
+    print("Saved stats were out of date, rebuilt them.")
+    return False
+
+def show_stats(tasks):
     print("\n--- STUDY STATS ---")
-    total_completed = sum(task["completed"] for task in data["tasks"])
-    total_minutes = sum(task["duration"] for task in data["tasks"] if task["completed"])
+    stats = tasks.meta["stats"]
 
-    print(f"Total tasks completed: {total_completed}")
-    print(f"Total hours studied: {total_minutes / 60:.2f} hours\n")
+    print(f"Total tasks completed: {stats['completed']} ({stats['pending']} pending)")
+    print(f"Total hours studied: {stats['completed_minutes'] / 60:.2f} hours\n")
 
     # Subject breakdown
-    subjects = {}
-    for task in data["tasks"]:
-        if task["completed"]:
-            subjects[task["subject"]] = subjects.get(task["subject"], 0) + 1
-
     print("Completed tasks per subject:")
-    for subject, count in subjects.items():
-        print(f" - {subject}: {count}")
+    for subject, rollup in stats["subjects"].items():
+        if rollup["completed"]:
+            print(f" - {subject}: {rollup['completed']}")
+
+    print("Tasks per priority:")
+    for priority, rollup in stats["priorities"].items():
+        print(f" - {priority.title()}: {rollup['completed']} completed, {rollup['pending']} pending")
     print()
 
+def search_tasks(tasks, index):
+    print("\n--- SEARCH TASKS ---")
+    query = input("Search words (title or subject): ")
+    # The index may still list a task another session removed.
+    found = [task for task in (tasks.get(int(key)) for key in index.search(query)) if task is not None]
+    if not found:
+        print("No matching tasks.\n")
+        return
+    for task in found:
+        status = "✓ Completed" if task.done else "✗ Pending"
+        print(f"{task.id}. {task.title} | {task.subject} | {task.duration} mins | {task.priority} | {status}")
+    print()
+
+# ------------------ PLANNING ------------------
+
+def plan_day(scheduler):
+    print("\n--- TODAY'S STUDY PLAN ---")
+    if not len(scheduler):
+        print("No pending tasks to plan.\n")
+        return
+    try:
+        budget = int(input("How many minutes can you study today? "))
+    except ValueError:
+        print("Please enter a whole number of minutes.\n")
+        return
+    method = "knapsack" if input("Best fit for the time (slower)? (yes/no): ").lower() == "yes" else "greedy"
+
+    sessions = scheduler.plan(budget, method)
+    if not sessions:
+        print("Nothing fits in that time. Try a bigger budget.\n")
+        return
+
+    lines = []
+    for number, session in enumerate(sessions, start=1):
+        hours, minutes = divmod(session.start, 60)
+        lines.append(f"Session {number} (starts +{hours}h{minutes:02d}m, {session.minutes} mins):")
+        for task, minutes in session.items:
+            lines.append(f"   - {task.title} [{task.subject}, {normalize_priority(task.priority)}] {minutes} mins")
+    print("\n".join(lines) + "\n")
+
 # ------------------ MAIN MENU ------------------
 
 def main():
-    data = load_data()
+    tasks = load_data()
+    scheduler = StudyScheduler(tasks)
+    index = load_index(tasks)
 
     while True:
         print("=== SMART STUDY PLANNER ===")
@@ -92,27 +217,44 @@ def main():
         print("4. View completed tasks")
         print("5. Mark task as completed")
         print("6. View study stats")
-        print("7. Exit")
+        print("7. Plan today's study sessions")
+        print("8. Search tasks")
+        print("9. Exit")
 
         choice = input("Choose an option: ")
 
         if choice == "1":
-            add_task(data)
+            task = add_task(tasks)
+            if task:
+                scheduler.update(task)
+                index.add(task.id, f"{task.title} {task.subject}")
+                index.set_stamp(index_stamp(tasks))
+                index.flush()
         elif choice == "2":
-            view_tasks(data)
+            view_tasks(tasks)
         elif choice == "3":
-            view_tasks(data, "pending")
+            view_tasks(tasks, "pending")
         elif choice == "4":
-            view_tasks(data, "completed")
+            view_tasks(tasks, "completed")
         elif choice == "5":
-            mark_completed(data)
+            task = mark_completed(tasks)
+            if task:
+                scheduler.discard(task.id)
         elif choice == "6":
-            show_stats(data)
+            show_stats(tasks)
         elif choice == "7":
+            plan_day(scheduler)
+        elif choice == "8":
+            search_tasks(tasks, index)
+        elif choice == "9":
             print("Goodbye! Keep studying.")
             break
         else:
             print("Invalid option.\n")
 
 if __name__ == "__main__":
-    main()
+    # python study_planner.py --verify  checks the saved stats against the tasks
+    if "--verify" in sys.argv:
+        verify_stats(load_data())
+    else:
+        main()
@@ -0,0 +1,246 @@
+"""
+Study session scheduler for study_planner.py.
+
+Pending tasks sit in a heap ordered by urgency: tasks with the nearest
+deadline come first, then higher priority, then shorter tasks. Building a
+day's plan only pops as many tasks as can fit in the minute budget, so it
+doesn't re-sort the whole backlog. Adding, completing or changing a task
+is a single O(log n) heap push; the old heap entry is just marked stale
+and skipped later (and the heap is rebuilt once stale entries pile up).
+
+Two ways to choose the day's tasks:
+    greedy    - take tasks in urgency order while they fit the budget.
+    knapsack  - look at the most urgent candidates and pick the set that
+                gives the most priority-weighted study time for the budget.
+
+The chosen tasks are then packed into time-boxed sessions (with a short
+break after each), splitting a long task across sessions when needed.
+"""
+
+import heapq
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from task_store import Task
+
+PRIORITY_WEIGHTS = {"low": 1, "medium": 2, "high": 3}
+PRIORITY_ALIASES = {
+    "l": "low", "lo": "low", "1": "low",
+    "m": "medium", "med": "medium", "mid": "medium", "normal": "medium", "2": "medium",
+    "h": "high", "hi": "high", "urgent": "high", "3": "high",
+}
+DEFAULT_PRIORITY = "medium"
+
+SESSION_MINUTES = 50
+BREAK_MINUTES = 10
+
+# How many urgent candidates to look at past the first one that doesn't fit,
+# and how many the knapsack solver considers at most.
+LOOKAHEAD = 200
+# Knapsack works in 1-minute steps for budgets up to this many minutes,
+# and in coarser steps above it to keep the table small.
+KNAPSACK_MAX_STEPS = 2000
+
+NO_DEADLINE = 10 ** 9  # sorts after every real date
+
+
+def normalize_priority(text: str) -> str:
+    """Map free-text priority ("High", "hi", "3", "") to low/medium/high."""
+    key = text.strip().lower()
+    key = PRIORITY_ALIASES.get(key, key)
+    return key if key in PRIORITY_WEIGHTS else DEFAULT_PRIORITY
+
+
+def deadline_day(task: Task) -> int:
+    """The task's deadline as a day number, or NO_DEADLINE."""
+    try:
+        return date.fromisoformat(task.deadline).toordinal() if task.deadline else NO_DEADLINE
+    except ValueError:
+        return NO_DEADLINE
+
+
+class Session:
+    """One time-boxed study block: (task, minutes) pairs starting at `start` minutes into the day."""
+
+    __slots__ = ("start", "items")
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.items: List[Tuple[Task, int]] = []
+
+    @property
+    def minutes(self) -> int:
+        return sum(m for _, m in self.items)
+
+
+class StudyScheduler:
+    """
+    Keeps pending tasks in an urgency heap and builds daily plans from it.
+
+    Args:
+        tasks: Initial tasks; completed ones are ignored, and so are ones
+            without a positive duration (there is nothing to schedule).
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()) -> None:
+        self._entries: Dict[int, list] = {}
+        self._heap: List[list] = []
+        self._stale = 0
+        for task in tasks:
+            if not task.done and task.duration > 0:
+                entry = self._entry(task)
+                self._entries[task.id] = entry
+                self._heap.append(entry)
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entry(task: Task) -> list:
+        weight = PRIORITY_WEIGHTS[normalize_priority(task.priority)]
+        # [sort key..., task, live flag]; task.id keeps keys unique so the
+        # Task objects themselves are never compared.
+        return [deadline_day(task), -weight, task.duration, task.id, task, True]
+
+    def update(self, task: Task) -> None:
+        """Add a task, or re-rank it after it changed. Completed tasks are dropped."""
+        self.discard(task.id)
+        if task.done or task.duration <= 0:
+            return
+        entry = self._entry(task)
+        self._entries[task.id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def discard(self, task_id: int) -> None:
+        """Forget a task (completed or removed)."""
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return
+        entry[-1] = False
+        self._stale += 1
+        if self._stale > len(self._entries) and self._stale > 64:
+            self._heap = [e for e in self._heap if e[-1]]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    # ------------------ CHOOSING TASKS ------------------
+
+    def _candidates(self, budget: int, limit: int):
+        """
+        Pop live entries in urgency order until the budget is covered and
+        `limit` more entries have been seen. Everything popped is pushed
+        back afterwards, so the heap is unchanged.
+        """
+        popped = []
+        taken = 0
+        extra = 0
+        heap = self._heap
+        while heap and extra < limit:
+            entry = heapq.heappop(heap)
+            if not entry[-1]:
+                self._stale -= 1
+                continue  # dropped for good
+            popped.append(entry)
+            if taken < budget:
+                taken += entry[2]
+            else:
+                extra += 1
+        for entry in popped:
+            heapq.heappush(heap, entry)
+        return popped
+
+    def _greedy(self, budget: int) -> List[Task]:
+        chosen = []
+        remaining = budget
+        for entry in self._candidates(budget, LOOKAHEAD):
+            duration = entry[2]
+            if duration <= remaining:
+                chosen.append(entry[4])
+                remaining -= duration
+                if remaining == 0:
+                    break
+        return chosen
+
+    def _knapsack(self, budget: int, today: int) -> List[Task]:
+        candidates = self._candidates(budget, LOOKAHEAD)[:LOOKAHEAD]
+        # Exact up to KNAPSACK_MAX_STEPS minutes. Past that, durations are
+        # rounded up and the budget down, so the plan never runs over (but
+        # may leave up to a step per task unused).
+        step = -(-budget // KNAPSACK_MAX_STEPS)
+        capacity = budget // step
+
+        # Value = study minutes weighted by priority, doubled when due within a week.
+        items = []
+        for entry in candidates:
+            weight = -(-entry[2] // step)
+            if weight > capacity:
+                continue
+            value = entry[2] * -entry[1] * (2 if entry[0] - today <= 7 else 1)
+            items.append((weight, value, entry[4]))
+
+        best = [0] * (capacity + 1)
+        keep = [[False] * (capacity + 1) for _ in items]
+        for i, (weight, value, _) in enumerate(items):
+            row = keep[i]
+            for c in range(capacity, weight - 1, -1):
+                candidate = best[c - weight] + value
+                if candidate > best[c]:
+                    best[c] = candidate
+                    row[c] = True
+
+        chosen = []
+        c = capacity
+        for i in range(len(items) - 1, -1, -1):
+            if keep[i][c]:
+                chosen.append(items[i][2])
+                c -= items[i][0]
+        chosen.reverse()  # back to urgency order
+        return chosen
+
+    # ------------------ PLANNING ------------------
+
+    def plan(
+        self,
+        budget: int,
+        method: str = "greedy",
+        session_minutes: int = SESSION_MINUTES,
+        break_minutes: int = BREAK_MINUTES,
+        today: Optional[date] = None,
+    ) -> List[Session]:
+        """
+        Build today's sessions.
+
+        Args:
+            budget: Study minutes available today.
+            method: "greedy" or "knapsack".
+            session_minutes: Length of one study block.
+            break_minutes: Break after each block.
+            today: Date used for deadline urgency (defaults to today).
+
+        Returns:
+            Sessions in order; a long task may continue into the next one.
+        """
+        if budget <= 0:
+            return []
+        day = (today or date.today()).toordinal()
+        if method == "knapsack":
+            chosen = self._knapsack(budget, day)
+        else:
+            chosen = self._greedy(budget)
+
+        sessions: List[Session] = []
+        clock = 0
+        current = None
+        for task in chosen:
+            left = task.duration
+            while left > 0:
+                if current is None or current.minutes >= session_minutes:
+                    if current is not None:
+                        clock += current.minutes + break_minutes
+                    current = Session(clock)
+                    sessions.append(current)
+                chunk = min(left, session_minutes - current.minutes)
+                current.items.append((task, chunk))
+                left -= chunk
+        return sessions
@@ -1,12 +1,35 @@
 import json
 import os
 
+from pager import Pager
+from search_index import SearchIndex, file_stamp, tokenize
+
 DATA_FILE = "expenses.json"
+INDEX_FILE = "expenses_index.json"
 
 
 class ExpenseTracker:
     def __init__(self):
         self.expenses = self.load_expenses()
+        self.next_id = max((exp.get("id", 0) for exp in self.expenses), default=0) + 1
+        self.by_id = {}
+        for exp in self.expenses:
+            if "id" not in exp:  # older files have no IDs
+                exp["id"] = self.next_id
+                self.next_id += 1
+            self.by_id[exp["id"]] = exp
+        self.index = self.load_index()
+
+    def load_index(self):
+        """Load the search index, rebuilding it if the expense file changed since it was saved."""
+        index = SearchIndex(INDEX_FILE)
+        if index.stamp != file_stamp(DATA_FILE):
+            index.rebuild(((exp["id"], self.index_text(exp)) for exp in self.expenses), file_stamp(DATA_FILE))
+        return index
+
+    @staticmethod
+    def index_text(exp):
+        return f"{exp['name']} {exp['category']}"
 
     def load_expenses(self):
         """Load expenses from a file or return empty list."""
@@ -30,9 +53,14 @@ class ExpenseTracker:
             amount = float(input("Enter amount: "))
             category = input("Enter category: ").strip()
 
-            entry = {"name": name, "amount": amount, "category": category}
+            entry = {"id": self.next_id, "name": name, "amount": amount, "category": category}
+            self.next_id += 1
             self.expenses.append(entry)
+            self.by_id[entry["id"]] = entry
             self.save_expenses()
+            self.index.add(entry["id"], self.index_text(entry))
+            self.index.set_stamp(file_stamp(DATA_FILE))
+            self.index.flush()
 
             print("\n✔ Expense added successfully!\n")
         except ValueError:
@@ -45,8 +73,12 @@ class ExpenseTracker:
             return
 
         print("\n--- All Expenses ---")
-        for i, exp in enumerate(self.expenses, start=1):
-            print(f"{i}. {exp['name']} - ₦{exp['amount']} ({exp['category']})")
+        pager = Pager(
+            self.expenses,
+            lambda i, exp: f"{i}. {exp['name']} - ₦{exp['amount']} ({exp['category']})",
+            match=lambda exp, text: text.lower() in f"{exp['name']} {exp['category']}".lower(),
+        )
+        pager.browse()
         print()
 
     def view_total(self):
@@ -58,15 +90,37 @@ class ExpenseTracker:
         """Search expenses by category."""
         category = input("Enter category to search: ").strip().lower()
 
-        results = [exp for exp in self.expenses if exp["category"].lower() == category]
+        # The index narrows it down to expenses mentioning the category's words;
+        # only those are checked for an exact category match. A category with
+        # no indexable words (e.g. "-" or "₦") has to be matched against all.
+        if tokenize(category):
+            candidates = (self.by_id[int(key)] for key in self.index.search(category, limit=len(self.expenses)))
+        else:
+            candidates = self.expenses
+        results = [exp for exp in candidates if exp["category"].lower() == category]
 
         if not results:
             print("\nNo expenses found in this category.\n")
             return
 
         print("\n--- Expenses in Category ---")
-        for exp in results:
-            print(f"- {exp['name']} - ₦{exp['amount']}")
+        print("\n".join(f"- {exp['name']} - ₦{exp['amount']}" for exp in results))
+        print()
+
+    def search_expenses(self):
+        """Search expense names and categories by keyword (newest first)."""
+        query = input("Enter search words: ").strip()
+        keys = self.index.search(query)
+
+        if not keys:
+            print("\nNo matching expenses.\n")
+            return
+
+        print("\n--- Matching Expenses ---")
+        print("\n".join(
+            f"- {exp['name']} - ₦{exp['amount']} ({exp['category']})"
+            for exp in (self.by_id[int(key)] for key in keys)
+        ))
         print()
 
     def delete_expense(self):
@@ -79,7 +133,11 @@ class ExpenseTracker:
             index = int(input("Enter expense number to delete: ")) - 1
             if 0 <= index < len(self.expenses):
                 removed = self.expenses.pop(index)
+                del self.by_id[removed["id"]]
                 self.save_expenses()
+                self.index.remove(removed["id"])
+                self.index.set_stamp(file_stamp(DATA_FILE))
+                self.index.flush()
                 print(f"\n✔ Deleted: {removed['name']} (₦{removed['amount']})\n")
             else:
                 print("\n Invalid number.\n")
@@ -94,10 +152,11 @@ class ExpenseTracker:
             print("2. View All Expenses")
             print("3. View Total Spending")
             print("4. Search by Category")
-            print("5. Delete an Expense")
-            print("6. Exit")
+            print("5. Search by Keyword")
+            print("6. Delete an Expense")
+            print("7. Exit")
 
-            choice = input("Choose an option (1-6): ").strip()
+            choice = input("Choose an option (1-7): ").strip()
 
             if choice == "1":
                 self.add_expense()
@@ -108,8 +167,10 @@ class ExpenseTracker:
             elif choice == "4":
                 self.search_by_category()
             elif choice == "5":
-                self.delete_expense()
+                self.search_expenses()
             elif choice == "6":
+                self.delete_expense()
+            elif choice == "7":
                 print("\nGoodbye!\n")
                 break
             else:
@@ -0,0 +1,597 @@
+"""
+Shared task data layer for the planner apps.
+
+nnknkj.py, ROUTINE_ASSISTANT.py, to_do_list.py and study_planner.py all
+keep their tasks here instead of each rolling its own load/save code.
+
+Records:
+    Every task is a Task object with __slots__ (no per-object dict), and
+    gets an ID that never changes and is never reused. A dict maps
+    ID -> Task, so lookup, mark-done and remove are all O(1).
+
+Removal:
+    Removing a task leaves a tombstone behind instead of deleting the key.
+    That lets the store tell "already removed" apart from "never existed" -
+    useful when two sessions share a file and one of them acts on a task
+    the other just deleted: update(), remove() and was_removed() first
+    pick up the other session's changes, so they see its tombstones. Once
+    tombstones pile up, a background thread compacts them away (in memory
+    and on disk); after that next_id still tells a removed ID apart from
+    one never handed out.
+
+File format (one JSON array per line, so saving a change is an append):
+    ["#", 2, next_id]                  header, first line of the file
+    ["+", id, title, done, created_at, subject, duration, priority, deadline]
+                                       task added or changed (last one wins;
+                                       version 1 files have no deadline)
+    ["-", id]                          task removed
+    ["m", key, value]                  app metadata, e.g. saved stats
+                                       (last one wins)
+
+Sharing a file:
+    Several sessions can have the same file open. Every write happens under
+    an exclusive lock on `<file>.lock` and starts by reading whatever the
+    other sessions appended since (or the whole file, if one of them
+    compacted it), so IDs are never handed out twice and compaction never
+    drops another session's rows. New tasks are written as soon as they
+    are added, since that is what reserves their ID. A read-modify-write
+    that must not interleave with other sessions (e.g. updating a counter
+    kept in meta) goes in `with store.transaction():`. Without fcntl
+    (Windows) there is no file lock: one session per file.
+
+Each app has its own file. Old files are converted the first time an app
+opens its new one (nnknkj's tasks.txt -> tasks.jsonl, ROUTINE_ASSISTANT's
+tasks.json -> routine_tasks.jsonl, study_data.json -> study_tasks.jsonl),
+or explicitly with:
+    python task_store.py migrate
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from persistence import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # Windows: thread locks only, one session per file
+    fcntl = None
+
+FORMAT_VERSION = 2
+
+# Compact once there are at least this many dead lines/tombstones and they
+# outnumber the live tasks.
+COMPACT_MIN_TOMBSTONES = 64
+
+# Loading this many tasks must stay within LOAD_BUDGET_SECONDS
+# (checked by: python task_store.py bench).
+LOAD_BUDGET_TASKS = 100_000
+LOAD_BUDGET_SECONDS = 1.0
+
+_TOMBSTONE = None
+
+
+class Task:
+    """
+    One task record.
+
+    Attributes:
+        id: Stable task number (0 until the task is added to a store).
+        title: What to do.
+        done: Whether the task is finished.
+        created_at: "YYYY-MM-DD HH:MM" timestamp.
+        subject: Study subject (study planner only, "" elsewhere).
+        duration: Estimated minutes (study planner only, 0 elsewhere).
+        priority: Free-text priority (study planner only, "" elsewhere).
+        deadline: "YYYY-MM-DD" due date, or "" for none (study planner only).
+    """
+
+    __slots__ = ("id", "title", "done", "created_at", "subject", "duration", "priority", "deadline")
+
+    def __init__(
+        self,
+        id: int = 0,
+        title: str = "",
+        done: bool = False,
+        created_at: str = "",
+        subject: str = "",
+        duration: int = 0,
+        priority: str = "",
+        deadline: str = "",
+    ) -> None:
+        self.id = id
+        self.title = title
+        self.done = done
+        self.created_at = created_at or datetime.now().strftime("%Y-%m-%d %H:%M")
+        self.subject = subject
+        self.duration = duration
+        self.priority = priority
+        self.deadline = deadline
+
+    def to_row(self) -> list:
+        """The task as a "+" line of the file format."""
+        return ["+", self.id, self.title, self.done, self.created_at,
+                self.subject, self.duration, self.priority, self.deadline]
+
+    def __repr__(self) -> str:
+        return f"Task(id={self.id}, title={self.title!r}, done={self.done})"
+
+
+class TaskStore:
+    """
+    Ordered collection of Tasks keyed by a stable integer ID.
+
+    Iteration yields live tasks in the order they were added. New tasks
+    are appended to the file straight away; other changes are queued in
+    memory and written by flush(). Nothing is rewritten until compaction.
+
+    Args:
+        path: File to load from and save to, or None to keep tasks in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.lock = threading.RLock()
+        self.next_id = 1
+        self.meta: Dict[str, object] = {}
+        self._records: Dict[int, Optional[Task]] = {}
+        self._tombstones = 0
+        self._dead_lines = 0       # lines in the file that a snapshot would drop
+        self._pending: List[list] = []
+        self._io_lock = threading.RLock()
+        self._lock_held = False    # _locked() is active (on the thread owning _io_lock)
+        self._compacting = False
+        self._offset = 0           # bytes of the file already applied
+        self._identity = None      # (st_dev, st_ino) of the file those bytes came from
+
+        if path and os.path.exists(path):
+            with self._locked():
+                pass  # _locked() loads the file
+
+    @classmethod
+    def open(cls, path: str, legacy: Iterable[str] = ()) -> "TaskStore":
+        """
+        Open a task file, converting old-format files on first use.
+
+        Args:
+            path: The task file.
+            legacy: Old files to import if path doesn't exist yet.
+        """
+        if os.path.exists(path):
+            return cls(path)
+        store = cls(path)
+        for old_path in legacy:
+            if os.path.exists(old_path):
+                import_legacy(store, old_path)
+        store.compact()  # writes the header even if nothing was imported
+        return store
+
+    # --------------------------
+    # LOADING
+    # --------------------------
+
+    @contextmanager
+    def _locked(self):
+        """Hold the file lock, with everything other sessions wrote applied."""
+        with self._io_lock:
+            if self._lock_held:
+                yield  # nested, e.g. add() inside transaction(): already locked and caught up
+                return
+            lock_file = None
+            if fcntl and self.path is not None:
+                # A separate lock file: compaction replaces the task file
+                # itself, which would leave a lock on it behind.
+                lock_file = open(self.path + ".lock", "a")
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if self.path is not None:
+                    self._catch_up()
+                self._lock_held = True
+                yield
+            finally:
+                self._lock_held = False
+                if lock_file is not None:
+                    lock_file.close()  # releases the lock
+
+    def _catch_up(self) -> None:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if (st.st_dev, st.st_ino) != self._identity or st.st_size < self._offset:
+            self._reload()
+        elif st.st_size > self._offset:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+            with self.lock:
+                self._offset += self._read_rows(data, self._offset)
+                self._reapply_pending()
+
+    def _reload(self) -> None:
+        """Read the whole file again (first load, or another session compacted it)."""
+        with open(self.path, "rb") as f:
+            data = f.read()
+            st = os.fstat(f.fileno())
+        with self.lock:
+            old = self._records
+            self._records = {}
+            self._tombstones = 0
+            self._dead_lines = 0
+            self.meta.clear()
+            self._offset = self._read_rows(data, 0)
+            self._identity = (st.st_dev, st.st_ino)
+            # Keep the Task objects the app already holds.
+            for task_id, task in self._records.items():
+                mine = old.get(task_id, _TOMBSTONE)
+                if task is not _TOMBSTONE and mine is not _TOMBSTONE:
+                    _copy_fields(task, mine)
+                    self._records[task_id] = mine
+            self._reapply_pending()
+
+    def _reapply_pending(self) -> None:
+        """Put this session's unsaved changes back on top of what was just read."""
+        pending = []
+        for row in self._pending:
+            if row[0] == "+":
+                task = self._records.get(row[1], _TOMBSTONE)
+                if task is _TOMBSTONE:
+                    continue  # another session removed it; don't bring it back
+                _copy_fields(Task(*row[1:]), task)
+            elif row[0] == "-":
+                # What was read may have this task live again (a snapshot
+                # taken before our removal reached the file, or another
+                # session's update of it); our removal still stands.
+                if self._records.get(row[1], _TOMBSTONE) is not _TOMBSTONE:
+                    self._records[row[1]] = _TOMBSTONE
+                    self._tombstones += 1
+                    self._dead_lines += 2
+            elif row[0] == "m":
+                self.meta[row[1]] = row[2]
+            pending.append(row)
+        self._pending = pending
+
+    def _read_rows(self, data: bytes, base: int) -> int:
+        """
+        Apply the rows in data, which starts at byte `base` of the file.
+
+        Returns:
+            Bytes used: a torn last line is cut off the file and not counted.
+        """
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            # A last line with no newline is an append that never finished
+            # (crash, full disk). Cut it off so the next append starts clean.
+            self._truncate(base + end)
+            data = data[:end]
+        text = data.decode("utf-8", "replace").strip()
+        if not text:
+            return end
+        try:
+            # One json.loads over the whole file is much faster than one per line...
+            rows = json.loads("[" + text.replace("\n", ",") + "]")
+        except ValueError:
+            # ...but a single damaged line must not make the whole file unreadable.
+            rows = []
+            for line in text.split("\n"):
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    if line.strip():
+                        self._dead_lines += 1  # skipped; compaction drops it
+        for row in rows:
+            try:
+                self._apply(row)
+            except (IndexError, TypeError, KeyError):
+                self._dead_lines += 1
+        return end
+
+    def _truncate(self, size: int) -> None:
+        try:
+            with open(self.path, "r+b") as f:
+                f.truncate(size)
+        except OSError:
+            pass  # read-only file: the torn line is just ignored
+
+    def _apply(self, row: list) -> None:
+        records = self._records
+        kind = row[0]
+        if kind == "+":
+            task_id = row[1]
+            task = Task(*row[1:])
+            if task_id in records:
+                old = records[task_id]
+                if old is _TOMBSTONE:
+                    self._tombstones -= 1
+                else:
+                    _copy_fields(task, old)  # update in place: the app may hold it
+                    task = old
+                self._dead_lines += 1
+            records[task_id] = task
+            if task_id >= self.next_id:
+                self.next_id = task_id + 1
+        elif kind == "-":
+            task_id = row[1]
+            if records.get(task_id, _TOMBSTONE) is not _TOMBSTONE:
+                records[task_id] = _TOMBSTONE
+                self._tombstones += 1
+                self._dead_lines += 2
+            if task_id >= self.next_id:
+                self.next_id = task_id + 1
+        elif kind == "m":
+            if row[1] in self.meta:
+                self._dead_lines += 1
+            self.meta[row[1]] = row[2]
+        elif kind == "#":
+            if row[1] > FORMAT_VERSION:
+                raise ValueError(f"{self.path} was written by a newer version (format {row[1]})")
+            self.next_id = max(self.next_id, row[2])
+
+    # --------------------------
+    # ACCESS
+    # --------------------------
+
+    def __len__(self) -> int:
+        return len(self._records) - self._tombstones
+
+    def __iter__(self) -> Iterator[Task]:
+        with self.lock:
+            records = list(self._records.values())
+        return (t for t in records if t is not _TOMBSTONE)
+
+    def __contains__(self, task_id: int) -> bool:
+        return self._records.get(task_id, _TOMBSTONE) is not _TOMBSTONE
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Return the live task with task_id, or None."""
+        return self._records.get(task_id, _TOMBSTONE)
+
+    def was_removed(self, task_id: int) -> bool:
+        """True if task_id was handed out once but is no longer live, here or in another session."""
+        self.refresh()
+        with self.lock:
+            if task_id in self._records:
+                return self._records[task_id] is _TOMBSTONE
+            # Not in the dict: never handed out, or its tombstone was compacted away.
+            return 0 < task_id < self.next_id
+
+    def refresh(self) -> None:
+        """Pick up the changes other sessions have written to the file."""
+        if self.path is not None:
+            with self._locked():
+                pass
+
+    # --------------------------
+    # CHANGES
+    # --------------------------
+
+    def add(self, task: Task) -> int:
+        """Store a new task, give it the next ID and return that ID."""
+        with self._locked():
+            with self.lock:
+                task.id = self.next_id
+                self.next_id += 1
+                self._records[task.id] = task
+                self._pending.append(task.to_row())
+            # Written now, under the lock, so no other session takes this ID.
+            self._write_pending()
+            return task.id
+
+    def update(self, task_id: int, **fields) -> Optional[Task]:
+        """Set fields on a live task. Returns the task, or None if missing."""
+        self.refresh()
+        with self.lock:
+            task = self._records.get(task_id, _TOMBSTONE)
+            if task is _TOMBSTONE:
+                return None
+            for name, value in fields.items():
+                setattr(task, name, value)
+            self._pending.append(task.to_row())
+            self._dead_lines += 1
+            self._maybe_compact()
+            return task
+
+    def remove(self, task_id: int) -> Optional[Task]:
+        """Remove a task, leaving a tombstone. Returns the removed task."""
+        self.refresh()
+        with self.lock:
+            task = self._records.get(task_id, _TOMBSTONE)
+            if task is _TOMBSTONE:
+                return None
+            self._records[task_id] = _TOMBSTONE
+            self._tombstones += 1
+            self._dead_lines += 2
+            self._pending.append(["-", task_id])
+            self._maybe_compact()
+            return task
+
+    def set_meta(self, key: str, value) -> None:
+        """Save an app-specific value (anything JSON can store) with the tasks."""
+        with self.lock:
+            if key in self.meta:
+                self._dead_lines += 1
+            self.meta[key] = value
+            # Only the latest value of a key needs to reach the file.
+            self._pending = [r for r in self._pending if not (r[0] == "m" and r[1] == key)]
+            self._pending.append(["m", key, value])
+            self._maybe_compact()  # superseded "m" lines count as dead
+
+    @contextmanager
+    def transaction(self):
+        """
+        Make several changes as one step with respect to other sessions.
+
+        Inside the block the file is locked and everything other sessions
+        wrote has been applied, so what the block reads is current; its
+        changes are written when it ends.
+        """
+        with self._locked():
+            yield self
+            self._write_pending()
+
+    # --------------------------
+    # SAVING
+    # --------------------------
+
+    def flush(self) -> None:
+        """Append queued changes to the file in one write."""
+        with self._locked():
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        with self.lock:
+            rows, self._pending = self._pending, []
+        if not rows or self.path is None:
+            return
+        data = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+        with open(self.path, "ab") as f:
+            f.write(data)
+            # Everything before this point was applied by _catch_up().
+            self._offset = f.tell()
+            st = os.fstat(f.fileno())
+            self._identity = (st.st_dev, st.st_ino)
+
+    def _maybe_compact(self) -> None:
+        if self._compacting:
+            return
+        dead = max(self._tombstones, self._dead_lines)
+        if dead >= COMPACT_MIN_TOMBSTONES and dead > len(self):
+            self._compacting = True
+            threading.Thread(target=self.compact, name="task-store-compact", daemon=True).start()
+
+    def compact(self) -> None:
+        """
+        Drop tombstones and rewrite the file as a fresh snapshot.
+
+        IDs are remembered in the header's next_id, so none are ever reused.
+        """
+        with self._locked():
+            with self.lock:
+                self._records = {i: t for i, t in self._records.items() if t is not _TOMBSTONE}
+                self._tombstones = 0
+                self._dead_lines = 0
+                self._pending = []
+                lines = [json.dumps(["#", FORMAT_VERSION, self.next_id])]
+                lines.extend(json.dumps(["m", k, v], ensure_ascii=False) for k, v in self.meta.items())
+                lines.extend(json.dumps(t.to_row(), ensure_ascii=False) for t in self._records.values())
+            if self.path is not None:
+                text = "\n".join(lines) + "\n"
+                atomic_write(self.path, text)
+                st = os.stat(self.path)
+                self._offset = len(text.encode("utf-8"))
+                self._identity = (st.st_dev, st.st_ino)
+            self._compacting = False
+
+
+def _copy_fields(source: Task, target: Task) -> None:
+    for name in Task.__slots__:
+        setattr(target, name, getattr(source, name))
+
+
+# --------------------------
+# LEGACY FILES
+# --------------------------
+
+def import_legacy(store: TaskStore, path: str) -> int:
+    """
+    Add the tasks from an old-format file to store.
+
+    Understands nnknkj's tasks.txt (done tasks end in " ✓"),
+    ROUTINE_ASSISTANT's tasks.json and study_planner's study_data.json.
+    Tasks get new IDs in their original order.
+
+    Returns:
+        Number of tasks imported.
+    """
+    tasks = []
+    if path.endswith(".txt"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if not line.strip() or line.startswith("#next_id "):
+                    continue
+                task_id, sep, text = line.partition("\t")
+                if sep and task_id.isdigit():
+                    line = text
+                done = line.endswith(" ✓")
+                tasks.append(Task(title=line[:-2] if done else line.strip(), done=done))
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        rows = data if isinstance(data, list) else data.get("tasks", [])
+        for row in rows:
+            tasks.append(Task(
+                title=row.get("task", row.get("title", "")),
+                done=bool(row.get("done", row.get("completed", False))),
+                created_at=row.get("created_at", ""),
+                subject=row.get("subject", ""),
+                duration=int(row.get("duration", 0)),
+                priority=row.get("priority", ""),
+                deadline=row.get("deadline", ""),
+            ))
+
+    for task in tasks:
+        store.add(task)
+    return len(tasks)
+
+
+# --------------------------
+# COMMAND LINE
+# --------------------------
+
+# New file -> old files it replaces, for "python task_store.py migrate".
+MIGRATIONS = {
+    "tasks.jsonl": ["tasks.txt"],             # nnknkj.py
+    "routine_tasks.jsonl": ["tasks.json"],    # ROUTINE_ASSISTANT.py
+    "study_tasks.jsonl": ["study_data.json"],
+}
+
+
+def migrate() -> None:
+    """Convert every old task file found in the current folder."""
+    for new_path, old_paths in MIGRATIONS.items():
+        found = [p for p in old_paths if os.path.exists(p)]
+        if not found:
+            continue
+        if os.path.exists(new_path):
+            print(f"{new_path} already exists, skipping {', '.join(found)}")
+            continue
+        store = TaskStore.open(new_path, found)
+        print(f"{', '.join(found)} -> {new_path} ({len(store)} tasks)")
+
+
+def bench(count: int = LOAD_BUDGET_TASKS) -> bool:
+    """Time loading `count` tasks and compare with the load budget."""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.jsonl")
+        store = TaskStore()  # in memory: add() would write each task
+        for i in range(count):
+            store.add(Task(title=f"Task {i}", subject="Maths", duration=30, priority="High"))
+        store.path = path
+        store.compact()
+
+        start = time.perf_counter()
+        loaded = TaskStore(path)
+        elapsed = time.perf_counter() - start
+
+    budget = LOAD_BUDGET_SECONDS * count / LOAD_BUDGET_TASKS
+    print(f"Loaded {len(loaded):,} tasks in {elapsed:.3f}s (budget {budget:.3f}s)")
+    return elapsed <= budget
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "migrate":
+        migrate()
+    elif command == "bench":
+        ok = bench(int(sys.argv[2]) if len(sys.argv) > 2 else LOAD_BUDGET_TASKS)
+        sys.exit(0 if ok else 1)
+    else:
+        print("Usage: python task_store.py migrate | bench [COUNT]")
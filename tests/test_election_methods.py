@@ -0,0 +1,48 @@
+from election_methods import approval, borda, instant_runoff, reference_instant_runoff, winner
+
+CANDIDATES = (1, 2, 3, 4)
+
+# 22 ballots, worked through by hand:
+#   round 1: 1=8  2=5  3=4  4=5          -> 3 is out, its 4 ballots go to 2
+#   round 2: 1=8  2=9  4=5               -> 4 is out, its 5 ballots run out of choices
+#   round 3: 1=8  2=9, 5 exhausted       -> 2 has 9 of the 17 still counting
+RANKINGS = {
+    b"\x01\x02": 8,
+    b"\x02\x03": 5,
+    b"\x03\x02": 4,
+    b"\x04\x03": 3,
+    b"\x04": 2,
+}
+
+
+def test_instant_runoff_rounds():
+    rounds = instant_runoff(RANKINGS, CANDIDATES)
+    assert [r.counts for r in rounds] == [{1: 8, 2: 5, 3: 4, 4: 5}, {1: 8, 2: 9, 4: 5}, {1: 8, 2: 9}]
+    assert [r.eliminated for r in rounds] == [3, 4, None]
+    assert [r.exhausted for r in rounds] == [0, 0, 5]
+    assert winner(rounds) == 2
+    assert rounds == reference_instant_runoff(RANKINGS, CANDIDATES)
+
+
+def test_first_round_majority_ends_the_count():
+    rounds = instant_runoff({b"\x01": 3, b"\x02\x01": 2}, CANDIDATES)
+    assert len(rounds) == 1
+    assert winner(rounds) == 1
+
+
+def test_ties_for_last_place():
+    # 3 and 4 tie on 2 votes with no earlier round to separate them, so
+    # the higher number goes out first.
+    rankings = {b"\x01": 4, b"\x02": 3, b"\x03\x02": 2, b"\x04\x01": 2}
+    rounds = instant_runoff(rankings, CANDIDATES)
+    assert rounds[0].eliminated == 4
+    assert rounds == reference_instant_runoff(rankings, CANDIDATES)
+
+
+def test_no_ballots():
+    assert winner(instant_runoff({}, CANDIDATES)) is None
+
+
+def test_approval_and_borda():
+    assert approval(RANKINGS, CANDIDATES) == {1: 8, 2: 17, 3: 12, 4: 5}
+    assert borda(RANKINGS, CANDIDATES) == {1: 24, 2: 39, 3: 28, 4: 15}
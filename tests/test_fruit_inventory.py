@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+from fruit_catalog import Catalog, Product
+from fruit_inventory import Inventory
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_inventory(ttl=60.0):
+    clock = Clock()
+    catalog = Catalog([Product("apple", 50, 5), Product("kiwi", 30, 10)])
+    return Inventory(catalog, ttl=ttl, clock=clock), catalog, clock
+
+
+def test_reserve_is_all_or_nothing():
+    inventory, _, _ = make_inventory()
+    assert inventory.reserve([("apple", 3), ("kiwi", 11)]) is None
+    assert inventory.reserved() == 0
+    held = inventory.reserve([("apple", 2), ("kiwi", 4), ("apple", 1)])
+    assert held.lines == (("apple", 3), ("kiwi", 4))
+    assert inventory.available("apple") == 2
+    assert inventory.reserve([("apple", 3)]) is None
+
+
+def test_release_puts_stock_back_and_commit_sells_it():
+    inventory, catalog, _ = make_inventory()
+    first = inventory.reserve([("apple", 4)])
+    assert inventory.release(first)
+    assert not inventory.release(first)
+    assert not inventory.commit(first)
+    assert inventory.available("apple") == 5
+
+    second = inventory.reserve([("apple", 4)])
+    assert inventory.commit(second)
+    assert not inventory.release(second)
+    assert catalog.products["apple"].stock == 1
+    assert inventory.reserved() == 0
+
+
+def test_expired_reservations_free_their_stock():
+    inventory, catalog, clock = make_inventory(ttl=10)
+    stale = inventory.reserve([("apple", 5)])
+    clock.now = 11
+    assert not inventory.commit(stale)
+    assert inventory.available("apple") == 5
+    inventory.reserve([("apple", 5)])
+    clock.now = 30
+    assert inventory.reserve([("apple", 2)]) is not None  # the old hold is swept to make room
+    assert catalog.products["apple"].stock == 5
+
+
+def test_bad_quantities_are_refused():
+    inventory, _, _ = make_inventory()
+    for qty in (0, -3):
+        with pytest.raises(ValueError):
+            inventory.reserve([("apple", qty)])
+    assert inventory.available("apple") == 5
+
+
+def test_concurrent_checkouts_never_oversell():
+    inventory, catalog, _ = make_inventory()
+    sold = []
+
+    def buyer():
+        for _ in range(20):
+            held = inventory.reserve([("apple", 1), ("kiwi", 1)])
+            if held is not None and inventory.commit(held):
+                sold.append(1)
+
+    threads = [threading.Thread(target=buyer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(sold) == 5
+    assert catalog.products["apple"].stock == 0
+    assert catalog.products["kiwi"].stock == 5
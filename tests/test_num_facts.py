@@ -0,0 +1,38 @@
+import io
+
+import num_facts
+
+
+def table(text, chunk_bytes=num_facts.CHUNK_BYTES):
+    out = io.StringIO()
+    numbers = num_facts.read_numbers(io.BytesIO(text), chunk_bytes)
+    while True:
+        try:
+            num_facts.write_table(next(numbers), out)
+        except StopIteration as done:
+            return out.getvalue().splitlines(), done.value
+
+
+def test_rows_and_skipped_tokens():
+    rows, bad = table(b"5 -4 0 abc 1.5 - 7\n")
+    assert rows == ["5\todd\t+\t25", "-4\teven\t-\t16", "0\teven\t0\t0", "7\todd\t+\t49"]
+    assert bad == 3
+
+
+def test_numbers_cut_between_chunks():
+    rows, bad = table(b"123 -456 7890", chunk_bytes=5)
+    assert [row.split("\t")[0] for row in rows] == ["123", "-456", "7890"]
+    assert bad == 0
+
+
+def test_squares_at_the_64_bit_limits():
+    for text, numbers in ((b"-9223372036854775808 2", [-2 ** 63, 2]),
+                          (b"1 99999999999999999999", [1, 99999999999999999999])):
+        rows, _ = table(text)
+        assert [int(row.split("\t")[3]) for row in rows] == [n * n for n in numbers]
+
+
+def test_summary_counts():
+    values, bad = num_facts.parse_numbers(b"-3 -2 0 1 2 x")
+    assert bad == 1
+    assert num_facts.count_chunk(values) == (2, 2, 2, 1)
@@ -0,0 +1,49 @@
+import math
+import string
+
+import pytest
+
+from password_policy import AMBIGUOUS, PasswordPolicy
+
+
+def count(password, chars):
+    return sum(c in chars for c in password)
+
+
+def test_every_password_meets_the_minimums():
+    policy = PasswordPolicy(min_length=10, max_length=14, min_lower=2, min_upper=2, min_digits=3, min_symbols=2)
+    for password in policy.generate(2000):
+        assert 10 <= len(password) <= 14
+        assert count(password, string.ascii_lowercase) >= 2
+        assert count(password, string.ascii_uppercase) >= 2
+        assert count(password, string.digits) >= 3
+        assert count(password, string.punctuation) >= 2
+
+
+def test_excluded_and_disallowed_characters_never_appear():
+    policy = PasswordPolicy(min_length=16, max_length=16, symbols=False, min_symbols=0,
+                            exclude="xyz", exclude_ambiguous=True)
+    used = set("".join(policy.generate(2000)))
+    assert not used & set("xyz" + AMBIGUOUS + string.punctuation)
+    assert set(string.digits) - set(AMBIGUOUS) <= used
+
+
+def test_entropy_counts_only_valid_passwords():
+    digits = PasswordPolicy(min_length=2, max_length=2, lower=False, upper=False, symbols=False,
+                            min_letters=0, min_symbols=0)
+    assert digits.entropy() == pytest.approx(math.log2(100))
+    # Two characters from "a0" with a letter and a digit: only "a0" and "0a".
+    mixed = PasswordPolicy(min_length=2, max_length=2, upper=False, symbols=False, min_symbols=0,
+                           exclude=string.ascii_lowercase[1:] + string.digits[1:])
+    assert mixed.entropy() == pytest.approx(1.0)
+    assert set(mixed.generate(200)) == {"a0", "0a"}
+
+
+@pytest.mark.parametrize("rules", [
+    dict(min_length=3, max_length=3, min_digits=2, min_symbols=2),   # minimums don't fit
+    dict(digits=False, min_digits=1),                                # required but not allowed
+    dict(min_length=5, max_length=4),
+])
+def test_impossible_policies_are_refused(rules):
+    with pytest.raises(ValueError):
+        PasswordPolicy(**rules).sampler()
@@ -0,0 +1,46 @@
+import os
+import random
+
+from question_bank import Question, QuestionBank, write_bank
+
+
+def questions(count, start=1):
+    return [Question(i, ("physics", "biology")[i % 2], ("easy", "hard")[i % 3 == 0], f"Question {i}?",
+                     ["yes", "no"], i % 2) for i in range(start, start + count)]
+
+
+def test_index_groups_and_reads_questions(tmp_path):
+    path = str(tmp_path / "bank.jsonl")
+    write_bank(path, questions(30))
+    bank = QuestionBank(path)
+    assert os.path.exists(path + ".idx")
+    assert bank.topics() == ["biology", "physics"]
+    assert bank.count() == 30
+    assert bank.count("physics", "hard") == len([i for i in range(1, 31) if i % 2 and i % 3 == 0])
+    quiz = bank.sample(5, topic="biology", rng=random.Random(1))
+    assert len({q.id for q in quiz}) == 5
+    assert all(q.topic == "biology" and q.text == f"Question {q.id}?" for q in quiz)
+    bank.close()
+
+
+def test_index_is_rebuilt_when_the_bank_changes(tmp_path):
+    path = str(tmp_path / "bank.jsonl")
+    write_bank(path, questions(10))
+    QuestionBank(path).close()
+    with open(path, "a", encoding="utf-8") as f:
+        for q in questions(5, start=11):
+            f.write(q.to_line())
+    bank = QuestionBank(path)
+    assert bank.count() == 15
+    assert sorted(bank.get(p).id for start, n in bank.runs() for p in range(start, start + n)) == list(range(1, 16))
+    bank.close()
+
+
+def test_stale_index_is_replaced_not_trusted(tmp_path):
+    path = str(tmp_path / "bank.jsonl")
+    write_bank(path, questions(10))
+    QuestionBank(path).close()
+    write_bank(path, questions(3, start=100))  # rewritten: old offsets point nowhere useful
+    bank = QuestionBank(path)
+    assert sorted(q.id for q in bank.sample(10)) == [100, 101, 102]
+    bank.close()
@@ -0,0 +1,66 @@
+import random
+from collections import Counter
+
+from question_bank import Question, QuestionBank, write_bank
+from quiz_engine import BOX_WEIGHTS, NEW_WEIGHT, FenwickTree, QuizEngine, QuizStats
+
+
+def test_fenwick_tree_matches_prefix_sums():
+    rng = random.Random(3)
+    weights = [rng.randint(0, 9) for _ in range(37)]
+    tree = FenwickTree(weights[:20])
+    for w in weights[20:]:
+        tree.append(w)
+    for _ in range(50):
+        i = rng.randrange(len(weights))
+        delta = rng.randint(-weights[i], 5)
+        weights[i] += delta
+        tree.add(i, delta)
+    assert tree.total() == sum(weights)
+    for target in range(sum(weights)):
+        running, expected = 0, None
+        for i, w in enumerate(weights):
+            running += w
+            if running > target:
+                expected = i
+                break
+        assert tree.find(target) == expected
+
+
+def make_bank(tmp_path, count):
+    path = str(tmp_path / "bank.jsonl")
+    write_bank(path, (Question(i, "maths", "easy", f"{i} + 0?", [str(i), "0"], 0) for i in range(count)))
+    return QuestionBank(path)
+
+
+def test_quiz_never_repeats_a_question(tmp_path):
+    bank = make_bank(tmp_path, 12)
+    engine = QuizEngine(bank, length=12, rng=random.Random(1))
+    for round_number in range(4):
+        asked = []
+        while engine.next_question():
+            asked.append(engine.current.id)
+            engine.answer(round_number % 2, elapsed_ms=100)  # right, then wrong, ...
+        assert sorted(asked) == list(range(12))
+        engine.new_quiz()
+    assert len(engine.stats.entries) == 12
+    bank.close()
+
+
+def test_missed_questions_are_drawn_more_often(tmp_path):
+    bank = make_bank(tmp_path, 3)
+    stats = QuizStats()
+    stats.use_bank(bank)
+    stats.record(0, 0, False, 100)            # box 0
+    for _ in range(len(BOX_WEIGHTS)):
+        stats.record(1, 1, True, 100)         # top box
+    engine = QuizEngine(bank, stats, length=1, rng=random.Random(7))
+    firsts = Counter()
+    for _ in range(3000):
+        firsts[engine.next_question().id] += 1
+        engine.new_quiz()
+    weights = {0: BOX_WEIGHTS[0], 1: BOX_WEIGHTS[-1], 2: NEW_WEIGHT}
+    total = sum(weights.values())
+    for question_id, weight in weights.items():
+        assert abs(firsts[question_id] / 3000 - weight / total) < 0.03
+    bank.close()
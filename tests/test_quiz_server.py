@@ -0,0 +1,53 @@
+import asyncio
+import json
+
+from quiz_server import QuizServer
+
+QUESTION = {"topic": "physics", "difficulty": "easy", "question": "2 + 2?", "options": ["3", "4"], "answer": 1}
+
+
+def converse(server, chunks, limit=64):
+    """Replies to the bytes in chunks, sent one after another to one session."""
+
+    async def run():
+        reader = asyncio.StreamReader(limit=limit)
+
+        class Writer:
+            sent = b""
+            transport = type("Transport", (), {"get_write_buffer_size": lambda self: 0})()
+
+            def write(self, data):
+                Writer.sent += data
+
+            def close(self):
+                pass
+
+        session = asyncio.ensure_future(server.handle(reader, Writer()))
+        for chunk in chunks:  # as separate reads, the way they'd come off the network
+            reader.feed_data(chunk)
+            for _ in range(5):
+                await asyncio.sleep(0)
+        reader.feed_eof()
+        await session
+        return [json.loads(line) for line in Writer.sent.splitlines()]
+
+    return asyncio.run(run())
+
+
+def make_server(tmp_path):
+    bank = tmp_path / "bank.jsonl"
+    bank.write_text(json.dumps(dict(QUESTION, id=1)) + "\n")
+    return QuizServer(str(bank))
+
+
+def test_overlong_line_is_skipped_whole(tmp_path):
+    server = make_server(tmp_path)
+    long_line = b"START " + b"9" * 200 + b" NEXT NEXT\n"
+    replies = converse(server, [long_line[:100], long_line[100:], b"START 1\n", b"NEXT\n"])
+    assert replies[0] == {"error": "line too long"}
+    assert replies[1:] == [{"length": 1}, {"n": 1, "question": {"id": 1, "text": "2 + 2?", "options": ["3", "4"]}}]
+
+
+def test_last_line_without_newline_is_answered(tmp_path):
+    server = make_server(tmp_path)
+    assert converse(server, [b"START 1\nNEXT\nANSWER 1"])[-1] == {"correct": True, "answer": 1, "score": 1}
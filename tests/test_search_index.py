@@ -0,0 +1,61 @@
+from search_index import SearchIndex, file_stamp
+
+
+def make_index(path=None):
+    index = SearchIndex(path)
+    index.add(1, "Calculus homework maths")
+    index.add(2, "Chemistry lab report")
+    index.add(3, "Maths revision calculus")
+    return index
+
+
+def test_prefix_query_newest_first():
+    assert make_index().search("calc") == ["3", "1"]
+
+
+def test_terms_are_anded():
+    index = make_index()
+    assert index.search("calc hom") == ["1"]
+    assert index.search("maths lab") == []
+
+
+def test_replace_and_remove():
+    index = make_index()
+    index.add(1, "History essay")
+    index.remove(3)
+    assert index.search("calc") == []
+    assert index.search("hist") == ["1"]
+    assert len(index) == 2
+
+
+def test_rebuild_matches_incremental_adds():
+    docs = [(i, f"word{i % 7} other{i % 3} item{i}") for i in range(200)]
+    built = SearchIndex()
+    built.rebuild(docs)
+    added = SearchIndex()
+    for key, text in docs:
+        added.add(key, text)
+    for query in ("word3", "other1 word", "item1", "item19 other"):
+        assert built.search(query, limit=500) == added.search(query, limit=500)
+    assert built._terms == sorted(built._terms)
+
+
+def test_snapshot_and_log_round_trip(tmp_path):
+    path = str(tmp_path / "index.json")
+    index = SearchIndex(path)
+    index.rebuild([(1, "alpha beta")], stamp=[1, 1])
+    index.add(2, "beta gamma")
+    index.set_stamp([2, 2])
+    index.flush()
+    loaded = SearchIndex(path)
+    assert loaded.search("beta") == ["2", "1"]
+    assert loaded.stamp == [2, 2]
+
+
+def test_file_stamp_changes_when_the_file_does(tmp_path):
+    path = tmp_path / "data.json"
+    assert file_stamp(str(path)) is None
+    path.write_text("[]")
+    first = file_stamp(str(path))
+    path.write_text('[{"id": 1}]')
+    assert file_stamp(str(path)) != first
@@ -0,0 +1,46 @@
+from datetime import date
+
+from study_scheduler import StudyScheduler
+from task_store import Task
+
+TODAY = date(2026, 1, 5)
+
+
+def make(*durations, priority="Medium"):
+    tasks = [Task(title=f"t{i}", duration=d, priority=priority) for i, d in enumerate(durations, start=1)]
+    for i, task in enumerate(tasks, start=1):
+        task.id = i
+    return tasks
+
+
+def planned(scheduler, budget, method):
+    sessions = scheduler.plan(budget, method, today=TODAY)
+    return sum(minutes for session in sessions for _, minutes in session.items)
+
+
+def test_task_that_exactly_fits_is_planned():
+    for method in ("greedy", "knapsack"):
+        assert planned(StudyScheduler(make(12)), 12, method) == 12
+        assert planned(StudyScheduler(make(3)), 4, method) == 3
+
+
+def test_knapsack_fills_the_budget_better_than_greedy():
+    scheduler = StudyScheduler(make(5, 6, 7))
+    assert planned(scheduler, 13, "greedy") == 11
+    assert planned(scheduler, 13, "knapsack") == 13
+
+
+def test_tasks_without_a_positive_duration_are_not_scheduled():
+    tasks = make(0, -30, 20)
+    scheduler = StudyScheduler(tasks[:1])
+    scheduler.update(tasks[1])
+    scheduler.update(tasks[2])
+    assert len(scheduler) == 1
+    for method in ("greedy", "knapsack"):
+        assert planned(scheduler, 20, method) == 20
+
+
+def test_large_budget_never_overruns():
+    scheduler = StudyScheduler(make(*[37, 53, 121, 9, 240, 301, 77] * 20))
+    for budget in (1999, 2000, 2001, 4999, 6000):
+        assert planned(scheduler, budget, "knapsack") <= budget
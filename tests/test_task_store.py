@@ -0,0 +1,107 @@
+import json
+
+from task_store import Task, TaskStore
+
+
+def ids(store):
+    return [t.id for t in store]
+
+
+def open_pair(tmp_path):
+    path = str(tmp_path / "tasks.jsonl")
+    a = TaskStore.open(path)
+    for title in ("one", "two", "three", "four", "five"):
+        a.add(Task(title=title))
+    return a, TaskStore.open(path), path
+
+
+def test_ids_are_not_reused_across_sessions(tmp_path):
+    a, b, _ = open_pair(tmp_path)
+    assert a.add(Task(title="from a")) == 6
+    assert b.add(Task(title="from b")) == 7
+    assert ids(TaskStore(a.path)) == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_pending_remove_survives_other_sessions_compaction(tmp_path):
+    a, b, _ = open_pair(tmp_path)
+    a.remove(3)
+    b.update(1, done=True)
+    b.compact()
+    a.refresh()
+    assert ids(a) == [1, 2, 4, 5]
+    assert len(a) == 4
+    assert a.was_removed(3)
+    a.flush()
+    assert ids(TaskStore(a.path)) == [1, 2, 4, 5]
+
+
+def test_pending_remove_survives_other_sessions_update(tmp_path):
+    a, b, _ = open_pair(tmp_path)
+    a.remove(3)
+    b.update(3, title="renamed")
+    b.flush()
+    a.refresh()
+    assert ids(a) == [1, 2, 4, 5]
+    a.flush()
+    assert ids(TaskStore(a.path)) == [1, 2, 4, 5]
+
+
+def test_update_of_task_removed_elsewhere_is_dropped(tmp_path):
+    a, b, _ = open_pair(tmp_path)
+    b.remove(2)
+    b.flush()
+    assert a.update(2, title="zombie") is None
+    assert a.was_removed(2)
+    assert not a.was_removed(99)
+
+
+def test_compaction_keeps_other_sessions_appends(tmp_path):
+    a, b, path = open_pair(tmp_path)
+    b.add(Task(title="six"))
+    a.remove(1)
+    a.compact()
+    assert ids(TaskStore(path)) == [2, 3, 4, 5, 6]
+    with open(path, encoding="utf-8") as f:
+        assert json.loads(f.readline()) == ["#", 2, 7]
+
+
+def test_catch_up_updates_the_objects_the_app_holds(tmp_path):
+    a, b, _ = open_pair(tmp_path)
+    held = a.get(4)
+    b.update(4, done=True)
+    b.compact()
+    a.refresh()
+    assert a.get(4) is held and held.done
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    a, _, path = open_pair(tmp_path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('["+", 6, "half')
+    store = TaskStore(path)
+    assert ids(store) == [1, 2, 3, 4, 5]
+    assert store.add(Task(title="six")) == 6
+    assert ids(TaskStore(path)) == [1, 2, 3, 4, 5, 6]
+
+
+def test_transactions_do_not_lose_other_sessions_meta_updates(tmp_path):
+    a, b, path = open_pair(tmp_path)
+    a.set_meta("count", 0)
+    a.flush()
+    for _ in range(3):
+        for store in (a, b):
+            with store.transaction():
+                store.set_meta("count", store.meta.get("count", 0) + 1)
+    assert TaskStore(path).meta["count"] == 6
+
+
+def test_transaction_sees_changes_made_elsewhere(tmp_path):
+    a, b, _ = open_pair(tmp_path)
+    b.update(4, done=True)
+    b.flush()
+    with a.transaction():
+        assert a.get(4).done
+        a.add(Task(title="six"))
+        a.update(4, title="checked")
+    assert TaskStore(a.path).get(4).title == "checked"
+    assert ids(TaskStore(a.path)) == [1, 2, 3, 4, 5, 6]
@@ -0,0 +1,49 @@
+import vote_tally
+from vote_tally import count_block, reference_count, use_registry
+
+BALLOTS = (b"V1,40,1\n"
+           b"V2,40,2\n"
+           b"V3,17,3\n"        # underage
+           b"V1,40,3\n"        # V1 again, for someone else
+           b"\xff9,40,4\n"     # IDs that aren't UTF-8 are still distinct
+           b"\xfe9,40,5\n"
+           b"V2,40,2 1\n")     # V2 again, ranked
+
+
+def count_out_of_order(path, registry, ranked=False):
+    """Count the file's two halves last half first, as a slow worker might."""
+    data = open(path, "rb").read()
+    cut = data.index(b"V1,40,3")
+    base = 1 << vote_tally.POSITION_BITS
+    use_registry(registry)
+    try:
+        tally = count_block(data[cut:], ranked, base + cut)
+        return tally.merge(count_block(data[:cut], ranked, base))
+    finally:
+        use_registry(None)
+
+
+def test_earliest_ballot_counts_whatever_the_order(tmp_path):
+    path = tmp_path / "ballots.csv"
+    path.write_bytes(BALLOTS)
+    tally = count_out_of_order(str(path), str(tmp_path / "voters.reg"))
+    assert tally == reference_count([str(path)], check_repeats=True)
+    assert tally.counts == {1: 1, 2: 1, 3: 0, 4: 1, 5: 1}
+    assert tally.rejected["duplicate"] == 2
+
+
+def test_earliest_ranking_counts_whatever_the_order(tmp_path):
+    path = tmp_path / "ballots.csv"
+    path.write_bytes(BALLOTS)
+    tally = count_out_of_order(str(path), str(tmp_path / "voters.reg"), ranked=True)
+    assert tally == reference_count([str(path)], check_repeats=True, ranked=True)
+    assert tally.rankings == {b"\x01": 1, b"\x02": 1, b"\x04": 1, b"\x05": 1}
+
+
+def test_workers_match_reference(tmp_path):
+    path = str(tmp_path / "ballots.csv")
+    vote_tally.generate(path, 20_000)
+    with open(path, "ab") as f:
+        f.write(b"V000000005,40,5\nV000000004,40,1 2\n")
+    tally = vote_tally.count_files([path], workers=3, registry=str(tmp_path / "voters.reg"))
+    assert tally == reference_count([path], check_repeats=True)
@@ -0,0 +1,57 @@
+import os
+import threading
+
+import pytest
+
+from voter_registry import RegistryFullError, VoterRegistry
+
+
+def test_marks_each_voter_once(tmp_path):
+    registry = VoterRegistry.open(str(tmp_path / "voters.reg"), capacity=2000)
+    assert not registry.has_voted("V1")
+    assert registry.mark_voted("V1")
+    assert registry.has_voted("V1")
+    assert not registry.mark_voted("V1")
+    assert registry.mark_many(["V2", "V1", "V2", b"V3"]) == [True, False, False, True]
+    assert len(registry) == 3
+    registry.close()
+
+
+def test_earliest_ballot_wins(tmp_path):
+    registry = VoterRegistry.open(str(tmp_path / "voters.reg"), capacity=2000)
+    assert registry.mark_earliest(["V1", "V2"], [50, 60], [3, 4]) == ([True, True], [])
+    assert registry.mark_earliest(["V1", "V2"], [10, 70], [5, 1]) == ([True, False], [3])
+    assert registry.mark_earliest(["V1"], [20], [2]) == ([False], [])
+    registry.mark_voted("V9")  # at the booth: before any ballot
+    assert registry.mark_earliest(["V9"], [1], [1]) == ([False], [])
+    registry.close()
+
+
+def test_full_registry_refuses_new_voters(tmp_path):
+    registry = VoterRegistry.open(str(tmp_path / "voters.reg"), capacity=10)
+    with pytest.raises(RegistryFullError):
+        for n in range(100):
+            registry.mark_voted(f"V{n}")
+    assert not registry.mark_voted("V0")  # voters already in still answer
+    registry.close()
+
+
+def test_concurrent_creators_share_one_registry(tmp_path):
+    path = str(tmp_path / "voters.reg")
+    opened = []
+    start = threading.Barrier(8)
+
+    def create():
+        start.wait()
+        opened.append(VoterRegistry.create(path, 5000))
+
+    threads = [threading.Thread(target=create) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert opened[0].mark_voted("V1")
+    assert all(registry.has_voted("V1") for registry in opened)
+    assert os.listdir(tmp_path) == ["voters.reg"]
+    for registry in opened:
+        registry.close()
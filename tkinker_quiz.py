@@ -2,82 +2,63 @@ import tkinter as tk
 from tkinter import messagebox
 import time
 
+from question_bank import QuestionBank
+from quiz_engine import QuizEngine, QuizStats
+
 
 # QUIZ DATA
-questions = [
-    'What is the boiling point of water at sea level?',
-    "Which gas do plants absorb during photosynthesis?",
-    'What is the closest planet to the Sun?',
-    'What is the chemical symbol for water?',
-    'Which part of the human body pumps blood?',
-    'What force pulls objects toward the Earth?',
-    'Which of these is NOT a state of matter?',
-    'What do bees collect from flowers?',
-    'What is the largest planet in our solar system?',
-    'What type of energy comes from the Sun?'
-]
-
-options = [
-    ['50°C', '75°C', '100°C', '150°C'],
-    ['CO₂', 'Nitrogen', 'Oxygen', 'Hydrogen'],
-    ['Venus', 'Mars', 'Earth', 'Mercury'],
-    ['CO₂', 'H₂O', 'O₂', 'NaCl'],
-    ['Heart', 'Liver', 'Kidney', 'Lungs'],
-    ['Magnetism', 'Electricity', 'Gravity', 'Friction'],
-    ['Solid', 'Liquid', 'Gas', 'Light'],
-    ['Stone', 'Pollen', 'Metal', 'Sand'],
-    ['Earth', 'Jupiter', 'Mars', 'Saturn'],
-    ['Solar energy', 'Wind energy', 'Chemical energy', 'Hydro energy']
-]
-
-answers = [
-    '100°C', 'CO₂', 'Mercury', 'H₂O', 'Heart',
-    'Gravity', 'Light', 'Pollen', 'Jupiter', 'Solar energy'
-]
+# Questions live in a JSON-lines bank (see question_bank.py). The engine
+# picks them adaptively - missed questions come back sooner - using
+# results saved in STATS_FILE (see quiz_engine.py).
+BANK_FILE = "science_quiz.jsonl"
+STATS_FILE = "quiz_stats.json"
+QUIZ_LENGTH = 10
+
+bank = QuestionBank(BANK_FILE)
+engine = QuizEngine(bank, QuizStats(STATS_FILE), QUIZ_LENGTH)
 
 # -----------------------
 # LOGIC
 # -----------------------
-current_q = 0
-score = 0
 
 
 def start_quiz():
     menu_frame.pack_forget()     # hide start menu
     quiz_frame.pack()            # show quiz
-    load_question()
+    next_question()
 
 
-def load_question():
-    question_label.config(text=f"Q{current_q+1}: {questions[current_q]}")
+def load_question(question):
+    question_label.config(text=f"Q{engine.asked + 1}: {question.text}")
 
-    for i in range(4):
-        option_buttons[i].config(
-            text=options[current_q][i],
-            bg="white",
-            state="normal"
-        )
+    # Questions can have any number of options: one button each.
+    while len(option_buttons) < len(question.options):
+        option_buttons.append(make_option_button(len(option_buttons)))
+    for i, btn in enumerate(option_buttons):
+        btn.pack_forget()
+        if i < len(question.options):
+            btn.config(
+                text=question.options[i],
+                bg="white",
+                state="normal"
+            )
+            btn.pack(pady=5)
 
 
 def check_answer(choice_index):
-    global current_q, score
-
-    selected = options[current_q][choice_index]
-    correct = answers[current_q]
+    correct_index = engine.current.answer
 
     # Disable buttons 
     for btn in option_buttons:
         btn.config(state="disabled")
 
     # Color effect
-    if selected == correct:
+    if engine.answer(choice_index):
         option_buttons[choice_index].config(bg="#4CAF50")   # green
-        score += 1
     else:
         option_buttons[choice_index].config(bg="#E53935")   # red
 
         # highlight correct answer in green
-        correct_index = options[current_q].index(correct)
         option_buttons[correct_index].config(bg="#4CAF50")
 
     # Move to next question after delay
@@ -85,17 +66,21 @@ def check_answer(choice_index):
 
 
 def next_question():
-    global current_q
-
-    current_q += 1
-    if current_q >= len(questions):
+    question = engine.next_question()
+    if question is None:
         show_final_score()
     else:
-        load_question()
+        load_question(question)
 
 
 def show_final_score():
-    messagebox.showinfo("Quiz Completed", f"Your Score: {score}/{len(questions)}")
+    engine.finish()
+    messagebox.showinfo("Quiz Completed", f"Your Score: {engine.score}/{engine.asked}")
+    root.destroy()
+
+
+def close_window():
+    engine.finish()    # keep the results of a half-finished quiz
     root.destroy()
 
 
@@ -106,6 +91,7 @@ root = tk.Tk()
 root.title("Science Quiz")
 root.geometry("550x420")
 root.config(bg="#f3f3f3")
+root.protocol("WM_DELETE_WINDOW", close_window)
 
 # START MENU SCREEN
 
@@ -135,18 +121,19 @@ quiz_frame = tk.Frame(root, bg="#f3f3f3")
 question_label = tk.Label(quiz_frame, text="", font=("Arial", 18), bg="#f3f3f3")
 question_label.pack(pady=20)
 
-option_buttons = []
-for i in range(4):
-    btn = tk.Button(
+
+def make_option_button(i):
+    return tk.Button(
         quiz_frame,
         text="",
         font=("Arial", 14),
         width=30,
         height=1,
         bg="white",
-        command=lambda i=i: check_answer(i)
+        command=lambda: check_answer(i)
     )
-    btn.pack(pady=5)
-    option_buttons.append(btn)
+
+
+option_buttons = [make_option_button(i) for i in range(4)]
 
 root.mainloop()
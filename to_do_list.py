@@ -2,8 +2,10 @@
 # SIMPLE TO-DO LIST APP (BEGINNER PROJECT)
 # ------------------------------
 
-# A list to store tasks
-tasks = []
+from task_store import Task, TaskStore
+
+# Tasks are saved to a file, each with a number that stays the same after deletions
+tasks = TaskStore.open("todo.jsonl")
 
 def show_menu():
     print("\n===== TO-DO LIST MENU =====")
@@ -14,25 +16,27 @@ def show_menu():
 
 def add_task():
     task = input("Enter the task you want to add: ")
-    tasks.append(task)
-    print(f"Task added: {task}")
+    task_id = tasks.add(Task(title=task))
+    tasks.flush()
+    print(f"Task added: {task} (#{task_id})")
 
 def view_tasks():
     if not tasks:
         print("Your to-do list is empty.")
     else:
         print("\nYour Tasks:")
-        for index, task in enumerate(tasks, start=1):
-            print(f"{index}. {task}")
+        for task in tasks:
+            print(f"{task.id}. {task.title}")
 
 def delete_task():
     view_tasks()
     if tasks:
         try:
             choice = int(input("\nEnter the task number to delete: "))
-            if 1 <= choice <= len(tasks):
-                removed = tasks.pop(choice - 1)
-                print(f"Deleted: {removed}")
+            removed = tasks.remove(choice)
+            if removed:
+                tasks.flush()
+                print(f"Deleted: {removed.title}")
             else:
                 print("Invalid task number.")
         except ValueError:
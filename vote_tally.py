@@ -0,0 +1,538 @@
+"""
+Ballot counting for voting_program.py.
+
+Ballots are text lines, one per voter:
+    voter_id,age,candidate
+e.g. "V000123,34,2". voting_program.py appends one line to BALLOT_FILE per
+vote; election-sized files can be made with the `generate` command.
+
+The candidate field may also rank several candidates, most preferred
+first: "V000123,34,2 1 4". Plurality counts the first choice;
+`--method irv|approval|borda` counts the whole ranking (see
+election_methods.py).
+
+Ballots are checked as they are counted: voters must be over 18 (the same
+`age > 18` rule as voting_program.py) and every candidate ranked must be
+one of CANDIDATES, at most once. Rejected ballots are counted by reason.
+
+Counting scales across cores: a file is cut into one byte range per
+worker process (cuts are moved to line boundaries), each worker counts
+its range into its own Tally, and the tallies are added up at the end. A
+socket stream is read in blocks that are handed to the workers the same
+way. `--verify` recounts with a deliberately simple single-threaded
+reference (one line at a time, no tricks) and checks the results match.
+
+With `--registry`, each voter's first ballot counts and later ones are
+rejected as duplicates (see voter_registry.py; the registry is shared by
+all workers). "First" is by position: files in the order given (streams
+in the order accepted), then byte offset. The registry keeps each voter's
+earliest ballot seen so far, so a worker that finds an earlier one moves
+the vote it replaces to the duplicates, and the result is the same
+whichever worker gets there first. Give the count a fresh registry file: REGISTRY_FILE is voting_program.py's own,
+which already stops repeat votes at the booth and lists every voter in
+BALLOT_FILE. A new registry is sized from the ballot files (for `listen`,
+REGISTRY_CAPACITY); a count that outgrows an existing one stops with an
+error.
+
+    python vote_tally.py generate ballots.csv --count 10000000
+    python vote_tally.py count ballots.csv --workers 4 --verify
+    python vote_tally.py generate ranked.csv --count 5000000 --ranked
+    python vote_tally.py count ranked.csv --method irv --verify
+    python vote_tally.py listen --port 9000      (then e.g. nc host 9000 < ballots.csv)
+"""
+
+import argparse
+import os
+import random
+import socket
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import election_methods
+from voter_registry import RegistryFullError, VoterRegistry
+
+CANDIDATES = {
+    1: "PDP - 'Amos Jacobs'",
+    2: "APC - 'Ola David'",
+    3: "SDP - 'Daniel Benson'",
+    4: "NRDP - 'Marvin Kilolo'",
+    5: "ZTW - 'Divine Ikubor'",
+}
+
+VOTING_AGE = 18  # voters must be older than this
+BALLOT_FILE = "ballots.csv"
+REGISTRY_FILE = "voters.reg"
+REGISTRY_CAPACITY = 10_000_000  # size of a newly created registry when the ballot count is unknown
+
+# Bytes per block read from a file range or a socket.
+BLOCK_SIZE = 8 * 1024 * 1024
+
+REASONS = ("underage", "unknown_candidate", "malformed", "duplicate")
+
+# A ballot's position is (file or stream number, from 1) << POSITION_BITS
+# plus its byte offset there.
+POSITION_BITS = 48
+
+_registry = None  # VoterRegistry used by count_block(), if any
+
+
+def is_eligible(age: int) -> bool:
+    return age > VOTING_AGE
+
+
+def format_ballot(voter_id: str, age: int, candidate: Union[int, Sequence[int]]) -> str:
+    """One ballot line; `candidate` is a candidate number or a ranking of them."""
+    if not isinstance(candidate, int):
+        candidate = " ".join(str(c) for c in candidate)
+    return f"{voter_id.replace(',', ' ')},{age},{candidate}\n"
+
+
+class Tally:
+    """
+    Votes per candidate plus rejected ballots by reason.
+
+    When counting rankings, `rankings` holds {ranking: ballots} (see
+    election_methods.py) and `counts` the first choices.
+    """
+
+    __slots__ = ("counts", "rejected", "rankings")
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = dict.fromkeys(CANDIDATES, 0)
+        self.rejected: Dict[str, int] = dict.fromkeys(REASONS, 0)
+        self.rankings: Dict[bytes, int] = {}
+
+    def merge(self, other: "Tally") -> "Tally":
+        for c, n in other.counts.items():
+            self.counts[c] += n
+        for r, n in other.rejected.items():
+            self.rejected[r] += n
+        rankings = self.rankings
+        for ranking, n in other.rankings.items():
+            n += rankings.get(ranking, 0)
+            if n:
+                rankings[ranking] = n
+            else:  # uncounted by a worker that found the voter's earlier ballot
+                del rankings[ranking]
+        return self
+
+    @property
+    def accepted(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def total(self) -> int:
+        return self.accepted + sum(self.rejected.values())
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Tally) and self.counts == other.counts
+                and self.rejected == other.rejected and self.rankings == other.rankings)
+
+    def report(self) -> str:
+        lines = []
+        for c, n in sorted(self.counts.items(), key=lambda item: -item[1]):
+            share = n / self.accepted if self.accepted else 0.0
+            lines.append(f"  {c}: {CANDIDATES[c]:<28} {n:>12,}  {share:6.2%}")
+        lines.append(f"  accepted {self.accepted:,} of {self.total:,} ballots; rejected: "
+                     + ", ".join(f"{r} {n:,}" for r, n in self.rejected.items()))
+        return "\n".join(lines)
+
+
+# Byte strings seen in ballots -> parsed values, so the hot loop mostly
+# does dict lookups instead of int() calls.
+_CANDIDATE_BYTES = {str(c).encode(): c for c in CANDIDATES}
+_ELIGIBLE_BYTES = {str(a).encode(): is_eligible(a) for a in range(131)}
+
+
+def parse_ranking(choice: bytes) -> bytes:
+    """The candidate numbers in a ballot's candidate field as bytes, or b"" if it's invalid."""
+    ranking = [_CANDIDATE_BYTES.get(token) for token in choice.split()]
+    if not ranking or None in ranking or len(set(ranking)) != len(ranking):
+        return b""
+    return bytes(ranking)
+
+
+def _ranking(vote: int) -> bytes:
+    """A ranking stored in the registry as int.from_bytes(ranking, "big"), back as bytes."""
+    return vote.to_bytes((vote.bit_length() + 7) // 8, "big")
+
+
+def use_registry(path) -> None:
+    """Reject repeat voters using the registry at path (None: don't check)."""
+    global _registry
+    if _registry is not None:
+        _registry.close()
+    _registry = VoterRegistry.open(path, REGISTRY_CAPACITY) if path else None
+
+
+def count_block(data: bytes, ranked: bool = False, position: int = 0) -> Tally:
+    """
+    Count the ballots in a block of whole lines; `ranked` also keeps whole rankings.
+
+    `position` is the block's position (see POSITION_BITS), used to keep
+    each voter's earliest ballot when checking repeats.
+    """
+    tally = Tally()
+    counts = tally.counts
+    rankings = tally.rankings
+    underage = unknown = malformed = duplicate = 0
+    voters = []      # voter IDs of valid ballots, when checking repeats
+    positions = []   # ... their positions
+    votes = []       # ... and their candidate or ranking
+    candidates = _CANDIDATE_BYTES
+    eligible_ages = _ELIGIBLE_BYTES
+    parsed: Dict[bytes, bytes] = {}   # candidate field -> parse_ranking() of it
+
+    at = position - 1
+    for line in data.split(b"\n"):
+        at += 1
+        start, at = at, at + len(line)
+        parts = line.split(b",")
+        if len(parts) != 3:
+            if line.strip():
+                malformed += 1
+            continue
+        voter, age, choice = parts
+        eligible = eligible_ages.get(age)
+        if eligible is None:
+            try:
+                eligible = is_eligible(int(age))
+            except ValueError:
+                malformed += 1
+                continue
+        if not eligible:
+            underage += 1
+            continue
+        if ranked:
+            ranking = parsed.get(choice)
+            if ranking is None:
+                ranking = parsed[choice] = parse_ranking(choice)
+            if not ranking:
+                unknown += 1
+            elif _registry is not None:
+                voters.append(voter)
+                positions.append(start)
+                votes.append(int.from_bytes(ranking, "big"))
+            else:
+                rankings[ranking] = rankings.get(ranking, 0) + 1
+            continue
+        candidate = candidates.get(choice.strip())
+        if candidate is None:
+            ranking = parsed.get(choice)  # a ranking counts as its first choice
+            if ranking is None:
+                ranking = parsed[choice] = parse_ranking(choice)
+            if not ranking:
+                unknown += 1
+                continue
+            candidate = ranking[0]
+        if _registry is not None:
+            voters.append(voter)
+            positions.append(start)
+            votes.append(candidate)
+        else:
+            counts[candidate] += 1
+
+    if voters:
+        earliest, displaced = _registry.mark_earliest(voters, positions, votes)
+        duplicate += len(voters) - sum(earliest) + len(displaced)
+        for vote, first in zip(votes, earliest):
+            if first:
+                if ranked:
+                    vote = _ranking(vote)
+                    rankings[vote] = rankings.get(vote, 0) + 1
+                else:
+                    counts[vote] += 1
+        for vote in displaced:
+            if ranked:
+                vote = _ranking(vote)
+                rankings[vote] = rankings.get(vote, 0) - 1
+                if not rankings[vote]:
+                    del rankings[vote]
+            else:
+                counts[vote] -= 1
+    for ranking, n in rankings.items():
+        counts[ranking[0]] += n
+
+    tally.rejected.update(underage=underage, unknown_candidate=unknown, malformed=malformed, duplicate=duplicate)
+    return tally
+
+
+# ------------------ FILES ------------------
+
+def _split(path: str, parts: int) -> List[Tuple[int, int]]:
+    """Byte ranges covering the file, cut at line boundaries."""
+    size = os.path.getsize(path)
+    cuts = [0]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            f.seek(max(size * i // parts, cuts[-1]))
+            f.readline()  # move to the start of the next line
+            cuts.append(min(f.tell(), size))
+    cuts.append(size)
+    return [(a, b) for a, b in zip(cuts, cuts[1:]) if b > a]
+
+
+def _count_range(args) -> Tally:
+    path, number, start, end, ranked = args
+    tally = Tally()
+    position = (number << POSITION_BITS) + start  # of the block being counted
+    with open(path, "rb") as f:
+        f.seek(start)
+        left = end - start
+        carry = b""
+        while left > 0:
+            block = f.read(min(BLOCK_SIZE, left))
+            if not block:
+                break
+            left -= len(block)
+            block = carry + block
+            cut = block.rfind(b"\n") + 1
+            carry = block[cut:]
+            tally.merge(count_block(block[:cut], ranked, position))
+            position += cut
+        tally.merge(count_block(carry, ranked, position))
+    return tally
+
+
+def estimate_ballots(paths: Iterable[str], sample: int = 1 << 20) -> int:
+    """Roughly how many ballots the files hold, from their sizes and the first `sample` bytes of each."""
+    total = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            head = f.read(sample)
+        size = os.path.getsize(path)
+        lines = head.count(b"\n")
+        total += size * lines // len(head) if lines else size // 8  # 8: the shortest line, "V1,19,2\n"
+    return total
+
+
+def count_files(paths: Iterable[str], workers: int = 1, registry: Optional[str] = None,
+                ranked: bool = False) -> Tally:
+    """
+    Count ballot files, with one file range per worker process.
+
+    With a registry, a voter's second and later ballots are rejected as
+    duplicates. `ranked` also collects whole rankings in Tally.rankings.
+    """
+    paths = list(paths)
+    if registry:
+        # Create it before the workers race to, with room for every ballot
+        # (plus a margin, as the estimate is from a sample).
+        capacity = max(1024, estimate_ballots(paths) * 5 // 4)
+        VoterRegistry.open(registry, capacity).close()
+    jobs = [(path, number, a, b, ranked)
+            for number, path in enumerate(paths, start=1) for a, b in _split(path, workers)]
+    total = Tally()
+    if workers > 1:
+        with Pool(workers, initializer=use_registry, initargs=(registry,)) as pool:
+            for part in pool.imap_unordered(_count_range, jobs):
+                total.merge(part)
+    else:
+        use_registry(registry)
+        try:
+            for job in jobs:
+                total.merge(_count_range(job))
+        finally:
+            use_registry(None)
+    return total
+
+
+def reference_count(paths: Iterable[str], check_repeats: bool = False, ranked: bool = False) -> Tally:
+    """
+    The same count done the obvious way, to check count_files() against.
+
+    Repeat voters are tracked with a plain set, in file order. Lines are
+    compared as bytes, not decoded, so voter IDs match exactly when
+    count_block() would match them.
+    """
+    tally = Tally()
+    seen = set()
+    names = {str(c).encode() for c in CANDIDATES}
+    for path in paths:
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = line.rstrip(b"\n").split(b",")
+                if len(row) != 3:
+                    tally.rejected["malformed"] += 1
+                    continue
+                try:
+                    age = int(row[1])
+                except ValueError:
+                    tally.rejected["malformed"] += 1
+                    continue
+                choices = row[2].split()
+                if not is_eligible(age):
+                    tally.rejected["underage"] += 1
+                elif not choices or not set(choices) <= names or len(set(choices)) != len(choices):
+                    tally.rejected["unknown_candidate"] += 1
+                elif check_repeats and row[0] in seen:
+                    tally.rejected["duplicate"] += 1
+                else:
+                    if check_repeats:
+                        seen.add(row[0])
+                    tally.counts[int(choices[0])] += 1
+                    if ranked:
+                        ranking = bytes(int(c) for c in choices)
+                        tally.rankings[ranking] = tally.rankings.get(ranking, 0) + 1
+    return tally
+
+
+# ------------------ SOCKETS ------------------
+
+def _blocks(conn: socket.socket) -> Iterator[Tuple[int, bytes]]:
+    """(byte offset, block) for whole-line blocks of about BLOCK_SIZE from a connection."""
+    carry = b""
+    buffer = bytearray()
+    offset = 0
+    while True:
+        data = conn.recv(1 << 20)
+        if not data:
+            break
+        buffer += data
+        if len(buffer) >= BLOCK_SIZE:
+            block = carry + bytes(buffer)
+            buffer.clear()
+            cut = block.rfind(b"\n") + 1
+            carry = block[cut:]
+            yield offset, block[:cut]
+            offset += cut
+    yield offset, carry + bytes(buffer)
+
+
+def _count_stream_block(args) -> Tally:
+    return count_block(*args)
+
+
+def count_socket(port: int, host: str = "0.0.0.0", connections: int = 1, workers: int = 1,
+                 registry: Optional[str] = None, ranked: bool = False) -> Tally:
+    """Accept `connections` ballot streams one after another and count them."""
+    if registry:
+        VoterRegistry.open(registry, REGISTRY_CAPACITY).close()
+    total = Tally()
+    with socket.create_server((host, port)) as server, \
+            Pool(workers, initializer=use_registry, initargs=(registry,)) as pool:
+        print(f"Listening on {host}:{port} for {connections} stream(s)", file=sys.stderr)
+        for number in range(1, connections + 1):
+            conn, address = server.accept()
+            stream = number << POSITION_BITS
+            with conn:
+                jobs = ((block, ranked, stream + offset) for offset, block in _blocks(conn))
+                for part in pool.imap_unordered(_count_stream_block, jobs):
+                    total.merge(part)
+            print(f"  stream from {address[0]} done; {total.total:,} ballots so far", file=sys.stderr)
+    return total
+
+
+# ------------------ COMMAND LINE ------------------
+
+def _random_rankings(rng: random.Random, weights: List[int], n: int) -> List[str]:
+    """n rankings of 1 to all candidates, each drawn in proportion to `weights`."""
+    names = list(CANDIDATES)
+    # A popular candidate tends to be ranked early: sort by random()**(1/weight).
+    exponents = [1 / w for w in weights]
+    rankings = []
+    for _ in range(n):
+        keys = [rng.random() ** e for e in exponents]
+        order = sorted(names, key=lambda c: -keys[c - 1])
+        rankings.append(" ".join(map(str, order[:rng.randint(1, len(order))])))
+    return rankings
+
+
+def generate(path: str, count: int, seed: int = 1, ranked: bool = False) -> None:
+    """Write `count` random ballots, with a few bad ones mixed in."""
+    rng = random.Random(seed)
+    weights = [30, 28, 20, 14, 8]
+    with open(path, "w") as f:
+        for start in range(0, count, 100_000):
+            n = min(100_000, count - start)
+            ages = rng.choices(range(14, 90), k=n)
+            if ranked:
+                picks = _random_rankings(rng, weights, n)
+            else:
+                picks = rng.choices(list(CANDIDATES), weights, k=n)
+            rows = []
+            for i in range(n):
+                choice = picks[i] if rng.random() > 0.001 else 9
+                rows.append(f"V{start + i:09d},{ages[i]},{choice}\n")
+                if rng.random() < 0.001:
+                    rows.append(rows[-1])  # the same ballot sent twice
+            f.write("".join(rows))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Count election ballots.")
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    gen = modes.add_parser("generate", help="write a file of random ballots")
+    gen.add_argument("path")
+    gen.add_argument("--count", type=int, default=1_000_000)
+    gen.add_argument("--ranked", action="store_true", help="rank several candidates per ballot")
+
+    count = modes.add_parser("count", help="count ballot files")
+    count.add_argument("paths", nargs="*", default=[BALLOT_FILE])
+    count.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    count.add_argument("--verify", action="store_true", help="recount single-threaded and compare")
+    count.add_argument("--registry", help="reject repeat voters using this registry file")
+    count.add_argument("--method", choices=election_methods.METHODS, default="plurality")
+
+    listen = modes.add_parser("listen", help="count ballots streamed over TCP")
+    listen.add_argument("--host", default="0.0.0.0")
+    listen.add_argument("--port", type=int, default=9000)
+    listen.add_argument("--connections", type=int, default=1, help="streams to accept before reporting")
+    listen.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    listen.add_argument("--registry", help="reject repeat voters using this registry file")
+    listen.add_argument("--method", choices=election_methods.METHODS, default="plurality")
+    args = parser.parse_args(argv)
+
+    if args.mode == "generate":
+        generate(args.path, args.count, ranked=args.ranked)
+        return
+
+    ranked = args.method != "plurality"
+    start = time.perf_counter()
+    try:
+        if args.mode == "count":
+            tally = count_files(args.paths, args.workers, args.registry, ranked)
+        else:
+            tally = count_socket(args.port, args.host, args.connections, args.workers, args.registry, ranked)
+    except RegistryFullError as e:
+        sys.exit(f"Count stopped: {e}")
+    elapsed = time.perf_counter() - start
+
+    print("Election results (first choices):" if ranked else "Election results:")
+    print(tally.report())
+    print(f"{tally.total:,} ballots in {elapsed:.2f}s ({tally.total / elapsed if elapsed else 0:,.0f} ballots/sec)")
+
+    if ranked:
+        start = time.perf_counter()
+        if args.method == "irv":
+            rounds = election_methods.instant_runoff(tally.rankings, CANDIDATES)
+            result = election_methods.format_rounds(rounds, CANDIDATES)
+        elif args.method == "approval":
+            result = election_methods.format_points(
+                election_methods.approval(tally.rankings, CANDIDATES), CANDIDATES, "approvals")
+        else:
+            result = election_methods.format_points(
+                election_methods.borda(tally.rankings, CANDIDATES), CANDIDATES, "points")
+        elapsed = time.perf_counter() - start
+        print(f"\n{args.method} ({len(tally.rankings):,} distinct rankings, {elapsed * 1000:.1f}ms):")
+        print(result)
+
+    if args.mode == "count" and args.verify:
+        start = time.perf_counter()
+        reference = reference_count(args.paths, check_repeats=bool(args.registry), ranked=ranked)
+        ok = reference == tally
+        if ok and args.method == "irv":
+            ok = rounds == election_methods.reference_instant_runoff(reference.rankings, CANDIDATES)
+        print(f"Reference count {'matches' if ok else 'DIFFERS'} ({time.perf_counter() - start:.2f}s)")
+        if not ok:
+            print(reference.report())
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,45 +1,80 @@
 # VOTING PROGRAM WITH PYTHON
-first_name = input('Enter your name: ')
-while True:
-    try:
-        age = int(input('Enter your age: '))
-        break
-    except ValueError:
-        print('Enter a whole number.')
-    continue
-
-
-def voting_system():
-    candidates = {
-        1: "PDP - 'Amos Jacobs'",
-        2: "APC - 'Ola David'",
-        3: "SDP - 'Daniel Benson'",
-        4: "NRDP - 'Marvin Kilolo'",
-        5: "ZTW - 'Divine Ikubor'"
-    }
+from vote_tally import BALLOT_FILE, CANDIDATES, REGISTRY_CAPACITY, REGISTRY_FILE, format_ballot, is_eligible
+from voter_registry import RegistryFullError, VoterRegistry
 
+
+def voting_system(voter_id, age, registry):
     print('Here are the available candiates to be voted for in this election.')
-    print("""
-    1: "PDP - 'Amos Pikins',
-    2: "APC - 'Ola David',
-    3: "SDP - 'Daniel Benson',
-    4: "NRDP - 'Marvin Ukanigbe',
-    5: "ZTW - 'Divine Ikubor'
-    """)
-
-    vote = int(input('Enter the ID/No. of your preferred candidate: '))
-    print(f"Are you sure you want to vote for {candidates.get(vote)}")
+    for number, name in CANDIDATES.items():
+        print(f"    {number}: {name}")
+
+    while True:
+        try:
+            vote = int(input('Enter the ID/No. of your preferred candidate: '))
+        except ValueError:
+            print('Enter a whole number.')
+            continue
+        if vote in CANDIDATES:
+            break
+        print('There is no candidate with that number.')
+
+    # Backup choices, used if the election is counted by ranked choice.
+    ranking = [vote]
+    while True:
+        extra = input('Optionally, list backup candidates in order (e.g. 1 4), or press Enter: ').split()
+        try:
+            backups = [int(c) for c in extra]
+        except ValueError:
+            print('Enter candidate numbers separated by spaces.')
+            continue
+        if all(c in CANDIDATES for c in backups) and len(set(ranking + backups)) == len(ranking) + len(backups):
+            ranking += backups
+            break
+        print('Each backup must be a different candidate from the list.')
+
+    print(f"Are you sure you want to vote for {CANDIDATES[vote]}")
     ans = input('Yes/No:').lower()
     if ans == 'yes':
-        print(f'You have successfully voted for {candidates.get(vote)}. The election results would be released in 14 days time. ')
+        try:
+            first_vote = registry.mark_voted(voter_id)
+        except RegistryFullError:
+            print("Sorry, the voter register is full, so your vote can't be recorded. Please tell an election official.")
+            return
+        if not first_vote:
+            print("You have already voted.")
+            return
+        # The ballot is counted later by vote_tally.py
+        with open(BALLOT_FILE, 'a') as f:
+            f.write(format_ballot(voter_id, age, ranking))
+        print(f'You have successfully voted for {CANDIDATES[vote]}. The election results would be released in 14 days time. ')
     else:
         print("Your vote has been cancelled.")
 
 
+def main():
+    first_name = input('Enter your name: ')
+    voter_id = input('Enter your voter ID: ').strip()
+    while True:
+        try:
+            age = int(input('Enter your age: '))
+            break
+        except ValueError:
+            print('Enter a whole number.')
+        continue
+
+    if is_eligible(age):
+        registry = VoterRegistry.open(REGISTRY_FILE, REGISTRY_CAPACITY)
+        try:
+            if registry.has_voted(voter_id):
+                print(f"Sorry {first_name}, you have already voted.")
+            else:
+                print(f"Hello {first_name}, welcome to the Voter's registration site.")
+                voting_system(voter_id, age, registry)
+        finally:
+            registry.close()
+    else:
+        print(f"Sorry {first_name}, you're too young to vote.")
 
-if age > 18:
-    print(f"Hello {first_name}, welcome to the Voter's registration site.")
-    voting_system()
-else:
-    print(f"Sorry {first_name}, you're too young to vote.")
 
+if __name__ == '__main__':
+    main()